@@ -0,0 +1,230 @@
+"""
+Benchmark suite for the authentication hot paths.
+
+Times token encoding/decoding, ``JWTAuthentication.authenticate``, session
+validation, request helpers and the login, refresh and passkey views (through
+the test client, against SQLite), reporting ops/s, p50/p99 and the number of
+queries of one call. Results are compared with the stored baselines; the run
+fails when a benchmark regresses by more than the threshold.
+
+    python -m benchmarks.bench_auth_suite [--iterations N] [--threshold 0.5]
+    python -m benchmarks.bench_auth_suite --save-baseline
+
+Baselines are machine specific: record them on the machine the suite is
+compared on.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.harness import (
+    count_queries,
+    find_regressions,
+    load_baselines,
+    measure,
+    report,
+    save_baselines,
+    setup_django,
+    setup_test_database,
+)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Allowed p50 slowdown against the baseline, as a fraction",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "-k", dest="select", help="Only run benchmarks whose name contains this"
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        results = run(args)
+    finally:
+        teardown()
+
+    if args.save_baseline:
+        baselines = load_baselines(args.baseline)
+        baselines.update(results)
+        save_baselines(args.baseline, baselines)
+        print(f"Saved {len(results)} baselines to {args.baseline}")
+        return
+
+    regressions = find_regressions(
+        results, load_baselines(args.baseline), threshold=args.threshold
+    )
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+def get_benchmarks():
+    """Return ``(name, func, setup)`` for every benchmark in the suite."""
+    from base64 import urlsafe_b64encode
+    from types import SimpleNamespace
+    from unittest.mock import patch
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.urls import reverse
+    from django.utils import timezone
+    from rest_framework.request import Request
+    from rest_framework.response import Response
+    from rest_framework.test import APIClient, APIRequestFactory
+
+    from dj_waanverse_auth import settings
+    from dj_waanverse_auth.authentication import JWTAuthentication
+    from dj_waanverse_auth.models import AccessCode, Passkey, UserSession
+    from dj_waanverse_auth.services.token_classes import RefreshToken
+    from dj_waanverse_auth.services.token_service import TokenService
+    from dj_waanverse_auth.utils.security_utils import get_device, get_ip_address
+    from dj_waanverse_auth.utils.session_utils import validate_session
+    from dj_waanverse_auth.utils.token_utils import decode_token, encode_token
+
+    settings.rate_limit_enabled = False
+    cache.clear()
+
+    Account = get_user_model()
+    user = Account.objects.create_user(
+        email_address="bench@example.com", username="benchuser", is_active=True
+    )
+    session = UserSession.objects.create(account=user, user_agent=USER_AGENT)
+    refresh = RefreshToken.for_user(user, session_id=session.id)
+    access_token = refresh.access_token
+    payload = decode_token(access_token)
+
+    factory = APIRequestFactory()
+    authentication = JWTAuthentication()
+    django_request = factory.get(
+        "/", HTTP_AUTHORIZATION=f"Bearer {access_token}", HTTP_USER_AGENT=USER_AGENT
+    )
+    forwarded_request = factory.get(
+        "/", HTTP_X_FORWARDED_FOR="203.0.113.7, 10.0.0.1", REMOTE_ADDR="10.0.0.1"
+    )
+
+    def authenticate():
+        return authentication.authenticate(Request(django_request))
+
+    def setup_login_cookies():
+        service = TokenService(request=django_request, user=user, session_id=session.id)
+        return service.setup_login_cookies(Response())
+
+    client = APIClient(HTTP_USER_AGENT=USER_AGENT)
+    login_url = reverse("dj_waanverse_auth_login")
+    refresh_url = reverse("dj_waanverse_auth_refresh_token")
+    passkey_begin_url = reverse("dj_waanverse_auth_passkey_login")
+    passkey_complete_url = reverse("dj_waanverse_auth_passkey_login_complete")
+
+    def issue_code():
+        AccessCode.objects.filter(email_address=user.email_address).delete()
+        AccessCode.objects.create(
+            email_address=user.email_address,
+            code_hash=AccessCode.hash_code("123456"),
+            expires_at=timezone.now() + timezone.timedelta(minutes=5),
+        )
+
+    def login_view():
+        response = client.post(
+            login_url,
+            {"email_address": user.email_address, "code": "123456"},
+            format="json",
+        )
+        assert response.status_code == 200, response.data
+        client.cookies.clear()
+
+    def refresh_view():
+        response = client.post(
+            refresh_url, {"refresh_token": str(refresh)}, format="json"
+        )
+        assert response.status_code == 200, response.data
+        client.cookies.clear()
+
+    def passkey_login_begin_view():
+        response = client.post(passkey_begin_url, {}, format="json")
+        assert response.status_code == 200, response.data
+
+    credential_id = b"bench-credential"
+    passkey = Passkey.objects.create(
+        user=user, credential_id=credential_id, public_key=b"0"
+    )
+    encoded_credential_id = urlsafe_b64encode(credential_id).rstrip(b"=").decode()
+    challenge = {}
+
+    def begin_passkey_login():
+        response = client.post(passkey_begin_url, {}, format="json")
+        challenge["token"] = response.data["challenge_token"]
+
+    def passkey_login_complete_view():
+        passkey.sign_count += 1
+        verification = SimpleNamespace(new_sign_count=passkey.sign_count)
+        with patch(
+            "dj_waanverse_auth.views.passkey_views.verify_authentication_response",
+            return_value=verification,
+        ):
+            response = client.post(
+                passkey_complete_url,
+                {"id": encoded_credential_id, "challenge_token": challenge["token"]},
+                format="json",
+            )
+        assert response.status_code == 200, response.data
+        client.cookies.clear()
+
+    return [
+        ("encode_token", lambda: encode_token(dict(payload)), None),
+        ("decode_token", lambda: decode_token(access_token), None),
+        (
+            "RefreshToken.for_user + access_token",
+            lambda: RefreshToken.for_user(user, session_id=session.id).access_token,
+            None,
+        ),
+        ("TokenService.setup_login_cookies", setup_login_cookies, None),
+        ("validate_session", lambda: validate_session(session.id), None),
+        ("JWTAuthentication.authenticate", authenticate, None),
+        ("get_ip_address", lambda: get_ip_address(forwarded_request), None),
+        ("get_device", lambda: get_device(django_request), None),
+        ("login view", login_view, issue_code),
+        ("refresh view", refresh_view, None),
+        ("passkey login begin view", passkey_login_begin_view, None),
+        (
+            "passkey login complete view",
+            passkey_login_complete_view,
+            begin_passkey_login,
+        ),
+    ]
+
+
+def run(args):
+    results = {}
+    for name, func, setup in get_benchmarks():
+        if args.select and args.select not in name:
+            continue
+        timings = measure(func, iterations=args.iterations, setup=setup)
+        results[name] = report(name, timings, queries=count_queries(func, setup))
+    return results
+
+
+if __name__ == "__main__":
+    main()
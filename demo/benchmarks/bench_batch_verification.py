@@ -0,0 +1,72 @@
+"""
+Verifying a reconnect storm of tokens one by one versus with decode_tokens.
+
+The storm holds ``--tokens`` tokens of which ``--unique`` are distinct.
+"cold" starts from an empty verified-token cache, "warm" reuses it.
+
+    python -m benchmarks.bench_batch_verification [--tokens N] [--unique N]
+"""
+
+import argparse
+
+from benchmarks.harness import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--unique", type=int, default=250)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args)
+
+
+def run(args):
+    from django.utils import timezone
+    from rest_framework import exceptions
+
+    from dj_waanverse_auth.utils.token_utils import (
+        decode_token,
+        decode_tokens,
+        encode_token,
+        verified_token_cache,
+    )
+
+    now = int(timezone.now().timestamp())
+    distinct = [
+        encode_token(
+            {"id": i, "sid": i, "iss": "bench", "iat": now, "exp": now + 3600}
+        )
+        for i in range(args.unique)
+    ]
+    storm = [distinct[i % args.unique] for i in range(args.tokens)]
+
+    def one_by_one():
+        results = []
+        for token in storm:
+            try:
+                results.append(decode_token(token))
+            except exceptions.AuthenticationFailed as e:
+                results.append(e)
+        return results
+
+    report(f"decode_token x{args.tokens}", measure(one_by_one, args.iterations, 1))
+    report(
+        f"decode_tokens x{args.tokens} (cold)",
+        measure(
+            lambda: decode_tokens(storm),
+            args.iterations,
+            1,
+            setup=verified_token_cache.clear,
+        ),
+    )
+    report(
+        f"decode_tokens x{args.tokens} (warm)",
+        measure(lambda: decode_tokens(storm), args.iterations, 1),
+    )
+
+
+if __name__ == "__main__":
+    main()
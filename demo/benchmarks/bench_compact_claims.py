@@ -0,0 +1,71 @@
+"""
+Token and per-request header bytes of the standard and compact claim
+profiles, and the decode cost of each.
+
+Cookie-authenticated requests carry both token cookies, so the savings of
+both tokens count on every request.
+
+    python -m benchmarks.bench_compact_claims [--iterations N]
+"""
+
+import argparse
+
+from benchmarks.harness import measure, report, setup_django
+
+PROFILES = ("standard", "compact")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args)
+
+
+def run(args):
+    from types import SimpleNamespace
+    from unittest.mock import patch
+
+    from dj_waanverse_auth import settings
+    from dj_waanverse_auth.services.token_classes import RefreshToken
+    from dj_waanverse_auth.utils.token_utils import decode_token
+
+    user = SimpleNamespace(id=123456)
+    sizes = {}
+    tokens = {}
+    for profile in PROFILES:
+        with patch("dj_waanverse_auth.settings.token_claim_profile", profile):
+            refresh = RefreshToken.for_user(user, session_id=98765, generation=0)
+            access_token = refresh.access_token
+        tokens[profile] = access_token
+        cookie_header = (
+            f"Cookie: {settings.access_token_cookie}={access_token}; "
+            f"{settings.refresh_token_cookie}={refresh}"
+        )
+        sizes[profile] = {
+            "access token": len(access_token),
+            "refresh token": len(str(refresh)),
+            "Authorization header": len(f"Authorization: Bearer {access_token}"),
+            "Cookie header": len(cookie_header),
+        }
+
+    print(f"{'bytes':<25}" + "".join(f"{profile:>12}" for profile in PROFILES))
+    for name in sizes["standard"]:
+        standard, compact = sizes["standard"][name], sizes["compact"][name]
+        print(
+            f"{name:<25}{standard:>12}{compact:>12}"
+            f"   saves {standard - compact} ({(standard - compact) / standard:.0%})"
+        )
+
+    for profile in PROFILES:
+        token = tokens[profile]
+        report(
+            f"decode_token ({profile})",
+            measure(lambda: decode_token(token), args.iterations),
+        )
+
+
+if __name__ == "__main__":
+    main()
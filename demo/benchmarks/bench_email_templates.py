@@ -0,0 +1,56 @@
+"""
+Per-email render time for the templates in ``dj_waanverse_auth/templates/emails/``.
+
+Compares a full ``render_to_string`` + ``strip_tags`` of the HTML body against
+the precompiled HTML/text template pair used by ``send_auth_code_via_email``.
+
+    python -m benchmarks.bench_email_templates [--iterations N]
+"""
+
+import argparse
+from pathlib import Path
+
+from benchmarks.harness import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.template.loader import render_to_string
+    from django.utils.html import strip_tags
+
+    import dj_waanverse_auth
+    from dj_waanverse_auth.utils.email_utils import get_email_templates, render_email
+
+    context = {
+        "code": "123456",
+        "user_name": "Test User",
+        "user": {"username": "testuser"},
+        "PLATFORM_NAME": "Demo Platform",
+        "timespan": 5,
+    }
+
+    templates_dir = Path(dj_waanverse_auth.__file__).parent / "templates" / "emails"
+    for template_path in sorted(templates_dir.glob("*.html")):
+        template_name = f"emails/{template_path.name}"
+        report(
+            f"render_to_string+strip_tags {template_path.name}",
+            measure(
+                lambda: strip_tags(render_to_string(template_name, context)),
+                iterations=args.iterations,
+            ),
+        )
+
+    get_email_templates("access_code")
+    report(
+        "precompiled access_code (html + text)",
+        measure(lambda: render_email("access_code", context), iterations=args.iterations),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Overhead of the metrics instrumentation.
+
+Times the raw ``time``/``increment`` calls of the null and in-memory sinks and
+``JWTAuthentication.authenticate`` with each sink installed.
+
+    python -m benchmarks.bench_metrics [--iterations N]
+"""
+
+import argparse
+
+from benchmarks.harness import measure, report, setup_django, setup_test_database
+
+LABELS = (("stage", "verify"),)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        run(args)
+    finally:
+        teardown()
+
+
+def run(args):
+    from unittest.mock import patch
+
+    from django.contrib.auth import get_user_model
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from dj_waanverse_auth.authentication import JWTAuthentication
+    from dj_waanverse_auth.models import UserSession
+    from dj_waanverse_auth.services.metrics import InMemoryMetricsSink, NullMetricsSink
+    from dj_waanverse_auth.services.token_classes import RefreshToken
+
+    sinks = {"null": NullMetricsSink(), "in-memory": InMemoryMetricsSink()}
+
+    for name, sink in sinks.items():
+
+        def timed_block(sink=sink):
+            with sink.time("bench_seconds", LABELS):
+                pass
+
+        report(f"{name} sink: time()", measure(timed_block, args.iterations))
+        report(
+            f"{name} sink: increment()",
+            measure(
+                lambda sink=sink: sink.increment("bench_total", labels=LABELS),
+                args.iterations,
+            ),
+        )
+
+    user = get_user_model().objects.create_user(
+        email_address="bench@example.com", is_active=True
+    )
+    session = UserSession.objects.create(account=user)
+    access_token = RefreshToken.for_user(user, session_id=session.id).access_token
+    django_request = APIRequestFactory().get(
+        "/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+    )
+    authentication = JWTAuthentication()
+
+    def authenticate():
+        return authentication.authenticate(Request(django_request))
+
+    iterations = max(args.iterations // 10, 100)
+    for name, sink in sinks.items():
+        with patch("dj_waanverse_auth.services.metrics._metrics_sink", sink):
+            report(f"authenticate with {name} sink", measure(authenticate, iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+JWT versus opaque access tokens: Authorization header size, issuance and
+verification latency per lookup tier of the opaque tokens.
+
+    python -m benchmarks.bench_opaque_tokens [--iterations N]
+"""
+
+import argparse
+
+from benchmarks.harness import (
+    count_queries,
+    measure,
+    report,
+    setup_django,
+    setup_test_database,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        run(args)
+    finally:
+        teardown()
+
+
+def run(args):
+    from unittest.mock import patch
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import caches
+
+    from dj_waanverse_auth import settings
+    from dj_waanverse_auth.models import UserSession
+    from dj_waanverse_auth.services.opaque_tokens import resolve_opaque_token
+    from dj_waanverse_auth.services.token_classes import RefreshToken
+    from dj_waanverse_auth.utils.token_utils import decode_token, verified_token_cache
+
+    user = get_user_model().objects.create_user(email_address="bench@example.com")
+    session = UserSession.objects.create(account=user)
+    refresh = RefreshToken.for_user(user, session_id=session.id)
+
+    def issue(token_format):
+        def call():
+            with patch("dj_waanverse_auth.settings.access_token_format", token_format):
+                return RefreshToken(str(refresh)).access_token
+
+        return call
+
+    jwt_token = issue("jwt")()
+    opaque_token = issue("opaque")()
+    for name, token in (("jwt", jwt_token), ("opaque", opaque_token)):
+        print(f"{name:<7} Authorization header: {len(f'Bearer {token}')} bytes")
+
+    shared_cache = caches[settings.opaque_token_cache]
+
+    def clear_local():
+        verified_token_cache.clear()
+
+    def clear_both():
+        verified_token_cache.clear()
+        shared_cache.clear()
+
+    report("issue jwt (incl. refresh decode)", measure(issue("jwt"), args.iterations))
+    report(
+        "issue opaque (incl. refresh decode)",
+        measure(issue("opaque"), args.iterations),
+        count_queries(issue("opaque")),
+    )
+    report("verify jwt", measure(lambda: decode_token(jwt_token), args.iterations))
+    report(
+        "resolve opaque (local LRU)",
+        measure(lambda: resolve_opaque_token(opaque_token), args.iterations),
+    )
+    report(
+        "resolve opaque (shared cache)",
+        measure(
+            lambda: resolve_opaque_token(opaque_token),
+            args.iterations,
+            setup=clear_local,
+        ),
+    )
+    report(
+        "resolve opaque (database)",
+        measure(
+            lambda: resolve_opaque_token(opaque_token),
+            args.iterations,
+            setup=clear_both,
+        ),
+        count_queries(lambda: resolve_opaque_token(opaque_token), setup=clear_both),
+    )
+
+
+if __name__ == "__main__":
+    main()
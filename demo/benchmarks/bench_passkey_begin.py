@@ -0,0 +1,128 @@
+"""
+Per-request overhead of the passkey begin endpoints.
+
+Compares building options through ``generate_*_options`` + ``options_to_json``
++ ``json.loads`` with the precomputed relying party templates, and times the
+``login_begin`` / ``register_begin`` views end to end.
+
+    python -m benchmarks.bench_passkey_begin [--iterations N]
+"""
+
+import argparse
+import json
+
+from benchmarks.harness import measure, report, setup_django, setup_test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        run(args)
+    finally:
+        teardown()
+
+
+def run(args):
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from webauthn import (
+        generate_authentication_options,
+        generate_registration_options,
+        options_to_json,
+    )
+    from webauthn.helpers.structs import (
+        PublicKeyCredentialDescriptor,
+        UserVerificationRequirement,
+    )
+
+    from dj_waanverse_auth import settings
+    from dj_waanverse_auth.models import Passkey
+    from dj_waanverse_auth.utils.webauthin import (
+        build_authentication_options,
+        build_registration_options,
+        get_relying_party,
+    )
+    from dj_waanverse_auth.views.passkey_views import login_begin, register_begin
+
+    settings.rate_limit_enabled = False
+    rp = get_relying_party()
+    credential_ids = [bytes([i]) * 32 for i in range(3)]
+
+    def legacy_login_options():
+        options = generate_authentication_options(
+            rp_id=settings.webauthn_domain,
+            allow_credentials=[
+                PublicKeyCredentialDescriptor(id=c) for c in credential_ids
+            ],
+            user_verification=UserVerificationRequirement.PREFERRED,
+        )
+        return json.loads(options_to_json(options))
+
+    def legacy_registration_options():
+        options = generate_registration_options(
+            rp_id=settings.webauthn_domain,
+            rp_name=settings.webauthn_rp_name,
+            user_id=b"1",
+            user_name="bench",
+            user_display_name="bench",
+            exclude_credentials=[
+                PublicKeyCredentialDescriptor(id=c) for c in credential_ids
+            ],
+        )
+        return json.loads(options_to_json(options))
+
+    report(
+        "legacy authentication options",
+        measure(legacy_login_options, iterations=args.iterations),
+    )
+    report(
+        "build_authentication_options",
+        measure(
+            lambda: build_authentication_options(rp, credential_ids),
+            iterations=args.iterations,
+        ),
+    )
+    report(
+        "legacy registration options",
+        measure(legacy_registration_options, iterations=args.iterations),
+    )
+    report(
+        "build_registration_options",
+        measure(
+            lambda: build_registration_options(rp, b"1", "bench", credential_ids),
+            iterations=args.iterations,
+        ),
+    )
+
+    factory = APIRequestFactory()
+    Account = get_user_model()
+    user = Account.objects.create_user(email_address="bench@example.com")
+    for credential_id in credential_ids:
+        Passkey.objects.create(user=user, credential_id=credential_id, public_key=b"0")
+
+    def call_login_begin():
+        request = factory.post("/v1/auth/passkey/login/", {}, format="json")
+        return login_begin(request)
+
+    def call_register_begin():
+        request = factory.post("/v1/auth/passkey/register/", {}, format="json")
+        force_authenticate(request, user=user)
+        return register_begin(request)
+
+    report(
+        "login_begin view",
+        measure(call_login_begin, iterations=args.iterations),
+    )
+    report(
+        "register_begin view",
+        measure(call_register_begin, iterations=args.iterations),
+    )
+
+
+if __name__ == "__main__":
+    main()
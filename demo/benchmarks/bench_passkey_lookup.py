@@ -0,0 +1,79 @@
+"""
+Passkey lookup time by credential id, comparing the raw ``credential_id``
+blob column with the indexed ``credential_id_hash`` digest.
+
+Creates ``--count`` passkeys (1M by default) in a throwaway test database:
+
+    python -m benchmarks.bench_passkey_lookup [--count N] [--iterations N]
+"""
+
+import argparse
+import os
+import random
+
+from benchmarks.harness import measure, report, setup_django, setup_test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        run(args)
+    finally:
+        teardown()
+
+
+def run(args):
+    from django.contrib.auth import get_user_model
+
+    from dj_waanverse_auth.models import Passkey
+
+    Account = get_user_model()
+    user = Account.objects.create_user(email_address="bench@example.com")
+
+    credential_ids = []
+    for start in range(0, args.count, args.batch_size):
+        batch = []
+        for _ in range(min(args.batch_size, args.count - start)):
+            credential_id = os.urandom(32)
+            credential_ids.append(credential_id)
+            batch.append(
+                Passkey(
+                    user=user,
+                    credential_id=credential_id,
+                    credential_id_hash=Passkey.hash_credential_id(credential_id),
+                    public_key=b"0" * 77,
+                )
+            )
+        Passkey.objects.bulk_create(batch)
+    print(f"Created {args.count:,} passkeys")
+
+    samples = random.sample(credential_ids, min(len(credential_ids), 1000))
+
+    def by_blob():
+        Passkey.objects.get(credential_id=random.choice(samples))
+
+    def by_hash():
+        Passkey.objects.get(
+            credential_id_hash=Passkey.hash_credential_id(random.choice(samples))
+        )
+
+    blob_iterations = max(1, min(args.iterations, 2_000_000 // max(args.count, 1)))
+    report(
+        "lookup by credential_id (blob scan)",
+        measure(by_blob, iterations=blob_iterations, warmup=1),
+    )
+    report(
+        "lookup by credential_id_hash (unique index)",
+        measure(by_hash, iterations=args.iterations, warmup=10),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Per-request overhead of the authentication rate limiter.
+
+    python -m benchmarks.bench_rate_limiter [--iterations N]
+"""
+
+import argparse
+
+from benchmarks.harness import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from dj_waanverse_auth.services.rate_limiter import (
+        SlidingWindowLimiter,
+        TokenBucketLimiter,
+    )
+    from dj_waanverse_auth.throttling import LoginRateThrottle
+
+    rate = f"{args.iterations * 10}/min"
+    sliding_window = SlidingWindowLimiter(rate)
+    token_bucket = TokenBucketLimiter(rate)
+    report(
+        "SlidingWindowLimiter.hit",
+        measure(lambda: sliding_window.hit("bench"), iterations=args.iterations),
+    )
+    report(
+        "TokenBucketLimiter.hit",
+        measure(lambda: token_bucket.hit("bench"), iterations=args.iterations),
+    )
+
+    blocked = SlidingWindowLimiter("1/min")
+    blocked.hit("blocked")
+    blocked.hit("blocked")
+    report(
+        "blocked key (in-process fast path)",
+        measure(lambda: blocked.hit("blocked"), iterations=args.iterations),
+    )
+
+    from dj_waanverse_auth import settings
+
+    settings.rate_limit_enabled = True
+    settings.rate_limits = {
+        "login": {"rate": rate, "algorithm": "sliding_window", "keys": ["ip", "email"]}
+    }
+    request = Request(
+        APIRequestFactory().post(
+            "/v1/auth/login/", {"email_address": "bench@example.com"}, format="json"
+        ),
+        parsers=[JSONParser()],
+    )
+    request.data  # parse once, as the view would
+    throttle = LoginRateThrottle()
+    report(
+        "LoginRateThrottle.allow_request (ip+email)",
+        measure(lambda: throttle.allow_request(request, None), iterations=args.iterations),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Token pair issuance under concurrent login load, per SIGNING_EXECUTOR mode.
+
+Every client thread mints refresh and access tokens back to back. Per-pair
+latency is reported with the aggregate throughput of all clients; offloading
+only pays off with more CPUs than request threads competing for the GIL.
+
+    python -m benchmarks.bench_signing_executor [--clients N] [--pairs N]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import report, setup_django, setup_test_database
+
+MODES = ("inline", "thread", "process")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--pairs", type=int, default=200, help="Pairs per client")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        run(args)
+    finally:
+        teardown()
+
+
+def run(args):
+    from unittest.mock import patch
+
+    from django.contrib.auth import get_user_model
+
+    from dj_waanverse_auth import settings
+    from dj_waanverse_auth.services.signing_executor import SigningExecutor
+    from dj_waanverse_auth.services.token_classes import RefreshToken
+
+    user = get_user_model().objects.create_user(email_address="bench@example.com")
+
+    def client(count):
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            refresh = RefreshToken.for_user(user, session_id=1, generation=0)
+            refresh.access_token
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    print(f"{args.clients} clients, {args.workers} workers, {os.cpu_count()} CPUs")
+    for mode in args.modes:
+        executor = None
+        if mode != "inline":
+            executor = SigningExecutor(
+                mode,
+                private_key_path=settings.private_key_path,
+                workers=args.workers,
+                max_pending=args.clients * 2,
+                timeout=10.0,
+            )
+        with patch(
+            "dj_waanverse_auth.services.signing_executor._signing_executor", executor
+        ), patch("dj_waanverse_auth.settings.signing_executor", mode):
+            client(20)  # warm up the pool and key loading
+            with ThreadPoolExecutor(max_workers=args.clients) as clients:
+                start = time.perf_counter()
+                results = list(clients.map(client, [args.pairs] * args.clients))
+                elapsed = time.perf_counter() - start
+        if executor is not None:
+            executor.shutdown()
+
+        timings = [timing for result in results for timing in result]
+        report(f"{mode} token pair (per client)", timings)
+        print(f"{'':<45} {len(timings) / elapsed:>12,.0f} pairs/s in aggregate")
+
+
+if __name__ == "__main__":
+    main()
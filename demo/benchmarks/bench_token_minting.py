@@ -0,0 +1,86 @@
+"""
+Login token issuance before and after the single-timestamp minting pipeline.
+
+"legacy" reproduces the previous path: ``jwt.encode`` with datetime claims
+for the refresh token, decoding it again to build the ``RefreshToken``, then
+a second ``jwt.encode`` for the access token, reading the clock four times.
+
+    python -m benchmarks.bench_token_minting [--iterations N]
+"""
+
+import argparse
+
+from benchmarks.harness import measure, report, setup_django, setup_test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    teardown = setup_test_database()
+    try:
+        run(args)
+    finally:
+        teardown()
+
+
+def run(args):
+    import jwt
+    from django.contrib.auth import get_user_model
+    from django.utils.timezone import now
+
+    from dj_waanverse_auth import settings
+    from dj_waanverse_auth.services.token_classes import RefreshToken
+    from dj_waanverse_auth.utils.token_utils import decode_token, get_key, sign_claims
+
+    user = get_user_model().objects.create_user(email_address="bench@example.com")
+    private_key = get_key("private")
+
+    def legacy_encode(payload):
+        return jwt.encode(payload, private_key, algorithm="RS256")
+
+    def legacy_pair():
+        refresh_payload = {
+            "id": user.id,
+            "exp": now() + settings.refresh_token_cookie_max_age,
+            "iat": now(),
+            "iss": settings.platform_name,
+            "token_type": "refresh",
+            "sid": 1,
+            "gen": 0,
+        }
+        refresh_token = legacy_encode(refresh_payload)
+        claims = decode_token(refresh_token)
+        access_payload = {
+            "id": claims["id"],
+            "exp": now() + settings.access_token_cookie_max_age,
+            "iat": now(),
+            "iss": settings.platform_name,
+            "token_type": "access",
+            "sid": claims["sid"],
+            "gen": claims["gen"],
+        }
+        return refresh_token, legacy_encode(access_payload)
+
+    def minted_pair():
+        refresh = RefreshToken.for_user(user, session_id=1, generation=0)
+        return str(refresh), refresh.access_token
+
+    claims = {
+        "id": user.id,
+        "exp": 2000000000,
+        "iat": 1700000000,
+        "iss": settings.platform_name,
+        "sid": 1,
+    }
+
+    report("jwt.encode", measure(lambda: legacy_encode(claims), args.iterations))
+    report("sign_claims", measure(lambda: sign_claims(claims), args.iterations))
+    report("legacy token pair", measure(legacy_pair, args.iterations))
+    report("minted token pair", measure(minted_pair, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
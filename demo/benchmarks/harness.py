@@ -0,0 +1,150 @@
+"""
+Shared helpers for the standalone benchmark scripts.
+
+The scripts run against the demo project settings, from the ``demo`` directory:
+
+    python -m benchmarks.bench_email_templates
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+DEMO_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = DEMO_DIR.parent
+
+
+def setup_django():
+    """Configure Django with the demo settings."""
+    for path in (str(DEMO_DIR), str(REPO_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "demo.settings")
+
+    import django
+
+    django.setup()
+
+
+def setup_test_database():
+    """Create a throwaway test database, returning a callable that destroys it."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    return teardown
+
+
+def measure(func, iterations=1000, warmup=50, setup=None):
+    """
+    Call ``func`` repeatedly and return the per-call timings in seconds.
+
+    ``setup``, if given, runs untimed before every call.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def count_queries(func, setup=None):
+    """Return the number of database queries one call of ``func`` runs."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    if setup:
+        setup()
+    # The query log is a bounded deque; once full its length stops growing.
+    connection.queries_log.clear()
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len(queries)
+
+
+def load_baselines(path):
+    """Read stored benchmark results, or an empty dict if there are none yet."""
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path, results):
+    with open(path, "w") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def find_regressions(results, baselines, threshold=0.5):
+    """
+    Compare results with stored baselines.
+
+    A benchmark regresses when its median latency grows by more than
+    ``threshold`` (a fraction) or when it runs more queries than before.
+    Returns a list of human readable descriptions.
+    """
+    regressions = []
+    for name, stats in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            continue
+        limit = baseline["p50_us"] * (1 + threshold)
+        if stats["p50_us"] > limit:
+            regressions.append(
+                f"{name}: p50 {stats['p50_us']:.1f}us > "
+                f"{baseline['p50_us']:.1f}us + {threshold:.0%}"
+            )
+        if stats.get("queries", 0) > baseline.get("queries", 0):
+            regressions.append(
+                f"{name}: {stats['queries']} queries > {baseline['queries']}"
+            )
+    return regressions
+
+
+def summarize(timings):
+    """Return ops/s, mean, p50 and p99 (in microseconds) for a list of timings."""
+    ordered = sorted(timings)
+    p99_index = min(len(ordered) - 1, int(len(ordered) * 0.99))
+    mean = statistics.fmean(ordered)
+    return {
+        "ops_per_sec": 1 / mean if mean else 0.0,
+        "mean_us": mean * 1e6,
+        "p50_us": statistics.median(ordered) * 1e6,
+        "p99_us": ordered[p99_index] * 1e6,
+    }
+
+
+def report(name, timings, queries=None):
+    """Print a one-line summary for a benchmark."""
+    stats = summarize(timings)
+    line = (
+        f"{name:<45} {stats['ops_per_sec']:>12,.0f} ops/s  "
+        f"mean {stats['mean_us']:>9.1f}us  "
+        f"p50 {stats['p50_us']:>9.1f}us  "
+        f"p99 {stats['p99_us']:>9.1f}us"
+    )
+    if queries is not None:
+        stats["queries"] = queries
+        line += f"  {queries:>2} queries"
+    print(line)
+    return stats
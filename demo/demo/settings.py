@@ -176,6 +176,12 @@ WAANVERSE_AUTH_CONFIG = {
     "BLACKLISTED_EMAILS": ["blocked@gmail.com"],
     "ACCESS_TOKEN_COOKIE_NAME": "a_t",
     "REFRESH_TOKEN_COOKIE_NAME": "r_t",
+    "RATE_LIMIT_ENABLED": not TESTING,
+    "WEBAUTHN_CHALLENGE_STORE": (
+        "dj_waanverse_auth.services.challenge_store.InMemoryChallengeStore"
+        if TESTING
+        else "dj_waanverse_auth.services.challenge_store.CacheChallengeStore"
+    ),
 }
 
 REST_FRAMEWORK = {
@@ -0,0 +1,283 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone, translation
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from dj_waanverse_auth import settings
+from dj_waanverse_auth.models import AccessCode
+from dj_waanverse_auth.utils.cleanup_utils import delete_expired_access_codes
+from dj_waanverse_auth.utils.email_utils import (
+    _get_access_code_subject,
+    issue_access_code,
+)
+
+Account = get_user_model()
+
+
+class AccessCodeTests(APITestCase):
+    def setUp(self):
+        self.login_url = reverse("dj_waanverse_auth_login")
+        self.email = "code@example.com"
+        Account.objects.create_user(email_address=self.email, username="codeuser")
+        mail.outbox = []
+
+    def _request_code(self):
+        self.client.post(self.login_url, {"email_address": self.email})
+        return re.search(r"\d{6}", mail.outbox[-1].body).group()
+
+    def test_code_is_stored_hashed(self):
+        code = self._request_code()
+
+        access_code = AccessCode.objects.get(email_address=self.email)
+        self.assertNotEqual(access_code.code_hash, code)
+        self.assertEqual(access_code.code_hash, AccessCode.hash_code(code))
+        self.assertTrue(access_code.check_code(code))
+        self.assertFalse(access_code.check_code("000000"))
+
+    def test_code_locks_after_max_attempts(self):
+        code = self._request_code()
+        wrong_code = "000000" if code != "000000" else "111111"
+
+        for _ in range(settings.access_code_max_attempts):
+            response = self.client.post(
+                self.login_url, {"email_address": self.email, "code": wrong_code}
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(
+            AccessCode.objects.get(email_address=self.email).attempts,
+            settings.access_code_max_attempts,
+        )
+
+        # The correct code is rejected once the code is locked.
+        response = self.client.post(
+            self.login_url, {"email_address": self.email, "code": code}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failed_attempts_from_stale_instances_stop_at_the_limit(self):
+        self._request_code()
+        max_attempts = settings.access_code_max_attempts
+        AccessCode.objects.update(attempts=max_attempts - 1)
+        first = AccessCode.objects.get(email_address=self.email)
+        second = AccessCode.objects.get(email_address=self.email)
+
+        self.assertFalse(first.register_failed_attempt())
+        self.assertFalse(second.register_failed_attempt())
+        self.assertTrue(second.is_locked())
+        self.assertEqual(
+            AccessCode.objects.get(email_address=self.email).attempts, max_attempts
+        )
+
+    def test_valid_code_logs_in(self):
+        code = self._request_code()
+
+        response = self.client.post(
+            self.login_url, {"email_address": self.email, "code": code}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(AccessCode.objects.filter(email_address=self.email).exists())
+
+    def test_subject_is_translated_per_language(self):
+        _get_access_code_subject.cache_clear()
+        self.addCleanup(_get_access_code_subject.cache_clear)
+
+        def gettext(message):
+            return f"[{translation.get_language()}] {message}"
+
+        with patch("dj_waanverse_auth.utils.email_utils.gettext", gettext):
+            with translation.override("fr"):
+                self._request_code()
+            german_subject = _get_access_code_subject("de")
+
+        self.assertEqual(
+            mail.outbox[-1].subject, f"[fr] {settings.platform_name} Access Code"
+        )
+        self.assertEqual(german_subject, f"[de] {settings.platform_name} Access Code")
+
+
+class AccessCodeVerificationConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        self.email = "burst@example.com"
+        self.code = "123456"
+        Account.objects.create_user(email_address=self.email, username="burstuser")
+        issue_access_code(self.email, self.code)
+
+    def submit_in_parallel(self, codes, check_code):
+        # Once a request has read and checked the code, its writes run alone:
+        # SQLite's shared in-memory test database rejects concurrent writers.
+        writes = threading.Lock()
+        holder = threading.local()
+
+        def checked_alone(instance, code):
+            matched = check_code(instance, code)
+            writes.acquire()
+            holder.writing = True
+            return matched
+
+        def submit(code):
+            holder.writing = False
+            try:
+                response = APIClient().post(
+                    reverse("dj_waanverse_auth_login"),
+                    {"email_address": self.email, "code": code},
+                )
+                return response.status_code
+            finally:
+                connection.close()
+                if holder.writing:
+                    writes.release()
+
+        with patch.object(AccessCode, "check_code", checked_alone):
+            with ThreadPoolExecutor(max_workers=len(codes)) as executor:
+                return list(executor.map(submit, codes))
+
+    def test_parallel_guesses_cannot_exceed_the_attempt_limit(self):
+        max_attempts = settings.access_code_max_attempts
+        AccessCode.objects.update(attempts=max_attempts - 1)
+        guesses = [f"{200000 + i}" for i in range(max_attempts)] + [self.code]
+
+        # Every request reads the code at its last allowed attempt, and the
+        # right guess is only checked once the wrong ones have locked it.
+        original_check_code = AccessCode.check_code
+        everyone_has_read = threading.Barrier(len(guesses))
+        locked = threading.Event()
+
+        def check_code(instance, code):
+            everyone_has_read.wait(timeout=10)
+            matched = original_check_code(instance, code)
+            if matched:
+                locked.wait(timeout=10)
+            return matched
+
+        original_register = AccessCode.register_failed_attempt
+
+        def register_failed_attempt(instance):
+            still_usable = original_register(instance)
+            if not still_usable:
+                locked.set()
+            return still_usable
+
+        with patch.object(
+            AccessCode, "register_failed_attempt", register_failed_attempt
+        ):
+            statuses = self.submit_in_parallel(guesses, check_code)
+
+        self.assertTrue(locked.is_set())
+        self.assertEqual(statuses, [status.HTTP_400_BAD_REQUEST] * len(guesses))
+        self.assertEqual(AccessCode.objects.get().attempts, max_attempts)
+
+    def test_a_code_logs_in_only_once(self):
+        original_check_code = AccessCode.check_code
+        everyone_has_read = threading.Barrier(2)
+
+        def check_code(instance, code):
+            everyone_has_read.wait(timeout=10)
+            return original_check_code(instance, code)
+
+        statuses = self.submit_in_parallel([self.code, self.code], check_code)
+
+        self.assertEqual(
+            sorted(statuses), [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST]
+        )
+        self.assertFalse(AccessCode.objects.exists())
+
+
+class AccessCodeIssuanceConcurrencyTests(TransactionTestCase):
+    def test_concurrent_requests_issue_a_single_code(self):
+        """Only one of many concurrent requests for the same address gets a code."""
+        email = "race@example.com"
+
+        def issue(code):
+            try:
+                return issue_access_code(email, code)
+            finally:
+                connection.close()
+
+        codes = [f"{100000 + i}" for i in range(32)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(issue, codes))
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(AccessCode.objects.filter(email_address=email).count(), 1)
+
+        issued_code = codes[results.index(True)]
+        self.assertTrue(AccessCode.objects.get(email_address=email).check_code(issued_code))
+
+    def test_code_is_reissued_after_resend_interval(self):
+        email = "reissue@example.com"
+        now = timezone.now()
+
+        self.assertTrue(issue_access_code(email, "111111", now=now))
+        self.assertFalse(issue_access_code(email, "222222", now=now))
+        self.assertTrue(
+            issue_access_code(email, "333333", now=now + timedelta(minutes=2))
+        )
+
+        access_code = AccessCode.objects.get(email_address=email)
+        self.assertTrue(access_code.check_code("333333"))
+        self.assertEqual(access_code.attempts, 0)
+
+
+class ExpiredAccessCodeCleanupTests(APITestCase):
+    def setUp(self):
+        now = timezone.now()
+        for i in range(5):
+            AccessCode.objects.create(
+                email_address=f"expired{i}@example.com",
+                code_hash=AccessCode.hash_code("123456"),
+                expires_at=now - timedelta(minutes=i + 1),
+            )
+        for i in range(2):
+            AccessCode.objects.create(
+                email_address=f"live{i}@example.com",
+                code_hash=AccessCode.hash_code("123456"),
+                expires_at=now + timedelta(minutes=5),
+            )
+
+    def test_dry_run_deletes_nothing(self):
+        out = StringIO()
+        call_command("manage_access_codes", "--dry-run", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Would delete 5 expired access codes", out.getvalue())
+        self.assertEqual(AccessCode.objects.count(), 7)
+
+    def test_expired_codes_are_deleted_in_batches(self):
+        out = StringIO()
+        call_command("manage_access_codes", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Successfully deleted 5 expired access codes in 3 batches", out.getvalue())
+        self.assertEqual(AccessCode.objects.count(), 2)
+        self.assertFalse(
+            AccessCode.objects.filter(expires_at__lt=timezone.now()).exists()
+        )
+
+    def test_codes_reissued_during_a_chunk_are_kept(self):
+        email = "expired0@example.com"
+        AccessCode.objects.update(created_at=timezone.now() - timedelta(minutes=10))
+        original_filter = AccessCode.objects.filter
+
+        def filter(*args, **kwargs):
+            if "pk__in" in kwargs:
+                # The user requests a new code between the select and the delete.
+                self.assertTrue(issue_access_code(email, "654321"))
+            return original_filter(*args, **kwargs)
+
+        with patch.object(AccessCode.objects, "filter", filter):
+            deleted = sum(delete_expired_access_codes())
+
+        self.assertEqual(deleted, 4)
+        self.assertTrue(AccessCode.objects.get(email_address=email).check_code("654321"))
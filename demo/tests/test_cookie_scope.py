@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from dj_waanverse_auth import settings as auth_settings
+from dj_waanverse_auth.authentication import JWTAuthentication
+from dj_waanverse_auth.models import UserSession
+from dj_waanverse_auth.services.token_service import TokenService
+
+Account = get_user_model()
+
+ORDINARY_PATHS = ("/v1/auth/me/", "/v1/accounts/", "/static/app.js", "/")
+
+
+def path_matches(request_path, cookie_path):
+    """Path-match of RFC 6265, section 5.1.4."""
+    if request_path == cookie_path:
+        return True
+    if request_path.startswith(cookie_path):
+        return cookie_path.endswith("/") or request_path[len(cookie_path)] == "/"
+    return False
+
+
+def cookie_header_bytes(response, request_path):
+    """Size of the Cookie header a browser sends after storing the cookies."""
+    pairs = [
+        f"{morsel.key}={morsel.value}"
+        for morsel in response.cookies.values()
+        if path_matches(request_path, morsel["path"])
+    ]
+    return len(f"Cookie: {'; '.join(pairs)}") if pairs else 0
+
+
+class RefreshCookieScopeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="scope@example.com", username="scopeuser", is_active=True
+        )
+        # Both logins reuse the session, so their tokens have the same size.
+        self.session = UserSession.objects.create(account=self.user)
+        self.refresh_path = reverse("dj_waanverse_auth_refresh_token")
+        self.factory = RequestFactory()
+
+    def login_response(self):
+        request = self.factory.post(reverse("dj_waanverse_auth_login"))
+        token_service = TokenService(
+            request, user=self.user, session_id=self.session.id
+        )
+        return token_service.setup_login_cookies(HttpResponse())["response"]
+
+    def scoped(self):
+        patcher = patch(
+            "dj_waanverse_auth.settings.refresh_cookie_path", self.refresh_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_refresh_cookie_defaults_to_the_shared_scope(self):
+        response = self.login_response()
+
+        refresh_cookie = response.cookies[auth_settings.refresh_token_cookie]
+        self.assertEqual(refresh_cookie["path"], auth_settings.cookie_path)
+
+    def test_scoped_refresh_cookie_saves_header_bytes(self):
+        shared = self.login_response()
+        self.scoped()
+        scoped = self.login_response()
+
+        refresh_cookie = scoped.cookies[auth_settings.refresh_token_cookie]
+        access_cookie = scoped.cookies[auth_settings.access_token_cookie]
+        self.assertEqual(refresh_cookie["path"], self.refresh_path)
+        self.assertEqual(access_cookie["path"], auth_settings.cookie_path)
+
+        refresh_pair_bytes = len(f"; {refresh_cookie.key}={refresh_cookie.value}")
+        for path in ORDINARY_PATHS:
+            with self.subTest(path=path):
+                saved = cookie_header_bytes(shared, path) - cookie_header_bytes(
+                    scoped, path
+                )
+                self.assertEqual(saved, refresh_pair_bytes)
+                self.assertGreater(saved, 500)
+
+        # The refresh endpoint still receives both cookies.
+        self.assertEqual(
+            cookie_header_bytes(scoped, self.refresh_path),
+            cookie_header_bytes(shared, self.refresh_path),
+        )
+
+    def test_cookies_are_cleared_from_their_own_scope(self):
+        self.scoped()
+        request = self.factory.post("/")
+        cleared = TokenService(request).clear_all_cookies(HttpResponse())
+
+        request.META["HTTP_X_COOKIES_TO_DELETE"] = ",".join(
+            [auth_settings.access_token_cookie, auth_settings.refresh_token_cookie]
+        )
+        marked = JWTAuthentication.delete_marked_cookies(HttpResponse(), request)
+
+        for response in (cleared, marked):
+            refresh_cookie = response.cookies[auth_settings.refresh_token_cookie]
+            access_cookie = response.cookies[auth_settings.access_token_cookie]
+            self.assertEqual(refresh_cookie["path"], self.refresh_path)
+            self.assertEqual(refresh_cookie["max-age"], 0)
+            self.assertEqual(access_cookie["path"], auth_settings.cookie_path)
@@ -0,0 +1,102 @@
+import logging
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework import exceptions
+
+from dj_waanverse_auth.utils.logging_utils import EventLogger, event_sampler
+from dj_waanverse_auth.utils.token_utils import decode_token, encode_token
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted while the level is disabled")
+
+
+class EventLoggerTests(SimpleTestCase):
+    def setUp(self):
+        event_sampler.reset()
+        self.addCleanup(event_sampler.reset)
+        self.log = EventLogger("dj_waanverse_auth.tests")
+
+    def test_fields_are_attached_as_extra_and_rendered(self):
+        with self.assertLogs("dj_waanverse_auth.tests", logging.WARNING) as logs:
+            self.log.warning(
+                "custom_event", reason="identity_error", sid=7, user_id=None
+            )
+
+        record = logs.records[0]
+        self.assertEqual(record.event, "custom_event")
+        self.assertEqual(
+            record.event_fields, {"reason": "identity_error", "sid": 7, "user_id": None}
+        )
+        self.assertEqual(record.getMessage(), "custom_event reason=identity_error sid=7")
+        self.assertEqual(record.funcName, "test_fields_are_attached_as_extra_and_rendered")
+
+    def test_disabled_level_does_not_format(self):
+        with self.assertLogs("dj_waanverse_auth.tests", logging.WARNING) as logs:
+            self.log.debug("custom_event", value=Unformattable())
+            self.log.warning("other_event")
+
+        self.assertEqual([r.event for r in logs.records], ["other_event"])
+
+    @patch.dict("dj_waanverse_auth.settings.log_event_intervals", {"noisy_event": 60})
+    def test_repetitive_events_are_sampled(self):
+        with self.assertLogs("dj_waanverse_auth.tests", logging.INFO) as logs:
+            for _ in range(5):
+                self.log.info("noisy_event")
+            self.log.info("quiet_event")
+
+        self.assertEqual(
+            [r.event for r in logs.records], ["noisy_event", "quiet_event"]
+        )
+
+        allowed, suppressed = event_sampler.allow("noisy_event", now=float("inf"))
+        self.assertTrue(allowed)
+        self.assertEqual(suppressed, 4)
+
+    def test_expired_tokens_log_once_per_interval(self):
+        now = timezone.now()
+        token = encode_token(
+            {
+                "id": 1,
+                "sid": 1,
+                "iss": "test",
+                "iat": now - timedelta(hours=2),
+                "exp": now - timedelta(hours=1),
+            }
+        )
+
+        with self.assertLogs(
+            "dj_waanverse_auth.utils.token_utils", logging.INFO
+        ) as logs:
+            for _ in range(3):
+                with self.assertRaises(exceptions.AuthenticationFailed):
+                    decode_token(token)
+
+        self.assertEqual([r.event for r in logs.records], ["token_expired"])
+
+    def test_invalid_signature_has_its_own_reason(self):
+        token = encode_token(
+            {
+                "id": 1,
+                "sid": 1,
+                "iss": "test",
+                "iat": timezone.now(),
+                "exp": timezone.now() + timedelta(minutes=5),
+            }
+        )
+        header, payload, signature = token.split(".")
+        tampered = f"{header}.{payload}.{signature[:-4]}AAAA"
+
+        with self.assertLogs(
+            "dj_waanverse_auth.utils.token_utils", logging.WARNING
+        ) as logs:
+            with self.assertRaisesMessage(
+                exceptions.AuthenticationFailed, "Invalid token signature"
+            ):
+                decode_token(tampered)
+
+        self.assertEqual(logs.records[0].event_fields, {"reason": "signature"})
@@ -1,3 +1,5 @@
+import re
+
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
@@ -39,19 +41,18 @@ class LoginTests(APITestCase):
         self.assertEqual(
             sent_mail.to, ["test@example.com"]
         )
-        self.assertIn(access_code.code, sent_mail.body)
+        code = re.search(r"\d{6}", sent_mail.body).group()
+        self.assertTrue(access_code.check_code(code))
 
     def test_login_verify_code(self):
         response = self.client.post(
             self.login_url, {"email_address": "test@example.com"}
         )
-        access_code = AccessCode.objects.filter(
-            email_address="test@example.com"
-        ).first()
+        code = re.search(r"\d{6}", mail.outbox[-1].body).group()
 
         response = self.client.post(
             self.login_url,
-            {"email_address": "test@example.com", "code": access_code.code},
+            {"email_address": "test@example.com", "code": code},
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
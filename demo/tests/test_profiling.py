@@ -0,0 +1,123 @@
+import cProfile
+import pstats
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth.middleware import profiling
+from dj_waanverse_auth.middleware.profiling import AuthProfilingMiddleware
+from dj_waanverse_auth.utils.profiling_utils import collapse_stats
+
+PROFILING_MIDDLEWARE = "dj_waanverse_auth.middleware.profiling.AuthProfilingMiddleware"
+
+
+def inner():
+    return sum(range(20000))
+
+
+def outer():
+    return [inner() for _ in range(5)]
+
+
+class CollapseStatsTests(SimpleTestCase):
+    def test_stacks_follow_the_call_graph(self):
+        profiler = cProfile.Profile()
+        profiler.runcall(outer)
+
+        stacks = collapse_stats(pstats.Stats(profiler))
+
+        frames = [
+            [frame.split(" (")[0] for frame in stack.split(";")] for stack in stacks
+        ]
+        self.assertTrue(
+            any(
+                "inner" in names and names.index("outer") < names.index("inner")
+                for names in frames
+            )
+        )
+        self.assertTrue(all(weight > 0 for weight in stacks.values()))
+
+
+class AuthProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for name, value in (
+            ("profiling_enabled", True),
+            ("profiling_sample_rate", 1.0),
+            ("profiling_directory", self.directory.name),
+        ):
+            patcher = patch(f"dj_waanverse_auth.settings.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def files(self, pattern):
+        return sorted(Path(self.directory.name).glob(pattern))
+
+    def test_disabled_by_default(self):
+        with patch("dj_waanverse_auth.settings.profiling_enabled", False):
+            with self.assertRaises(MiddlewareNotUsed):
+                AuthProfilingMiddleware(lambda request: None)
+
+    @override_settings(MIDDLEWARE=settings.MIDDLEWARE + [PROFILING_MIDDLEWARE])
+    def test_auth_requests_are_profiled(self):
+        self.client.post(reverse("dj_waanverse_auth_passkey_login"), {}, format="json")
+        self.client.get("/admin/login/")
+
+        profiles = self.files("*.prof")
+        self.assertEqual(len(profiles), 1)
+        self.assertTrue(
+            profiles[0].name.endswith("dj_waanverse_auth_passkey_login.prof")
+        )
+        self.assertEqual(len(self.files("*.collapsed")), 1)
+
+        output = StringIO()
+        call_command(
+            "summarize_auth_profiles",
+            directory=self.directory.name,
+            limit=5,
+            collapsed=str(Path(self.directory.name) / "merged.txt"),
+            stdout=output,
+        )
+        self.assertIn("Aggregated 1 profiles", output.getvalue())
+        merged = (Path(self.directory.name) / "merged.txt").read_text()
+        self.assertIn("login_begin", merged)
+
+    @override_settings(MIDDLEWARE=settings.MIDDLEWARE + [PROFILING_MIDDLEWARE])
+    def test_unsampled_requests_are_not_profiled(self):
+        with patch("dj_waanverse_auth.settings.profiling_sample_rate", 0.0):
+            self.client.post(
+                reverse("dj_waanverse_auth_passkey_login"), {}, format="json"
+            )
+
+        self.assertEqual(self.files("*.prof"), [])
+
+    @override_settings(MIDDLEWARE=settings.MIDDLEWARE + [PROFILING_MIDDLEWARE])
+    def test_overlapping_requests_run_unprofiled(self):
+        with profiling._profiling_lock:
+            response = self.client.post(
+                reverse("dj_waanverse_auth_passkey_login"), {}, format="json"
+            )
+
+        self.assertLess(response.status_code, 500)
+        self.assertEqual(self.files("*.prof"), [])
+
+    @override_settings(MIDDLEWARE=settings.MIDDLEWARE + [PROFILING_MIDDLEWARE])
+    def test_active_profiler_elsewhere_is_not_an_error(self):
+        error = ValueError("Another profiling tool is already active")
+        with patch.object(cProfile.Profile, "enable", side_effect=error):
+            response = self.client.post(
+                reverse("dj_waanverse_auth_passkey_login"), {}, format="json"
+            )
+
+        self.assertLess(response.status_code, 500)
+        self.assertEqual(self.files("*.prof"), [])
+        self.assertFalse(profiling._profiling_lock.locked())
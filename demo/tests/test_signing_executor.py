@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import BrokenExecutor
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase
+
+from dj_waanverse_auth import settings as auth_settings
+from dj_waanverse_auth.services import signing_executor
+from dj_waanverse_auth.services.metrics import InMemoryMetricsSink
+from dj_waanverse_auth.services.signing_executor import (
+    SIGNING_FALLBACK_TOTAL,
+    SIGNING_OFFLOADED_TOTAL,
+    SigningExecutor,
+    get_signing_executor,
+)
+from dj_waanverse_auth.services.token_classes import RefreshToken
+from dj_waanverse_auth.utils.token_utils import decode_token, encode_token
+
+Account = get_user_model()
+
+CLAIMS = {"id": 1, "sid": 2, "iss": "test", "iat": 1700000000, "exp": 4000000000}
+
+
+class SigningExecutorTests(SimpleTestCase):
+    def setUp(self):
+        self.metrics = InMemoryMetricsSink()
+        patcher = patch(
+            "dj_waanverse_auth.services.metrics._metrics_sink", self.metrics
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_executor(self, kind, **kwargs):
+        executor = SigningExecutor(
+            kind, private_key_path=auth_settings.private_key_path, **kwargs
+        )
+        self.addCleanup(executor.shutdown)
+        patcher = patch(
+            "dj_waanverse_auth.services.signing_executor._signing_executor", executor
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        setting = patch("dj_waanverse_auth.settings.signing_executor", kind)
+        setting.start()
+        self.addCleanup(setting.stop)
+        return executor
+
+    def count(self, name, labels=()):
+        return self.metrics.snapshot()["counters"].get((name, labels), 0)
+
+    def test_inline_by_default(self):
+        self.assertIsNone(get_signing_executor())
+
+    def test_rejects_unknown_kind(self):
+        with self.assertRaises(ImproperlyConfigured):
+            SigningExecutor("fiber", private_key_path=auth_settings.private_key_path)
+
+    def test_thread_pool_signs_valid_tokens(self):
+        self.use_executor("thread", workers=2)
+
+        self.assertEqual(decode_token(encode_token(CLAIMS)), CLAIMS)
+        self.assertEqual(self.count(SIGNING_OFFLOADED_TOTAL), 1)
+
+    def test_process_pool_signs_valid_tokens(self):
+        self.use_executor("process", workers=1)
+
+        self.assertEqual(decode_token(encode_token(CLAIMS)), CLAIMS)
+        self.assertEqual(self.count(SIGNING_OFFLOADED_TOTAL), 1)
+
+    def test_saturated_pool_signs_inline(self):
+        executor = self.use_executor("thread", workers=1, max_pending=1)
+        release = threading.Event()
+        executor._get_pool().submit(release.wait)
+        executor._slots.acquire()
+        self.addCleanup(release.set)
+
+        self.assertEqual(decode_token(encode_token(CLAIMS)), CLAIMS)
+        self.assertEqual(
+            self.count(SIGNING_FALLBACK_TOTAL, (("reason", "saturated"),)), 1
+        )
+
+    def test_slow_signature_falls_back_inline(self):
+        self.use_executor("thread", workers=1, timeout=0.05)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with patch.object(
+            signing_executor, "_sign_in_worker", side_effect=lambda data: release.wait()
+        ):
+            token = encode_token(CLAIMS)
+
+        self.assertEqual(decode_token(token), CLAIMS)
+        self.assertEqual(
+            self.count(SIGNING_FALLBACK_TOTAL, (("reason", "timeout"),)), 1
+        )
+
+    def test_broken_pool_is_replaced(self):
+        executor = self.use_executor("thread", workers=1)
+        broken_pool = executor._get_pool()
+
+        with patch.object(broken_pool, "submit", side_effect=BrokenExecutor):
+            self.assertEqual(decode_token(encode_token(CLAIMS)), CLAIMS)
+
+        self.assertEqual(
+            self.count(SIGNING_FALLBACK_TOTAL, (("reason", "unavailable"),)), 1
+        )
+        self.assertIsNot(executor._get_pool(), broken_pool)
+        self.assertEqual(decode_token(encode_token(CLAIMS)), CLAIMS)
+        self.assertEqual(self.count(SIGNING_OFFLOADED_TOTAL), 1)
+
+
+class OffloadedTokenPairTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="signer@example.com", username="signeruser", is_active=True
+        )
+        executor = SigningExecutor(
+            "thread", private_key_path=auth_settings.private_key_path, workers=2
+        )
+        self.addCleanup(executor.shutdown)
+        for target, value in (
+            ("dj_waanverse_auth.services.signing_executor._signing_executor", executor),
+            ("dj_waanverse_auth.settings.signing_executor", "thread"),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_token_pair_verifies(self):
+        refresh = RefreshToken.for_user(self.user, session_id=3)
+
+        self.assertEqual(decode_token(str(refresh)), refresh.payload())
+        self.assertEqual(decode_token(refresh.access_token)["token_type"], "access")
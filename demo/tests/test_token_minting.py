@@ -0,0 +1,76 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import jwt
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from dj_waanverse_auth import settings as auth_settings
+from dj_waanverse_auth.services.token_classes import RefreshToken
+from dj_waanverse_auth.utils.token_utils import (
+    decode_token,
+    encode_token,
+    get_header_segment,
+    get_key,
+)
+
+Account = get_user_model()
+
+
+class TokenMintingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="minting@example.com", username="mintinguser", is_active=True
+        )
+
+    def test_header_segment_matches_pyjwt(self):
+        token = jwt.encode({"id": 1}, get_key("private"), algorithm="RS256")
+        self.assertEqual(token.split(".")[0], get_header_segment())
+
+    def test_encode_token_accepts_datetimes(self):
+        issued_at = timezone.now().replace(microsecond=0)
+        token = encode_token(
+            {
+                "id": 1,
+                "sid": 2,
+                "iss": "test",
+                "iat": issued_at,
+                "exp": issued_at + timedelta(minutes=5),
+            }
+        )
+
+        payload = decode_token(token)
+        self.assertEqual(payload["iat"], int(issued_at.timestamp()))
+        self.assertEqual(payload["exp"] - payload["iat"], 300)
+
+    def test_token_pair_shares_one_timestamp(self):
+        with patch(
+            "dj_waanverse_auth.services.token_classes.decode_token"
+        ) as mocked_decode:
+            refresh = RefreshToken.for_user(self.user, session_id=5)
+            access_token = refresh.access_token
+        mocked_decode.assert_not_called()
+
+        refresh_claims = decode_token(str(refresh))
+        access_claims = decode_token(access_token)
+        self.assertEqual(refresh_claims, refresh.payload())
+        self.assertEqual(refresh_claims["iat"], access_claims["iat"])
+        self.assertEqual(
+            access_claims["exp"] - access_claims["iat"],
+            int(auth_settings.access_token_cookie_max_age.total_seconds()),
+        )
+        self.assertEqual(access_claims["token_type"], "access")
+        self.assertEqual(access_claims["sid"], 5)
+
+    def test_access_token_is_signed_once(self):
+        refresh = RefreshToken.for_user(self.user, session_id=5)
+        access_token = refresh.access_token
+
+        with patch(
+            "dj_waanverse_auth.services.token_classes.encode_token"
+        ) as mocked_encode:
+            self.assertEqual(refresh.access_token, access_token)
+        mocked_encode.assert_not_called()
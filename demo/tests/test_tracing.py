@@ -0,0 +1,116 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth.models import AccessCode
+from dj_waanverse_auth.services.tracing import (
+    InMemoryTracer,
+    NullTracer,
+    get_tracer,
+)
+
+Account = get_user_model()
+
+
+class TracerTests(SimpleTestCase):
+    def test_null_tracer_is_the_default(self):
+        self.assertIsInstance(get_tracer(), NullTracer)
+
+    def test_spans_record_parent_attributes_and_errors(self):
+        tracer = InMemoryTracer()
+
+        with self.assertRaises(ValueError):
+            with tracer.span("outer", mode="login"):
+                with tracer.span("inner") as span:
+                    span.set_attribute("cache.hit", True)
+                raise ValueError("boom")
+
+        inner, outer = tracer.get_spans()
+        self.assertIs(inner.parent, outer)
+        self.assertEqual(inner.attributes, {"cache.hit": True, "db.query_count": 0})
+        self.assertEqual(outer.attributes["mode"], "login")
+        self.assertIsInstance(outer.error, ValueError)
+        self.assertGreaterEqual(outer.duration, inner.duration)
+
+
+class LoginTracingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.tracer = InMemoryTracer()
+        patcher = patch("dj_waanverse_auth.services.tracing._tracer", self.tracer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = Account.objects.create_user(
+            email_address="tracing@example.com", username="tracinguser", is_active=True
+        )
+        AccessCode.objects.create(
+            email_address=self.user.email_address,
+            code_hash=AccessCode.hash_code("123456"),
+            expires_at=timezone.now() + timezone.timedelta(minutes=5),
+        )
+
+    def test_login_stages_are_traced(self):
+        response = self.client.post(
+            reverse("dj_waanverse_auth_login"),
+            {"email_address": self.user.email_address, "code": "123456"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        (login,) = self.tracer.get_spans("auth.login")
+        (generate,) = self.tracer.get_spans("auth.tokens.generate")
+        (create_session,) = self.tracer.get_spans("auth.session.create")
+        sign_spans = self.tracer.get_spans("auth.token.sign")
+
+        self.assertIs(generate.parent, login)
+        self.assertIs(create_session.parent, generate)
+        self.assertEqual(generate.attributes["mode"], "login")
+        self.assertEqual(len(sign_spans), 2)
+        self.assertEqual(sign_spans[0].attributes["algorithm"], "RS256")
+        # last_login update, then the generation lookup (a cache miss) and the
+        # session insert
+        self.assertEqual(login.attributes["db.query_count"], 3)
+        self.assertEqual(create_session.attributes["db.query_count"], 2)
+
+        # Read for the new session, then again from the cache for the token
+        self.assertEqual(
+            [
+                span.attributes["cache.hit"]
+                for span in self.tracer.get_spans("auth.session.generation")
+            ],
+            [False, True],
+        )
+
+    def test_authentication_is_traced(self):
+        response = self.client.post(
+            reverse("dj_waanverse_auth_login"),
+            {"email_address": self.user.email_address, "code": "123456"},
+            format="json",
+        )
+        self.tracer.clear()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}"
+        )
+
+        self.client.get(reverse("dj_waanverse_auth_me"))
+
+        (authenticate,) = self.tracer.get_spans("auth.authenticate")
+        children = {
+            span.name for span in self.tracer.get_spans() if span.parent is authenticate
+        }
+        self.assertEqual(
+            children,
+            {
+                "auth.token.verify",
+                "auth.session.validate",
+                "auth.user.load",
+            },
+        )
+        self.assertEqual(authenticate.attributes["db.query_count"], 3)
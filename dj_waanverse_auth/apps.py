@@ -16,10 +16,39 @@ class WaanverseAuthConfig(AppConfig):
         Validate middleware configuration when the app is ready.
         This runs during Django's initialization process.
         """
+        # Importing the module registers the system checks
+        from dj_waanverse_auth import checks
+
         self.validate_required_settings()
+        self.precompile_templates()
+        self.start_access_code_sweeper()
 
     def validate_required_settings(self):
         """
         Validates other required settings are properly configured
         """
         pass
+
+    def precompile_templates(self):
+        """
+        Compile the email templates once at startup instead of on the first send
+        """
+        from dj_waanverse_auth.utils.email_utils import precompile_email_templates
+
+        precompile_email_templates()
+
+    def start_access_code_sweeper(self):
+        """
+        Start the optional in-process sweeper for expired access codes
+        """
+        from dj_waanverse_auth.config.settings import auth_config
+
+        if not auth_config.access_code_sweep_interval:
+            return
+
+        from dj_waanverse_auth.utils.cleanup_utils import AccessCodeSweeper
+
+        self.access_code_sweeper = AccessCodeSweeper(
+            auth_config.access_code_sweep_interval
+        )
+        self.access_code_sweeper.start()
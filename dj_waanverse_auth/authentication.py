@@ -1,4 +1,3 @@
-import logging
 from typing import Optional, Tuple
 
 from django.contrib.auth import get_user_model
@@ -7,12 +6,29 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.services.metrics import get_metrics_sink
+from dj_waanverse_auth.services.opaque_tokens import decode_access_token
+from dj_waanverse_auth.services.tracing import get_tracer
+from dj_waanverse_auth.utils.logging_utils import EventLogger
 from dj_waanverse_auth.utils.session_utils import validate_session
-from dj_waanverse_auth.utils.token_utils import decode_token
 
-logger = logging.getLogger(__name__)
+log = EventLogger(__name__)
 User = get_user_model()
 
+AUTHENTICATE_TOTAL = "waanverse_auth_authenticate_total"
+AUTHENTICATE_STAGE_SECONDS = "waanverse_auth_authenticate_stage_seconds"
+COOKIES_DELETED_TOTAL = "waanverse_auth_cookies_deleted_total"
+
+_EXTRACT = (("stage", "extract"),)
+_VERIFY = (("stage", "verify"),)
+_SESSION = (("stage", "session"),)
+_USER = (("stage", "user"),)
+_COOKIES = (("stage", "cookie_delete"),)
+_ANONYMOUS = (("outcome", "anonymous"),)
+_SUCCESS = (("outcome", "success"),)
+_FAILURE = (("outcome", "failure"),)
+_ERROR = (("outcome", "error"),)
+
 
 class JWTAuthentication(authentication.BaseAuthentication):
     """
@@ -23,28 +39,58 @@ class JWTAuthentication(authentication.BaseAuthentication):
     COOKIE_NAME = auth_config.access_token_cookie
 
     def authenticate(self, request: Request) -> Optional[Tuple]:
-        token = self._get_token_from_request(request)
+        with get_tracer().span("auth.authenticate"):
+            return self._authenticate(request)
+
+    def _authenticate(self, request: Request) -> Optional[Tuple]:
+        metrics = get_metrics_sink()
+        with metrics.time(AUTHENTICATE_STAGE_SECONDS, _EXTRACT):
+            token = self._get_token_from_request(request)
 
         # Short-circuit if no token (e.g., login/register requests)
         if not token:
+            metrics.increment(AUTHENTICATE_TOTAL, labels=_ANONYMOUS)
             return None
 
+        payload = {}
         try:
-            payload = self._decode_token(token)
-
-            if not validate_session(payload.get("sid")):
-                self._mark_cookie_for_deletion(request)
-                raise exceptions.AuthenticationFailed("identity_error")
-
-            user = self._get_user_from_payload(payload=payload, request=request)
+            with metrics.time(AUTHENTICATE_STAGE_SECONDS, _VERIFY):
+                payload = self._decode_token(token)
+
+            with metrics.time(AUTHENTICATE_STAGE_SECONDS, _SESSION):
+                # Also rejects tokens of a revoked session generation.
+                if not validate_session(
+                    payload.get("sid"), generation=payload.get("gen", 0)
+                ):
+                    self._mark_cookie_for_deletion(request)
+                    raise exceptions.AuthenticationFailed("identity_error")
+
+            with metrics.time(AUTHENTICATE_STAGE_SECONDS, _USER):
+                user = self._get_user_from_payload(payload=payload, request=request)
+            # Keep the verified claims so views can read e.g. the session id
+            # without decoding the token again.
+            request.token_payload = payload
+            metrics.increment(AUTHENTICATE_TOTAL, labels=_SUCCESS)
             return user, token
 
         except exceptions.AuthenticationFailed as e:
-            logger.warning(f"Authentication failed: {str(e)}")
+            metrics.increment(AUTHENTICATE_TOTAL, labels=_FAILURE)
+            log.warning(
+                "authentication_failed",
+                reason=e.detail,
+                sid=payload.get("sid"),
+                user_id=payload.get("id"),
+            )
             self._mark_cookie_for_deletion(request)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during authentication: {str(e)}")
+            metrics.increment(AUTHENTICATE_TOTAL, labels=_ERROR)
+            log.error(
+                "authentication_error",
+                error=e,
+                sid=payload.get("sid"),
+                user_id=payload.get("id"),
+            )
             self._mark_cookie_for_deletion(request)
             raise exceptions.AuthenticationFailed("Authentication failed")
 
@@ -61,18 +107,29 @@ class JWTAuthentication(authentication.BaseAuthentication):
     @staticmethod
     def delete_marked_cookies(response: Response, request: Request) -> Response:
         """
-        Delete any cookies marked during authentication
+        Delete any cookies marked during authentication, the refresh cookie
+        from its own domain and path
         """
         cookies_header = request.META.get("HTTP_X_COOKIES_TO_DELETE", "")
         cookies_to_delete = cookies_header.split(",") if cookies_header else []
 
-        for cookie_name in cookies_to_delete:
-            response.delete_cookie(
-                cookie_name,
-                domain=auth_config.cookie_domain,
-                path=auth_config.cookie_path,
-                samesite=auth_config.cookie_samesite,
-            )
+        metrics = get_metrics_sink()
+        with metrics.time(AUTHENTICATE_STAGE_SECONDS, _COOKIES):
+            for cookie_name in cookies_to_delete:
+                if cookie_name == auth_config.refresh_token_cookie:
+                    domain = auth_config.refresh_cookie_domain
+                    path = auth_config.refresh_cookie_path
+                else:
+                    domain = auth_config.cookie_domain
+                    path = auth_config.cookie_path
+                response.delete_cookie(
+                    cookie_name,
+                    domain=domain,
+                    path=path,
+                    samesite=auth_config.cookie_samesite,
+                )
+        if cookies_to_delete:
+            metrics.increment(COOKIES_DELETED_TOTAL, len(cookies_to_delete))
 
         return response
 
@@ -106,7 +163,8 @@ class JWTAuthentication(authentication.BaseAuthentication):
         return token
 
     def _decode_token(self, token: str) -> dict:
-        return decode_token(token)
+        # Opaque references are told apart by their prefix.
+        return decode_access_token(token)
 
     def _get_user_from_payload(self, payload: dict, request: Request):
         """
@@ -117,11 +175,12 @@ class JWTAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed("Invalid token payload")
 
         try:
-            user = User.objects.get(id=user_id, is_active=True)
+            with get_tracer().span("auth.user.load"):
+                user = User.objects.get(id=user_id, is_active=True)
             self._validate_user(user, payload)
             return user
         except User.DoesNotExist:
-            logger.warning(f"User {user_id} from token not found or inactive")
+            log.warning("token_user_not_found", user_id=user_id)
             raise exceptions.AuthenticationFailed(
                 "user_not_found", code="user_not_found"
             )
@@ -0,0 +1,29 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+from dj_waanverse_auth.config.settings import auth_config
+
+
+@register(Tags.caches)
+def check_rate_limit_cache(app_configs, **kwargs):
+    """
+    Warn when rate limits are kept in a process-local cache, where every
+    worker counts requests separately.
+    """
+    if not auth_config.rate_limit_enabled:
+        return []
+
+    alias = auth_config.rate_limit_cache
+    if not isinstance(caches[alias], LocMemCache):
+        return []
+    return [
+        Warning(
+            f"Rate limits are kept in the local-memory cache {alias!r}.",
+            hint=(
+                "Each worker process enforces its own limits. Point "
+                "RATE_LIMIT_CACHE at a shared cache such as Redis or Memcached."
+            ),
+            id="dj_waanverse_auth.W001",
+        )
+    ]
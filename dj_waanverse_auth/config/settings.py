@@ -5,6 +5,43 @@ from django.conf import settings
 
 from .types import AuthConfigSchema
 
+DEFAULT_RATE_LIMITS = {
+    "login": {
+        "rate": "10/min",
+        "algorithm": "sliding_window",
+        "keys": ["ip", "email"],
+    },
+    "signup": {
+        "rate": "5/min",
+        "algorithm": "sliding_window",
+        "keys": ["ip"],
+    },
+    "refresh": {
+        "rate": "30/min",
+        "algorithm": "token_bucket",
+        "keys": ["session", "ip"],
+    },
+    "passkey_login_begin": {
+        "rate": "20/min",
+        "algorithm": "token_bucket",
+        "keys": ["ip"],
+    },
+    "passkey_login_complete": {
+        "rate": "10/min",
+        "algorithm": "sliding_window",
+        "keys": ["ip"],
+    },
+}
+
+# Minimum seconds between two log records of a repetitive event, per process.
+# Records dropped in between are counted in the next one.
+DEFAULT_LOG_EVENT_INTERVALS = {
+    "token_expired": 60,
+    "token_invalid": 10,
+    "authentication_failed": 10,
+    "rate_limited": 10,
+}
+
 
 @dataclass
 class AuthConfig:
@@ -30,6 +67,15 @@ class AuthConfig:
         )
         self.cookie_path = config_dict.get("COOKIE_PATH", "/")
         self.cookie_domain = config_dict.get("COOKIE_DOMAIN", None)
+        # Scope of the refresh cookie, e.g. the refresh endpoint's path so the
+        # refresh token is not sent with every request. Defaults to the scope
+        # of the access cookie.
+        self.refresh_cookie_path = config_dict.get(
+            "REFRESH_COOKIE_PATH", self.cookie_path
+        )
+        self.refresh_cookie_domain = config_dict.get(
+            "REFRESH_COOKIE_DOMAIN", self.cookie_domain
+        )
         self.cookie_samesite = config_dict.get("COOKIE_SAMESITE_POLICY", "Lax")
 
         self.cookie_secure = config_dict.get("COOKIE_SECURE", False)
@@ -58,9 +104,115 @@ class AuthConfig:
             "LOGIN_CODE_EMAIL_SUBJECT", "Login code"
         )
 
+        self.access_code_max_attempts = config_dict.get(
+            "ACCESS_CODE_MAX_ATTEMPTS", 5
+        )
+        self.access_code_sweep_interval = config_dict.get(
+            "ACCESS_CODE_SWEEP_INTERVAL", None
+        )
+
+        # Token Signing
+        # "inline" signs in the request thread; "thread" or "process" offload
+        # RSA signing to a bounded pool, falling back to inline when saturated.
+        self.signing_executor = config_dict.get("SIGNING_EXECUTOR", "inline")
+        self.signing_executor_workers = config_dict.get(
+            "SIGNING_EXECUTOR_WORKERS", None
+        )
+        self.signing_executor_max_pending = config_dict.get(
+            "SIGNING_EXECUTOR_MAX_PENDING", None
+        )
+        self.signing_executor_timeout = config_dict.get(
+            "SIGNING_EXECUTOR_TIMEOUT", 2.0
+        )
+
+        # Batch Verification
+        self.verified_token_cache_size = config_dict.get(
+            "VERIFIED_TOKEN_CACHE_SIZE", 4096
+        )
+        self.batch_verify_workers = config_dict.get("BATCH_VERIFY_WORKERS", 4)
+
+        # Claim Profile
+        # "compact" encodes tokens with short claim names, integer token types
+        # and the short TOKEN_ISSUER_ID string as issuer; both profiles are
+        # always accepted.
+        self.token_claim_profile = config_dict.get(
+            "TOKEN_CLAIM_PROFILE", "standard"
+        )
+        self.token_issuer_id = config_dict.get("TOKEN_ISSUER_ID", "1")
+        self.compact_token_omit_defaults = config_dict.get(
+            "COMPACT_TOKEN_OMIT_DEFAULTS", True
+        )
+
+        # Access Token Format
+        # "opaque" issues short random references whose claims are kept in
+        # OPAQUE_TOKEN_CACHE and the database instead of RS256 JWTs.
+        self.access_token_format = config_dict.get("ACCESS_TOKEN_FORMAT", "jwt")
+        self.opaque_token_cache = config_dict.get("OPAQUE_TOKEN_CACHE", "default")
+
+        # Session Caching
+        self.session_cache = config_dict.get("SESSION_CACHE", "default")
+        self.session_generation_cache_timeout = config_dict.get(
+            "SESSION_GENERATION_CACHE_TIMEOUT", 300
+        )
+
+        # Rate Limiting. Off by default: behind a reverse proxy, the "ip" key of
+        # the default limits needs RATE_LIMIT_TRUSTED_PROXIES, or every client
+        # shares the proxy's address.
+        self.rate_limit_enabled = config_dict.get("RATE_LIMIT_ENABLED", False)
+        self.rate_limit_cache = config_dict.get("RATE_LIMIT_CACHE", "default")
+        # Reverse proxies whose X-Forwarded-For is trusted for the "ip" key.
+        # Without them, requests are limited by REMOTE_ADDR.
+        self.rate_limit_trusted_proxies = config_dict.get(
+            "RATE_LIMIT_TRUSTED_PROXIES", []
+        )
+        self.rate_limits = {
+            **DEFAULT_RATE_LIMITS,
+            **config_dict.get("RATE_LIMITS", {}),
+        }
+
         self.webauthn_domain = config_dict.get("WEBAUTHN_DOMAIN", None)
         self.webauthn_rp_name = config_dict.get("WEBAUTHN_RP_NAME", None)
         self.webauthn_origin = config_dict.get("WEBAUTHN_ORIGIN", None)
+        self.webauthn_challenge_store = config_dict.get(
+            "WEBAUTHN_CHALLENGE_STORE",
+            "dj_waanverse_auth.services.challenge_store.CacheChallengeStore",
+        )
+        self.webauthn_challenge_cache = config_dict.get(
+            "WEBAUTHN_CHALLENGE_CACHE", "default"
+        )
+        self.webauthn_challenge_timeout = config_dict.get(
+            "WEBAUTHN_CHALLENGE_TIMEOUT", 120
+        )
+        # Usernameless (discoverable credential) login is the default; the
+        # email-hinted allow-list reveals which addresses have passkeys. With
+        # the hint off, legacy (non-discoverable) passkeys are still listed for
+        # an email address until a login proves them resident.
+        self.webauthn_email_hint_enabled = config_dict.get(
+            "WEBAUTHN_EMAIL_HINT_ENABLED", False
+        )
+        self.webauthn_allow_list_cache_timeout = config_dict.get(
+            "WEBAUTHN_ALLOW_LIST_CACHE_TIMEOUT", 300
+        )
+        self.passkey_last_used_update_interval = config_dict.get(
+            "PASSKEY_LAST_USED_UPDATE_INTERVAL", timedelta(minutes=5)
+        )
+
+        # Observability
+        self.tracer = config_dict.get(
+            "TRACER", "dj_waanverse_auth.services.tracing.NullTracer"
+        )
+        self.profiling_enabled = config_dict.get("PROFILING_ENABLED", False)
+        self.profiling_sample_rate = config_dict.get("PROFILING_SAMPLE_RATE", 0.01)
+        self.profiling_directory = config_dict.get(
+            "PROFILING_DIRECTORY", "auth_profiles"
+        )
+        self.log_event_intervals = {
+            **DEFAULT_LOG_EVENT_INTERVALS,
+            **config_dict.get("LOG_EVENT_INTERVALS", {}),
+        }
+        self.metrics_sink = config_dict.get(
+            "METRICS_SINK", "dj_waanverse_auth.services.metrics.NullMetricsSink"
+        )
 
         self.is_testing = config_dict.get("IS_TESTING", False)
 
@@ -1,5 +1,13 @@
 from datetime import timedelta
-from typing import List, Optional, TypedDict
+from typing import Dict, List, Literal, Optional, TypedDict
+
+
+class RateLimitSchema(TypedDict, total=False):
+    """Rate limit for one endpoint scope."""
+
+    rate: str
+    algorithm: str
+    keys: List[str]
 
 
 class AuthConfigSchema(TypedDict, total=False):
@@ -15,6 +23,8 @@ class AuthConfigSchema(TypedDict, total=False):
     REFRESH_TOKEN_COOKIE_NAME: str
     COOKIE_PATH: str
     COOKIE_DOMAIN: Optional[str]
+    REFRESH_COOKIE_PATH: str
+    REFRESH_COOKIE_DOMAIN: Optional[str]
     COOKIE_SAMESITE_POLICY: str
     COOKIE_SECURE: bool
     COOKIE_HTTP_ONLY: bool
@@ -34,6 +44,52 @@ class AuthConfigSchema(TypedDict, total=False):
 
     IS_TESTING: bool
 
+    ACCESS_CODE_MAX_ATTEMPTS: int
+    ACCESS_CODE_SWEEP_INTERVAL: Optional[timedelta]
+
+    # Token Signing
+    SIGNING_EXECUTOR: Literal["inline", "thread", "process"]
+    SIGNING_EXECUTOR_WORKERS: Optional[int]
+    SIGNING_EXECUTOR_MAX_PENDING: Optional[int]
+    SIGNING_EXECUTOR_TIMEOUT: float
+
+    # Batch Verification
+    VERIFIED_TOKEN_CACHE_SIZE: int
+    BATCH_VERIFY_WORKERS: int
+
+    # Claim Profile
+    TOKEN_CLAIM_PROFILE: Literal["standard", "compact"]
+    TOKEN_ISSUER_ID: str
+    COMPACT_TOKEN_OMIT_DEFAULTS: bool
+
+    # Access Token Format
+    ACCESS_TOKEN_FORMAT: Literal["jwt", "opaque"]
+    OPAQUE_TOKEN_CACHE: str
+
+    # Session Caching
+    SESSION_CACHE: str
+    SESSION_GENERATION_CACHE_TIMEOUT: int
+
+    # Rate Limiting
+    RATE_LIMIT_ENABLED: bool
+    RATE_LIMIT_CACHE: str
+    RATE_LIMIT_TRUSTED_PROXIES: List[str]
+    RATE_LIMITS: Dict[str, Optional[RateLimitSchema]]
+
     WEBAUTHN_DOMAIN: str
     WEBAUTHN_RP_NAME: str
     WEBAUTHN_ORIGIN: str
+    WEBAUTHN_CHALLENGE_STORE: str
+    WEBAUTHN_CHALLENGE_CACHE: str
+    WEBAUTHN_CHALLENGE_TIMEOUT: int
+    WEBAUTHN_EMAIL_HINT_ENABLED: bool
+    WEBAUTHN_ALLOW_LIST_CACHE_TIMEOUT: int
+    PASSKEY_LAST_USED_UPDATE_INTERVAL: timedelta
+
+    # Observability
+    METRICS_SINK: str
+    TRACER: str
+    PROFILING_ENABLED: bool
+    PROFILING_SAMPLE_RATE: float
+    PROFILING_DIRECTORY: str
+    LOG_EVENT_INTERVALS: Dict[str, Optional[int]]
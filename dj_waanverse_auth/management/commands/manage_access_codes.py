@@ -0,0 +1,68 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from dj_waanverse_auth.utils.cleanup_utils import delete_expired_access_codes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deletes expired access codes in bounded batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be deleted without actually deleting",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Maximum number of codes deleted per statement (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+
+        try:
+            started = time.perf_counter()
+            total = 0
+            batches = 0
+
+            for count in delete_expired_access_codes(
+                batch_size=batch_size, dry_run=dry_run
+            ):
+                total += count
+                batches += 1
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"Batch {batches}: {count} codes")
+
+            elapsed = time.perf_counter() - started
+            throughput = total / elapsed if elapsed > 0 else 0
+
+            if dry_run:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Would delete {total} expired access codes (dry run)"
+                    )
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Successfully deleted {total} expired access codes "
+                        f"in {batches} batches ({elapsed:.2f}s, {throughput:.0f} codes/s)"
+                    )
+                )
+
+            logger.info(f"Expired access code cleanup completed. Deleted count: {total}")
+
+        except Exception as e:
+            logger.error(f"Error during access code cleanup: {str(e)}")
+            self.stdout.write(
+                self.style.ERROR(f"Error during access code cleanup: {str(e)}")
+            )
+            raise
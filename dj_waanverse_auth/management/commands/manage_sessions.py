@@ -4,15 +4,17 @@ from django.core.management.base import BaseCommand
 from django.db.models import Q
 from django.utils import timezone
 
-from dj_waanverse_auth.models import UserSession
+from dj_waanverse_auth.models import OpaqueAccessToken, UserSession
 from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.services.opaque_tokens import delete_expired_opaque_tokens
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
     help = (
-        "Deletes expired user sessions based on creation date and refresh token max age"
+        "Deletes expired user sessions based on creation date and refresh token max age, "
+        "and expired opaque access tokens"
     )
 
     def add_arguments(self, parser):
@@ -47,6 +49,15 @@ class Command(BaseCommand):
                         f"Would delete session {session.id} "
                         f"(created: {session.created_at})"
                     )
+                expired_tokens = OpaqueAccessToken.objects.filter(
+                    expires_at__lt=timezone.now()
+                ).count()
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Would delete {expired_tokens} expired opaque access tokens "
+                        "(dry run)"
+                    )
+                )
             else:
                 deleted_count = expired_sessions.delete()[0]
                 self.stdout.write(
@@ -54,6 +65,13 @@ class Command(BaseCommand):
                         f"Successfully deleted {deleted_count} expired sessions"
                     )
                 )
+                deleted_tokens = delete_expired_opaque_tokens()
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Successfully deleted {deleted_tokens} expired opaque "
+                        "access tokens"
+                    )
+                )
 
             logger.info(f"Expired session cleanup completed. Deleted count: {count}")
 
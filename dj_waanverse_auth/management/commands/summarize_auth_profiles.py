@@ -0,0 +1,72 @@
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.utils.profiling_utils import (
+    COLLAPSED_SUFFIX,
+    find_profiles,
+    load_stats,
+    read_collapsed,
+    write_collapsed,
+)
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+
+class Command(BaseCommand):
+    help = "Summarizes the hottest functions across sampled auth request profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--directory",
+            default=auth_config.profiling_directory,
+            help="Directory with the profile dumps (default: PROFILING_DIRECTORY)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=25,
+            help="Number of functions to show (default: 25)",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=SORT_KEYS,
+            default="tottime",
+            help="Sort order of the functions (default: tottime)",
+        )
+        parser.add_argument(
+            "--collapsed",
+            help="Also merge the collapsed stacks of all dumps into this file",
+        )
+
+    def handle(self, *args, **options):
+        profiles = find_profiles(options["directory"])
+        if not profiles:
+            raise CommandError(f"No profiles found in {options['directory']}")
+
+        stats = load_stats(profiles)
+        output = io.StringIO()
+        stats.stream = output
+        stats.sort_stats(options["sort"]).print_stats(options["limit"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Aggregated {len(profiles)} profiles, "
+                f"{stats.total_tt * 1000:.1f}ms in total"
+            )
+        )
+        self.stdout.write(output.getvalue())
+
+        if options["collapsed"]:
+            merged = {}
+            for profile in profiles:
+                collapsed_path = profile.with_suffix(COLLAPSED_SUFFIX)
+                if not collapsed_path.exists():
+                    continue
+                for stack, weight in read_collapsed(collapsed_path).items():
+                    merged[stack] = merged.get(stack, 0) + weight
+            write_collapsed(merged, options["collapsed"])
+            self.stdout.write(
+                f"Wrote {len(merged)} collapsed stacks to {options['collapsed']}"
+            )
@@ -0,0 +1,100 @@
+import cProfile
+import pstats
+import random
+import threading
+from pathlib import Path
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.utils.logging_utils import EventLogger
+from dj_waanverse_auth.utils.profiling_utils import (
+    COLLAPSED_SUFFIX,
+    PROFILE_SUFFIX,
+    collapse_stats,
+    profile_filename,
+    write_collapsed,
+)
+
+log = EventLogger(__name__)
+
+# Since Python 3.12 a profiler is process-wide and only one may be enabled at
+# a time, so at most one request is profiled at once.
+_profiling_lock = threading.Lock()
+
+
+class AuthProfilingMiddleware:
+    """
+    Opt-in sampling profiler for auth requests.
+
+    With ``PROFILING_ENABLED``, a ``PROFILING_SAMPLE_RATE`` fraction of the
+    requests routed to this package's views or carrying a token for
+    ``JWTAuthentication`` runs under ``cProfile``. Each sampled request
+    writes a pstats dump and flame graph ready collapsed stacks to
+    ``PROFILING_DIRECTORY``; ``summarize_auth_profiles`` aggregates them.
+
+    Only one request is profiled at a time: sampled requests arriving while
+    another one is being profiled run unprofiled.
+    """
+
+    def __init__(self, get_response):
+        if not auth_config.profiling_enabled:
+            raise MiddlewareNotUsed("Auth profiling is disabled")
+        self.get_response = get_response
+        self.sample_rate = auth_config.profiling_sample_rate
+        self.directory = Path(auth_config.profiling_directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        label = self._get_label(request)
+        if label is None:
+            return self.get_response(request)
+
+        if not _profiling_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Another profiling tool is already active in this process.
+                log.warning("profile_skipped", label=label, error=e)
+                return self.get_response(request)
+            try:
+                return self.get_response(request)
+            finally:
+                profiler.disable()
+                self._dump(profiler, label)
+        finally:
+            _profiling_lock.release()
+
+    def _get_label(self, request):
+        """Return a label for requests worth profiling, None for the others."""
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            match = None
+        if match is not None and match.func.__module__.startswith(
+            "dj_waanverse_auth."
+        ):
+            return match.url_name or match.view_name
+
+        has_bearer = request.headers.get("Authorization", "").startswith("Bearer ")
+        if has_bearer or auth_config.access_token_cookie in request.COOKIES:
+            return "authenticated"
+        return None
+
+    def _dump(self, profiler, label):
+        base_name = profile_filename(label)
+        try:
+            profiler.dump_stats(self.directory / f"{base_name}{PROFILE_SUFFIX}")
+            write_collapsed(
+                collapse_stats(pstats.Stats(profiler)),
+                self.directory / f"{base_name}{COLLAPSED_SUFFIX}",
+            )
+        except OSError as e:
+            log.error("profile_dump_error", directory=self.directory, error=e)
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+def delete_plaintext_codes(apps, schema_editor):
+    # Plaintext codes cannot be converted to hashes; they are short-lived, so
+    # outstanding ones are simply invalidated.
+    AccessCode = apps.get_model("dj_waanverse_auth", "AccessCode")
+    AccessCode.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0004_passkey_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_plaintext_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='accesscode',
+            name='code',
+        ),
+        migrations.AddField(
+            model_name='accesscode',
+            name='code_hash',
+            field=models.CharField(default='', max_length=64, verbose_name='Code Hash'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='accesscode',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Failed Attempts'),
+        ),
+        migrations.AlterField(
+            model_name='accesscode',
+            name='email_address',
+            field=models.EmailField(max_length=254, unique=True, verbose_name='Email Address'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0005_access_code_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='accesscode',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, verbose_name='Expires At'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0006_accesscode_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='passkey',
+            name='credential_id_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
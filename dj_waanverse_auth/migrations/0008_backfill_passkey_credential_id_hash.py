@@ -0,0 +1,43 @@
+import hashlib
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def backfill_credential_id_hash(apps, schema_editor):
+    Passkey = apps.get_model("dj_waanverse_auth", "Passkey")
+    db_alias = schema_editor.connection.alias
+    pending = (
+        Passkey.objects.using(db_alias)
+        .filter(credential_id_hash__isnull=True)
+        .order_by("pk")
+        .only("pk", "credential_id")
+    )
+
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        for passkey in batch:
+            passkey.credential_id_hash = hashlib.sha256(
+                bytes(passkey.credential_id)
+            ).hexdigest()
+        with transaction.atomic(using=db_alias):
+            Passkey.objects.using(db_alias).bulk_update(batch, ["credential_id_hash"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+    # Each batch is committed separately so large tables are not backfilled
+    # in one long-running transaction.
+    atomic = False
+
+    dependencies = [
+        ('dj_waanverse_auth', '0007_passkey_credential_id_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_credential_id_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0008_backfill_passkey_credential_id_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='passkey',
+            name='credential_id_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='passkey',
+            name='credential_id',
+            field=models.BinaryField(),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0009_alter_passkey_credential_id_hash_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='passkey',
+            name='last_used_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
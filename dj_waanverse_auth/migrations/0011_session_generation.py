@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dj_waanverse_auth', '0010_passkey_last_used_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionGeneration',
+            fields=[
+                ('account', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='session_generation', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('generation', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Session Generation',
+                'verbose_name_plural': 'Session Generations',
+            },
+        ),
+        migrations.AddField(
+            model_name='usersession',
+            name='generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
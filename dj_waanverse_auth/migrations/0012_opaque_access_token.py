@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0011_session_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpaqueAccessToken',
+            fields=[
+                ('token_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('claims', models.JSONField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Opaque Access Token',
+                'verbose_name_plural': 'Opaque Access Tokens',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dj_waanverse_auth', '0012_opaque_access_token'),
+    ]
+
+    operations = [
+        # Passkeys that already exist were registered without requiring a
+        # resident key, so they are marked as possibly not discoverable.
+        migrations.AddField(
+            model_name='passkey',
+            name='discoverable',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='passkey',
+            name='discoverable',
+            field=models.BooleanField(default=True),
+        ),
+    ]
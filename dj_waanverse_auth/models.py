@@ -1,29 +1,73 @@
+import hashlib
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
 from django.utils.translation import gettext_lazy as _
 
+from dj_waanverse_auth.config.settings import auth_config
 
 Account = get_user_model()
 
 
 class AccessCode(models.Model):
+    """
+    A one-time login code. Only a keyed hash of the code is stored, and there
+    is at most one live code per email address.
+    """
+
+    CODE_HASH_SALT = "dj_waanverse_auth.models.AccessCode"
+
     email_address = models.EmailField(
-        db_index=True,
+        unique=True,
         verbose_name=_("Email Address"),
     )
-    code = models.CharField(
-        max_length=255, unique=True, verbose_name=_("Verification Code")
+    code_hash = models.CharField(max_length=64, verbose_name=_("Code Hash"))
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name=_("Failed Attempts")
     )
-    expires_at = models.DateTimeField(verbose_name=_("Expires At"))
+    expires_at = models.DateTimeField(db_index=True, verbose_name=_("Expires At"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
 
+    @classmethod
+    def hash_code(cls, code) -> str:
+        """Return the keyed (SECRET_KEY based) hash stored for a code."""
+        return salted_hmac(cls.CODE_HASH_SALT, str(code), algorithm="sha256").hexdigest()
+
     def is_expired(self):
         """Check if the verification code has expired."""
         return timezone.now() > self.expires_at
 
+    def is_locked(self):
+        """Check if the code has been locked after too many failed attempts."""
+        return self.attempts >= auth_config.access_code_max_attempts
+
+    def check_code(self, code) -> bool:
+        """Compare a submitted code against the stored hash in constant time."""
+        return constant_time_compare(self.code_hash, self.hash_code(code))
+
+    def register_failed_attempt(self) -> bool:
+        """
+        Atomically count a failed attempt, unless the code is already locked.
+
+        The increment is conditional on the stored counter rather than on this
+        instance's possibly stale copy, so concurrent guesses cannot push it
+        past the limit. Returns False once the code is locked.
+        """
+        max_attempts = auth_config.access_code_max_attempts
+        updated = AccessCode.objects.filter(
+            pk=self.pk, attempts__lt=max_attempts
+        ).update(attempts=F("attempts") + 1)
+        if not updated:
+            self.attempts = max_attempts
+            return False
+        self.attempts = min(self.attempts + 1, max_attempts)
+        return not self.is_locked()
+
     def __str__(self):
-        return f"Code: {self.code}"
+        return f"Code for: {self.email_address}"
 
     class Meta:
         verbose_name = _("Verification Code")
@@ -47,6 +91,8 @@ class UserSession(models.Model):
 
     # Status
     is_active = models.BooleanField(default=True)
+    # Account session generation the session was issued under, see SessionGeneration
+    generation = models.PositiveIntegerField(default=0)
 
     class Meta:
         indexes = [
@@ -59,13 +105,103 @@ class UserSession(models.Model):
         return f"Session: {self.id}, Account: {self.account}"
 
 
+class SessionGeneration(models.Model):
+    """
+    Per-account session generation counter.
+
+    Tokens carry the generation current when they were issued; incrementing
+    the counter revokes every older token of the account at once.
+    """
+
+    account = models.OneToOneField(
+        Account,
+        primary_key=True,
+        related_name="session_generation",
+        on_delete=models.CASCADE,
+    )
+    generation = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Session Generation"
+        verbose_name_plural = "Session Generations"
+
+    def __str__(self):
+        return f"Session generation {self.generation} for {self.account}"
+
+
+class OpaqueAccessToken(models.Model):
+    """
+    Claims of an opaque (reference) access token, the durable copy of the
+    ``OPAQUE_TOKEN_CACHE`` entry. Only a SHA-256 digest of the token is stored.
+    """
+
+    token_hash = models.CharField(max_length=64, primary_key=True)
+    claims = models.JSONField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Opaque Access Token"
+        verbose_name_plural = "Opaque Access Tokens"
+
+    def __str__(self):
+        return f"Opaque access token {self.token_hash[:12]}"
+
+
 class Passkey(models.Model):
     user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="passkeys")
-    credential_id = models.BinaryField(unique=True)
+    credential_id = models.BinaryField()
+    # Fixed-width SHA-256 digest of credential_id, used for all lookups since
+    # variable-length binary columns cannot be indexed efficiently everywhere.
+    credential_id_hash = models.CharField(max_length=64, unique=True, editable=False)
     public_key = models.BinaryField()
     sign_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
     name = models.CharField(max_length=255, default="My Passkey")
+    # False for passkeys registered before resident keys were required; those
+    # may not be discoverable and still need an email-hinted allow-list, until
+    # a login with a user handle proves them resident.
+    discoverable = models.BooleanField(default=True)
+
+    @staticmethod
+    def hash_credential_id(credential_id) -> str:
+        """Return the lookup digest for a raw credential id."""
+        return hashlib.sha256(bytes(credential_id)).hexdigest()
+
+    def record_use(self, new_sign_count: int) -> bool:
+        """
+        Store the new signature counter and last-use time after a successful
+        assertion, with at most one UPDATE.
+
+        The counter update is conditional (``WHERE sign_count < new``) and
+        returns False if the stored counter is already at or above the new
+        value, i.e. the assertion is a replay or came from a cloned key.
+        Authenticators that do not implement counters always report 0; for
+        those ``last_used_at`` is only written once it is older than
+        PASSKEY_LAST_USED_UPDATE_INTERVAL, coalescing frequent logins.
+        """
+        now = timezone.now()
+
+        if new_sign_count == 0 and self.sign_count == 0:
+            interval = auth_config.passkey_last_used_update_interval
+            if self.last_used_at and now - self.last_used_at < interval:
+                return True
+            Passkey.objects.filter(pk=self.pk).update(last_used_at=now)
+            self.last_used_at = now
+            return True
+
+        updated = Passkey.objects.filter(
+            pk=self.pk, sign_count__lt=new_sign_count
+        ).update(sign_count=new_sign_count, last_used_at=now)
+        if updated:
+            self.sign_count = new_sign_count
+            self.last_used_at = now
+        return bool(updated)
+
+    def save(self, *args, **kwargs):
+        if self.credential_id is not None:
+            self.credential_id_hash = self.hash_credential_id(self.credential_id)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Passkey for {self.user.username}"
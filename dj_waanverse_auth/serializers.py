@@ -15,3 +15,27 @@ class SessionSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserSession
         fields = "__all__"
+
+
+class SessionListSerializer(serializers.Serializer):
+    """
+    Slim session representation built from ``.values()`` rows.
+    """
+
+    id = serializers.IntegerField()
+    user_agent = serializers.CharField(allow_null=True)
+    ip_address = serializers.IPAddressField(allow_null=True)
+    created_at = serializers.DateTimeField()
+    last_used = serializers.DateTimeField()
+    is_current = serializers.BooleanField()
+
+
+class PasskeySerializer(serializers.Serializer):
+    """
+    Passkey listing/rename representation; never exposes the credential blobs.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(max_length=255)
+    created_at = serializers.DateTimeField(read_only=True)
+    last_used_at = serializers.DateTimeField(read_only=True, allow_null=True)
@@ -0,0 +1,126 @@
+import logging
+import secrets
+import threading
+import time
+from typing import Optional
+
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from dj_waanverse_auth.config.settings import auth_config
+
+logger = logging.getLogger(__name__)
+
+
+class BaseChallengeStore:
+    """
+    Server-side storage for WebAuthn challenges.
+
+    ``issue`` stores the challenge bytes under a short opaque id that is handed
+    to the client; ``consume`` atomically fetches and removes it, so every
+    challenge can be used at most once. Challenges are bound to a purpose
+    (``"register"`` or ``"login"``) and optionally to a user.
+    """
+
+    key_prefix = "waanverse_webauthn_challenge"
+
+    def __init__(self, timeout: Optional[int] = None):
+        self.timeout = timeout or auth_config.webauthn_challenge_timeout
+
+    def issue(self, challenge: bytes, purpose: str, user_id=None) -> str:
+        """Store a challenge and return its opaque id."""
+        challenge_id = secrets.token_urlsafe(16)
+        self._set(self._make_key(challenge_id), (purpose, user_id, challenge))
+        return challenge_id
+
+    def consume(self, challenge_id: str, purpose: str, user_id=None) -> Optional[bytes]:
+        """
+        Remove a challenge and return its bytes.
+
+        Returns None if the id is unknown, expired, already consumed, or was
+        issued for a different purpose or user.
+        """
+        if not isinstance(challenge_id, str) or not challenge_id:
+            return None
+
+        value = self._pop(self._make_key(challenge_id))
+        if value is None:
+            return None
+
+        stored_purpose, stored_user_id, challenge = value
+        if stored_purpose != purpose or stored_user_id != user_id:
+            logger.warning("WebAuthn challenge used for the wrong purpose or user")
+            return None
+        return challenge
+
+    def _make_key(self, challenge_id: str) -> str:
+        return f"{self.key_prefix}:{challenge_id}"
+
+    def _set(self, key: str, value) -> None:
+        raise NotImplementedError
+
+    def _pop(self, key: str):
+        raise NotImplementedError
+
+
+class CacheChallengeStore(BaseChallengeStore):
+    """
+    Challenge store backed by the Django cache (``WEBAUTHN_CHALLENGE_CACHE``).
+
+    Consumption relies on ``cache.delete`` reporting whether the key existed,
+    so only one of several concurrent completions can win a challenge.
+    """
+
+    def __init__(self, timeout: Optional[int] = None, cache_alias: Optional[str] = None):
+        super().__init__(timeout=timeout)
+        self.cache_alias = cache_alias or auth_config.webauthn_challenge_cache
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _set(self, key: str, value) -> None:
+        self.cache.set(key, value, timeout=self.timeout)
+
+    def _pop(self, key: str):
+        value = self.cache.get(key)
+        if value is None or not self.cache.delete(key):
+            return None
+        return value
+
+
+class InMemoryChallengeStore(BaseChallengeStore):
+    """Process-local challenge store, intended for tests and single-process setups."""
+
+    def __init__(self, timeout: Optional[int] = None):
+        super().__init__(timeout=timeout)
+        self._challenges = {}
+        self._lock = threading.Lock()
+
+    def _set(self, key: str, value) -> None:
+        expires_at = time.monotonic() + self.timeout
+        with self._lock:
+            now = time.monotonic()
+            self._challenges = {
+                k: v for k, v in self._challenges.items() if v[0] > now
+            }
+            self._challenges[key] = (expires_at, value)
+
+    def _pop(self, key: str):
+        with self._lock:
+            entry = self._challenges.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+
+_challenge_store = None
+
+
+def get_challenge_store() -> BaseChallengeStore:
+    """Return the configured challenge store, instantiated once per process."""
+    global _challenge_store
+    if _challenge_store is None:
+        store_class = import_string(auth_config.webauthn_challenge_store)
+        _challenge_store = store_class()
+    return _challenge_store
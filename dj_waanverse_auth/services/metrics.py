@@ -0,0 +1,247 @@
+import bisect
+import threading
+import time
+from functools import wraps
+from typing import Dict, Tuple
+
+from django.utils.module_loading import import_string
+
+from dj_waanverse_auth.config.settings import auth_config
+
+# Labels are tuples of ``(name, value)`` pairs so they can be used as dict keys
+# as they are; hot paths pass module level constants.
+Labels = Tuple[Tuple[str, str], ...]
+
+# Latency buckets in seconds, from 50us up to 1s.
+DEFAULT_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+VIEW_REQUESTS_TOTAL = "waanverse_auth_view_requests_total"
+VIEW_DURATION_SECONDS = "waanverse_auth_view_duration_seconds"
+
+
+class _Timer:
+    __slots__ = ("sink", "name", "labels", "start")
+
+    def __init__(self, sink, name, labels):
+        self.sink = sink
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.sink.observe(self.name, time.perf_counter() - self.start, self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class BaseMetricsSink:
+    """
+    Destination for the counters and latency observations of the auth hot paths.
+
+    ``increment`` adds to a counter, ``observe`` records a value (in seconds for
+    timings) in a histogram and ``time`` returns a context manager observing the
+    duration of its block.
+    """
+
+    enabled = True
+
+    def increment(self, name: str, value: float = 1, labels: Labels = ()) -> None:
+        raise NotImplementedError
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        raise NotImplementedError
+
+    def time(self, name: str, labels: Labels = ()):
+        return _Timer(self, name, labels)
+
+
+class NullMetricsSink(BaseMetricsSink):
+    """Default sink: discards everything, timers do not even read the clock."""
+
+    enabled = False
+
+    def increment(self, name, value=1, labels=()):
+        pass
+
+    def observe(self, name, value, labels=()):
+        pass
+
+    def time(self, name, labels=()):
+        return _NULL_TIMER
+
+
+class InMemoryMetricsSink(BaseMetricsSink):
+    """
+    Process-local counters and fixed-bucket histograms, exportable in the
+    Prometheus text format. Each worker process keeps its own values.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self._histograms: Dict[Tuple[str, Labels], list] = {}
+
+    def increment(self, name, value=1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 2)
+            histogram[index] += 1
+            histogram[-1] += value
+
+    def snapshot(self) -> dict:
+        """Return a copy of the counters and histograms."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    key: list(values) for key, values in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Render the collected metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        counters = sorted(snapshot["counters"].items())
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (metric, labels), value in counters:
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        histograms = sorted(snapshot["histograms"].items())
+        for name in sorted({name for (name, _), _ in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), values in histograms:
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets, values):
+                    cumulative += count
+                    le = (("le", _format_value(bound)),)
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels + le)} {cumulative}"
+                    )
+                count = cumulative + values[len(self.buckets)]
+                inf = (("le", "+Inf"),)
+                lines.append(f"{name}_bucket{_format_labels(labels + inf)} {count}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_value(values[-1])}"
+                )
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"'),
+        )
+        for key, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_metrics_sink = None
+
+
+def get_metrics_sink() -> BaseMetricsSink:
+    """Return the configured metrics sink, instantiated once per process."""
+    global _metrics_sink
+    if _metrics_sink is None:
+        sink_class = import_string(auth_config.metrics_sink)
+        _metrics_sink = sink_class()
+    return _metrics_sink
+
+
+def instrument_view(view_name: str):
+    """
+    Count the responses of a view by status code and time it.
+
+    Apply outermost, above ``@api_view``, so throttling and authentication
+    failures are counted too.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            metrics = get_metrics_sink()
+            if not metrics.enabled:
+                return view(request, *args, **kwargs)
+
+            start = time.perf_counter()
+            status_code = "500"
+            try:
+                response = view(request, *args, **kwargs)
+                status_code = str(response.status_code)
+                return response
+            finally:
+                metrics.increment(
+                    VIEW_REQUESTS_TOTAL,
+                    labels=(("view", view_name), ("status", status_code)),
+                )
+                metrics.observe(
+                    VIEW_DURATION_SECONDS,
+                    time.perf_counter() - start,
+                    labels=(("view", view_name),),
+                )
+
+        return wrapped
+
+    return decorator
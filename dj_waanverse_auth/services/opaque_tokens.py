@@ -0,0 +1,119 @@
+"""
+Opaque (reference) access tokens.
+
+With ``ACCESS_TOKEN_FORMAT = "opaque"`` access tokens are a prefix and 32
+random bytes instead of RS256 JWTs: about 47 bytes on the wire and no
+signature to verify. Their claims live in ``OPAQUE_TOKEN_CACHE`` with a
+durable copy in ``OpaqueAccessToken``; resolving a token tries the process
+local verified-token LRU, then the shared cache, then the database.
+Refresh tokens remain JWTs.
+"""
+
+import hashlib
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from django.core.cache import caches
+from rest_framework import exceptions
+
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.models import OpaqueAccessToken
+from dj_waanverse_auth.services.tracing import get_tracer
+from dj_waanverse_auth.utils.logging_utils import EventLogger
+from dj_waanverse_auth.utils.token_utils import decode_token, verified_token_cache
+
+log = EventLogger(__name__)
+
+OPAQUE_TOKEN_PREFIX = "wat_"
+OPAQUE_TOKEN_CACHE_PREFIX = "waanverse_auth:opaque:"
+
+
+def is_opaque_token(token: str) -> bool:
+    """JWTs start with their base64url encoded header, never with the prefix."""
+    return token.startswith(OPAQUE_TOKEN_PREFIX)
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cache():
+    return caches[auth_config.opaque_token_cache]
+
+
+def issue_opaque_token(claims: Dict[str, Any]) -> str:
+    """
+    Store the claims of an access token and return its opaque reference.
+
+    ``claims`` must hold integer ``exp`` and ``iat`` timestamps.
+    """
+    token = f"{OPAQUE_TOKEN_PREFIX}{secrets.token_urlsafe(32)}"
+    token_hash = _hash_token(token)
+    with get_tracer().span("auth.token.issue_opaque"):
+        OpaqueAccessToken.objects.create(
+            token_hash=token_hash,
+            claims=claims,
+            expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+        )
+        _cache().set(
+            f"{OPAQUE_TOKEN_CACHE_PREFIX}{token_hash}",
+            claims,
+            timeout=max(1, claims["exp"] - int(time.time())),
+        )
+    verified_token_cache.set(token, claims)
+    return token
+
+
+def resolve_opaque_token(token: str) -> Dict[str, Any]:
+    """
+    Return the claims of an opaque access token.
+
+    Raises:
+        exceptions.AuthenticationFailed: With the messages of
+            ``decode_token`` for unknown and expired tokens.
+    """
+    now = time.time()
+    with get_tracer().span("auth.token.resolve_opaque") as span:
+        claims = verified_token_cache.get(token, now)
+        source = "local"
+        if claims is None:
+            token_hash = _hash_token(token)
+            cache_key = f"{OPAQUE_TOKEN_CACHE_PREFIX}{token_hash}"
+            claims = _cache().get(cache_key)
+            source = "cache"
+            if claims is None:
+                claims = (
+                    OpaqueAccessToken.objects.filter(token_hash=token_hash)
+                    .values_list("claims", flat=True)
+                    .first()
+                )
+                source = "database"
+                if claims is not None and claims["exp"] > now:
+                    _cache().set(cache_key, claims, timeout=int(claims["exp"] - now))
+        span.set_attribute("token.source", source)
+
+    if claims is None:
+        log.warning("token_invalid", reason="unknown_reference")
+        raise exceptions.AuthenticationFailed("Invalid token structure")
+    if claims["exp"] <= now:
+        log.info("token_expired")
+        raise exceptions.AuthenticationFailed("Token has expired")
+    if source != "local":
+        verified_token_cache.set(token, claims)
+    return claims
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Return the verified claims of an access token of either format."""
+    if is_opaque_token(token):
+        return resolve_opaque_token(token)
+    return decode_token(token)
+
+
+def delete_expired_opaque_tokens(now=None) -> int:
+    """Delete the database copies of expired opaque tokens."""
+    now = now or datetime.now(tz=timezone.utc)
+    deleted, _ = OpaqueAccessToken.objects.filter(expires_at__lt=now).delete()
+    return deleted
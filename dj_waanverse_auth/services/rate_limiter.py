@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    retry_after: float = 0.0
+
+
+ALLOWED = RateLimitResult(True)
+
+PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "second": 1,
+    "m": 60,
+    "min": 60,
+    "minute": 60,
+    "h": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "day": 86400,
+}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse a rate string such as ``"10/min"`` into ``(limit, period_seconds)``.
+    """
+    try:
+        limit, period = rate.split("/")
+        return int(limit), PERIODS[period.strip().lower()]
+    except (ValueError, KeyError, AttributeError):
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+
+
+class LocalBlocklist:
+    """
+    In-process record of keys that are currently over their limit.
+
+    Once a key is rejected, further requests from it are rejected locally until
+    its retry time passes, without touching the shared cache.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._blocked = {}
+        self._lock = threading.Lock()
+
+    def check(self, key: str, now: float) -> Optional[float]:
+        """Return the remaining block time for a key, or None if it is not blocked."""
+        blocked_until = self._blocked.get(key)
+        if blocked_until is None:
+            return None
+        if blocked_until <= now:
+            self._blocked.pop(key, None)
+            return None
+        return blocked_until - now
+
+    def block(self, key: str, until: float) -> None:
+        with self._lock:
+            if len(self._blocked) >= self.max_entries:
+                now = time.time()
+                self._blocked = {k: v for k, v in self._blocked.items() if v > now}
+                if len(self._blocked) >= self.max_entries:
+                    self._blocked.clear()
+            self._blocked[key] = until
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocked.clear()
+
+
+class BaseRateLimiter:
+    """
+    Base class for rate limiting algorithms backed by the Django cache.
+    """
+
+    key_prefix = "waanverse_rl"
+
+    def __init__(self, rate: str, cache_alias: str = "default", blocklist=None):
+        self.rate = rate
+        self.limit, self.period = parse_rate(rate)
+        self.cache_alias = cache_alias
+        self.blocklist = blocklist if blocklist is not None else LocalBlocklist()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def hit(self, key: str, now: Optional[float] = None) -> RateLimitResult:
+        """Record a request for ``key`` and report whether it is allowed."""
+        now = time.time() if now is None else now
+
+        remaining = self.blocklist.check(key, now)
+        if remaining is not None:
+            return RateLimitResult(False, remaining)
+
+        result = self._hit(key, now)
+        if not result.allowed:
+            self.blocklist.block(key, now + result.retry_after)
+        return result
+
+    def _hit(self, key: str, now: float) -> RateLimitResult:
+        raise NotImplementedError
+
+    def _make_key(self, *parts) -> str:
+        return ":".join((self.key_prefix, *(str(part) for part in parts)))
+
+
+class SlidingWindowLimiter(BaseRateLimiter):
+    """
+    Sliding window counter.
+
+    Keeps one counter per fixed window and weights the previous window by how
+    much of it still overlaps the sliding window. Counters are updated with the
+    cache's atomic ``incr``.
+    """
+
+    def _hit(self, key: str, now: float) -> RateLimitResult:
+        window = int(now // self.period)
+        current_key = self._make_key("sw", key, window)
+        previous_key = self._make_key("sw", key, window - 1)
+
+        cache = self.cache
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            if cache.add(current_key, 1, timeout=self.period * 2):
+                current = 1
+            else:
+                current = cache.incr(current_key)
+        previous = cache.get(previous_key, 0)
+
+        elapsed = (now % self.period) / self.period
+        weighted = previous * (1 - elapsed) + current
+        if weighted <= self.limit:
+            return ALLOWED
+
+        if current > self.limit or not previous:
+            retry_after = self.period - (now % self.period)
+        else:
+            # Wait until the previous window's weight drops enough.
+            required = 1 - (self.limit - current) / previous
+            retry_after = max(0.0, (required - elapsed) * self.period)
+        return RateLimitResult(False, retry_after)
+
+
+class TokenBucketLimiter(BaseRateLimiter):
+    """
+    Token bucket allowing bursts of up to ``limit`` requests, refilled at
+    ``limit / period`` tokens per second.
+
+    The bucket state carries a version, and a request may only replace the
+    state it read after claiming that version with the cache's atomic ``add``.
+    Concurrent requests that lose the claim re-read the bucket, so a burst
+    cannot spend the same token twice.
+    """
+
+    max_attempts = 5
+
+    def _hit(self, key: str, now: float) -> RateLimitResult:
+        state_key = self._make_key("tb", key)
+        refill_rate = self.limit / self.period
+
+        cache = self.cache
+        for _ in range(self.max_attempts):
+            state = cache.get(state_key)
+            if state is None:
+                state = (uuid4().hex, float(self.limit), now)
+                if not cache.add(state_key, state, timeout=self.period):
+                    continue
+
+            version, tokens, updated_at = state
+            tokens = min(float(self.limit), tokens + (now - updated_at) * refill_rate)
+            if tokens < 1:
+                return RateLimitResult(False, (1 - tokens) / refill_rate)
+
+            claim_key = self._make_key("tb", key, version)
+            if cache.add(claim_key, 1, timeout=self.period):
+                cache.set(
+                    state_key, (uuid4().hex, tokens - 1, now), timeout=self.period
+                )
+                return ALLOWED
+
+        # Every attempt lost to a concurrent request for the same key.
+        return RateLimitResult(False, 1 / refill_rate)
+
+
+ALGORITHMS = {
+    "sliding_window": SlidingWindowLimiter,
+    "token_bucket": TokenBucketLimiter,
+}
+
+
+def get_limiter(algorithm: str, rate: str, cache_alias: str = "default"):
+    """Instantiate the rate limiter for an algorithm name."""
+    try:
+        limiter_class = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown rate limiting algorithm: {algorithm!r}")
+    return limiter_class(rate, cache_alias=cache_alias)
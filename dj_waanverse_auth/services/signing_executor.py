@@ -0,0 +1,174 @@
+"""
+Optional offloading of RS256 signing to a bounded worker pool.
+
+RSA signing is the most expensive step of issuing a token pair. During login
+bursts a ``"process"`` pool spreads it over the CPUs instead of holding the
+GIL of the request threads; a ``"thread"`` pool caps how many requests sign
+at once. Each worker loads the private key once, only the signing input and
+the signature cross the pool boundary.
+
+The pool never makes signing fail: when ``SIGNING_EXECUTOR_MAX_PENDING``
+signatures are already queued, when a signature takes longer than
+``SIGNING_EXECUTOR_TIMEOUT`` or when the pool is broken, the caller signs
+inline.
+"""
+
+import os
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from django.core.exceptions import ImproperlyConfigured
+
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.services.metrics import get_metrics_sink
+from dj_waanverse_auth.utils.logging_utils import EventLogger
+
+log = EventLogger(__name__)
+
+SIGNING_OFFLOADED_TOTAL = "waanverse_auth_signing_offloaded_total"
+SIGNING_FALLBACK_TOTAL = "waanverse_auth_signing_fallback_total"
+
+INLINE = "inline"
+POOL_CLASSES = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+# Private key of the current worker, loaded by the pool initializer.
+_worker_key = None
+
+
+def _load_worker_key(private_key_path: str) -> None:
+    global _worker_key
+    with open(private_key_path, "rb") as key_file:
+        _worker_key = serialization.load_pem_private_key(
+            key_file.read(), password=None
+        )
+
+
+def _sign_in_worker(signing_input: bytes) -> bytes:
+    return _worker_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+
+
+class SigningExecutor:
+    """
+    Bounded thread or process pool producing RS256 signatures.
+
+    ``sign`` returns None whenever the caller should sign inline instead.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        private_key_path: str,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: float = 2.0,
+    ):
+        if kind not in POOL_CLASSES:
+            raise ImproperlyConfigured(
+                f"SIGNING_EXECUTOR must be one of {INLINE!r}, "
+                f"{', '.join(map(repr, POOL_CLASSES))}; got {kind!r}"
+            )
+        self.kind = kind
+        self.private_key_path = private_key_path
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers * 2 if max_pending is None else max_pending
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._slots = None
+
+    def _get_pool(self):
+        # A forked server worker must not reuse the pool of its parent.
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    self._pool = POOL_CLASSES[self.kind](
+                        max_workers=self.workers,
+                        initializer=_load_worker_key,
+                        initargs=(self.private_key_path,),
+                    )
+                    self._slots = threading.BoundedSemaphore(self.max_pending)
+                    self._pid = pid
+        return self._pool
+
+    def _discard_pool(self, pool) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fallback(self, reason: str, **fields) -> None:
+        get_metrics_sink().increment(
+            SIGNING_FALLBACK_TOTAL, labels=(("reason", reason),)
+        )
+        log.warning("signing_fallback", reason=reason, executor=self.kind, **fields)
+
+    def sign(self, signing_input: bytes) -> Optional[bytes]:
+        pool = self._get_pool()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            self._fallback("saturated")
+            return None
+
+        try:
+            future = pool.submit(_sign_in_worker, signing_input)
+        except (BrokenExecutor, RuntimeError) as e:
+            slots.release()
+            self._discard_pool(pool)
+            self._fallback("unavailable", error=e)
+            return None
+        # The slot stays taken until the worker is done, even after a timeout.
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            signature = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self._fallback("timeout")
+            return None
+        except BrokenExecutor as e:
+            self._discard_pool(pool)
+            self._fallback("unavailable", error=e)
+            return None
+        except Exception as e:
+            self._fallback("error", error=e)
+            return None
+
+        get_metrics_sink().increment(SIGNING_OFFLOADED_TOTAL)
+        return signature
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_signing_executor = None
+
+
+def get_signing_executor() -> Optional[SigningExecutor]:
+    """
+    Return the configured signing executor, created once per process, or
+    None when tokens are signed inline.
+    """
+    global _signing_executor
+    if auth_config.signing_executor == INLINE:
+        return None
+    if _signing_executor is None:
+        _signing_executor = SigningExecutor(
+            auth_config.signing_executor,
+            private_key_path=auth_config.private_key_path,
+            workers=auth_config.signing_executor_workers,
+            max_pending=auth_config.signing_executor_max_pending,
+            timeout=auth_config.signing_executor_timeout,
+        )
+    return _signing_executor
@@ -1,17 +1,22 @@
-import logging
-
 from django.utils.timezone import now
 
 from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.services.opaque_tokens import issue_opaque_token
+from dj_waanverse_auth.utils.logging_utils import EventLogger
+from dj_waanverse_auth.utils.session_utils import get_session_generation
 from dj_waanverse_auth.utils.token_utils import decode_token, encode_token
 
-logger = logging.getLogger(__name__)
+log = EventLogger(__name__)
 
 
 class TokenError(Exception):
     pass
 
 
+def _lifetime(max_age) -> int:
+    return int(max_age.total_seconds())
+
+
 class RefreshToken:
     REQUIRED_CLAIMS = {
         "id",
@@ -24,13 +29,16 @@ class RefreshToken:
     def __init__(self, token=None):
         self.token = token
         self._payload = None
+        # Set when minted locally, so the access token shares the timestamp
+        self._issued_at = None
+        self._access_token = None
 
         if token:
             try:
                 self._payload = decode_token(token)
                 self._validate_claims()
             except Exception as e:
-                logger.error(f"Token initialization failed: {str(e)}")
+                log.warning("refresh_token_invalid", error=e)
                 raise TokenError(f"Invalid token: {str(e)}")
 
     def _validate_claims(self):
@@ -40,22 +48,35 @@ class RefreshToken:
             raise TokenError(f"Missing required claims: {missing}")
 
     @classmethod
-    def for_user(cls, user, session_id: str):
-        """Generate a refresh token for a user with error handling"""
+    def for_user(cls, user, session_id: str, generation: int = None):
+        """
+        Generate a refresh token for a user with error handling.
+
+        The token carries the account's session generation (``gen``), looked
+        up from the cache unless given. The clock is read once: the access
+        token minted from the result reuses the same ``iat``, and the claims
+        are kept as built instead of decoding the fresh token again.
+        """
         try:
-            expiration = now() + auth_config.refresh_token_cookie_max_age
+            if generation is None:
+                generation = get_session_generation(user.id)
+            issued_at = int(now().timestamp())
             payload = {
                 "id": user.id,
-                "exp": expiration,
-                "iat": now(),
+                "exp": issued_at + _lifetime(auth_config.refresh_token_cookie_max_age),
+                "iat": issued_at,
                 "iss": auth_config.platform_name,
                 "token_type": "refresh",
                 "sid": session_id,
+                "gen": generation,
             }
-            token = encode_token(payload=payload)
-            return cls(token)
+            instance = cls()
+            instance.token = encode_token(payload=payload)
+            instance._payload = payload
+            instance._issued_at = issued_at
+            return instance
         except Exception as e:
-            logger.error(f"Failed to create refresh token: {str(e)}")
+            log.error("refresh_token_create_error", user_id=user.id, error=e)
             raise TokenError("Could not generate refresh token")
 
     def payload(self):
@@ -64,26 +85,42 @@ class RefreshToken:
 
     @property
     def access_token(self):
-        """Generate an access token with caching and validation"""
+        """
+        Generate an access token with caching and validation, a JWT or an
+        opaque reference depending on ``ACCESS_TOKEN_FORMAT``.
+        """
         if not self._payload:
-            logger.error(
-                "Attempted to generate access token from invalid refresh token"
-            )
+            log.error("access_token_from_invalid_refresh_token")
             raise TokenError("Refresh token is not valid")
 
+        if self._access_token is not None:
+            return self._access_token
+
         try:
-            expiration = now() + auth_config.access_token_cookie_max_age
+            issued_at = self._issued_at
+            if issued_at is None:
+                issued_at = int(now().timestamp())
             access_payload = {
                 "id": self._payload["id"],
-                "exp": expiration,
-                "iat": now(),
+                "exp": issued_at + _lifetime(auth_config.access_token_cookie_max_age),
+                "iat": issued_at,
                 "iss": auth_config.platform_name,
                 "token_type": "access",
                 "sid": self._payload["sid"],
+                "gen": self._payload.get("gen", 0),
             }
-            return encode_token(payload=access_payload)
+            if auth_config.access_token_format == "opaque":
+                self._access_token = issue_opaque_token(access_payload)
+            else:
+                self._access_token = encode_token(payload=access_payload)
+            return self._access_token
         except Exception as e:
-            logger.error(f"Failed to generate access token: {str(e)}")
+            log.error(
+                "access_token_create_error",
+                user_id=self._payload.get("id"),
+                sid=self._payload.get("sid"),
+                error=e,
+            )
             raise TokenError("Could not generate access token")
 
     @classmethod
@@ -93,10 +130,10 @@ class RefreshToken:
             instance = cls(token)
             return bool(instance.payload)
         except TokenError as e:
-            logger.info(f"Token verification failed: {str(e)}")
+            log.info("refresh_token_verify_failed", error=e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error in token verification: {str(e)}")
+            log.error("refresh_token_verify_error", error=e)
             return False
 
     def __str__(self):
@@ -3,7 +3,8 @@ import logging
 from rest_framework.response import Response
 
 from dj_waanverse_auth import settings
-from dj_waanverse_auth.utils.session_utils import create_session
+from dj_waanverse_auth.services.tracing import get_tracer
+from dj_waanverse_auth.utils.session_utils import create_session, is_token_revoked
 
 from .token_classes import RefreshToken, TokenError
 
@@ -27,6 +28,8 @@ class CookieSettings:
         )
         self.DOMAIN = settings.cookie_domain
         self.PATH = settings.cookie_path
+        self.REFRESH_DOMAIN = settings.refresh_cookie_domain
+        self.REFRESH_PATH = settings.refresh_cookie_path
 
     def get_cookie_params(self):
         """Returns common cookie parameters as a dictionary."""
@@ -38,13 +41,22 @@ class CookieSettings:
             "path": self.PATH,
         }
 
+    def get_refresh_cookie_params(self):
+        """Returns the refresh cookie parameters, with its own domain and path."""
+        return {
+            **self.get_cookie_params(),
+            "domain": self.REFRESH_DOMAIN,
+            "path": self.REFRESH_PATH,
+        }
+
 
 class TokenService:
     """Service for handling JWT token operations with enhanced security and functionality."""
 
-    def __init__(self, request, user=None, refresh_token=None):
+    def __init__(self, request, user=None, refresh_token=None, session_id=None):
         self.user = user
         self.refresh_token = refresh_token
+        self.session_id = session_id
         self.cookie_settings = CookieSettings()
         self._tokens = None
         self.request = request
@@ -63,27 +75,31 @@ class TokenService:
         """
         Generates tokens based on the context:
         - If refresh_token is provided, only generates new access token
-        - If user is provided, generates both new access and refresh tokens
+        - If user is provided, generates both new access and refresh tokens,
+          for a new session unless session_id is provided
         """
         if not self.user and not self.refresh_token:
             raise ValueError("Either user or refresh_token must be provided")
 
+        mode = "refresh" if self.refresh_token else "login"
         try:
-            if self.refresh_token:
-                refresh = RefreshToken(self.refresh_token)
-                return {
-                    "refresh_token": self.refresh_token,
-                    "access_token": str(refresh.access_token),
-                }
-            else:
-
-                session_id = create_session(user=self.user, request=self.request)
-                refresh = RefreshToken.for_user(self.user, session_id=session_id)
-                return {
-                    "refresh_token": str(refresh),
-                    "access_token": str(refresh.access_token),
-                    "sid": session_id,
-                }
+            with get_tracer().span("auth.tokens.generate", mode=mode):
+                if self.refresh_token:
+                    refresh = RefreshToken(self.refresh_token)
+                    return {
+                        "refresh_token": self.refresh_token,
+                        "access_token": str(refresh.access_token),
+                    }
+                else:
+                    session_id = self.session_id or create_session(
+                        user=self.user, request=self.request
+                    )
+                    refresh = RefreshToken.for_user(self.user, session_id=session_id)
+                    return {
+                        "refresh_token": str(refresh),
+                        "access_token": str(refresh.access_token),
+                        "sid": session_id,
+                    }
         except TokenError as e:
             raise TokenError(f"Failed to generate tokens: {str(e)}")
 
@@ -110,7 +126,7 @@ class TokenService:
                     self.cookie_settings.REFRESH_COOKIE_NAME,
                     tokens["refresh_token"],
                     max_age=self.cookie_settings.REFRESH_COOKIE_MAX_AGE,
-                    **cookie_params,
+                    **self.cookie_settings.get_refresh_cookie_params(),
                 )
 
             return {"response": response, "tokens": tokens}
@@ -119,19 +135,17 @@ class TokenService:
             raise
 
     def clear_all_cookies(self, response: Response) -> Response:
-        """Removes all authentication-related cookies."""
-        cookie_params = {
-            "domain": self.cookie_settings.DOMAIN,
-            "path": self.cookie_settings.PATH,
-        }
-
-        cookies_to_remove = [
+        """Removes all authentication-related cookies, each from its own scope."""
+        response.delete_cookie(
             self.cookie_settings.REFRESH_COOKIE_NAME,
+            domain=self.cookie_settings.REFRESH_DOMAIN,
+            path=self.cookie_settings.REFRESH_PATH,
+        )
+        response.delete_cookie(
             self.cookie_settings.ACCESS_COOKIE_NAME,
-        ]
-
-        for cookie_name in cookies_to_remove:
-            response.delete_cookie(cookie_name, **cookie_params)
+            domain=self.cookie_settings.DOMAIN,
+            path=self.cookie_settings.PATH,
+        )
 
         return response
 
@@ -146,9 +160,9 @@ class TokenService:
         return request.COOKIES.get(cookie_name)
 
     def verify_token(self, token):
-        """Verifies if a token is valid."""
+        """Verifies if a token is valid and its session generation not revoked."""
         try:
-            RefreshToken(token)
-            return True
+            refresh = RefreshToken(token)
         except TokenError:
             return False
+        return not is_token_revoked(refresh.payload())
@@ -0,0 +1,201 @@
+import contextvars
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from dj_waanverse_auth.config.settings import auth_config
+
+QUERY_COUNT_ATTRIBUTE = "db.query_count"
+
+
+class _QueryCounter:
+    """``execute_wrapper`` hook counting the queries run inside a span."""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class BaseTracer:
+    """
+    Optional tracing of the auth stages.
+
+    ``span(name, **attributes)`` returns a context manager wrapping a stage;
+    inside it ``set_attribute`` adds attributes such as ``cache.hit``. Every
+    span records the number of database queries run within it as
+    ``db.query_count``.
+    """
+
+    enabled = True
+
+    def span(self, name: str, **attributes):
+        return _SpanContext(self, name, attributes)
+
+    def start(self, name: str, attributes: Dict[str, Any]):
+        """Open a span and return an object with ``set_attribute``."""
+        raise NotImplementedError
+
+    def end(self, span, error: Optional[BaseException]) -> None:
+        raise NotImplementedError
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "attributes", "span", "counter", "wrapper")
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.span = self.tracer.start(self.name, self.attributes)
+        self.counter = _QueryCounter()
+        self.wrapper = connection.execute_wrapper(self.counter)
+        self.wrapper.__enter__()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wrapper.__exit__(exc_type, exc, tb)
+        self.span.set_attribute(QUERY_COUNT_ATTRIBUTE, self.counter.count)
+        self.tracer.end(self.span, exc)
+        return None
+
+
+class NullTracer(BaseTracer):
+    """Default tracer: spans are a shared no-op object."""
+
+    enabled = False
+
+    def span(self, name, **attributes):
+        return _NULL_SPAN
+
+
+@dataclass
+class RecordedSpan:
+    name: str
+    attributes: Dict[str, Any]
+    parent: Optional["RecordedSpan"] = None
+    start: float = 0.0
+    end: Optional[float] = None
+    error: Optional[BaseException] = None
+    _token: Any = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+_current_span = contextvars.ContextVar("waanverse_auth_span", default=None)
+
+
+class InMemoryTracer(BaseTracer):
+    """
+    Keeps finished spans in memory, with their parent, duration and error.
+    Meant for tests and local profiling.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: List[RecordedSpan] = []
+
+    def start(self, name, attributes):
+        span = RecordedSpan(
+            name=name,
+            attributes=dict(attributes),
+            parent=_current_span.get(),
+            start=time.perf_counter(),
+        )
+        span._token = _current_span.set(span)
+        return span
+
+    def end(self, span, error):
+        span.end = time.perf_counter()
+        span.error = error
+        _current_span.reset(span._token)
+        with self._lock:
+            self.spans.append(span)
+
+    def get_spans(self, name: str = None) -> List[RecordedSpan]:
+        with self._lock:
+            return [span for span in self.spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class _OpenTelemetrySpan:
+    __slots__ = ("span", "context_manager")
+
+    def __init__(self, span, context_manager):
+        self.span = span
+        self.context_manager = context_manager
+
+    def set_attribute(self, key, value):
+        self.span.set_attribute(key, value)
+
+
+class OpenTelemetryTracer(BaseTracer):
+    """Emits the spans through the OpenTelemetry API, if it is installed."""
+
+    def __init__(self):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImproperlyConfigured(
+                "OpenTelemetryTracer requires the opentelemetry-api package."
+            )
+        self._tracer = trace.get_tracer("dj_waanverse_auth")
+
+    def start(self, name, attributes):
+        context_manager = self._tracer.start_as_current_span(
+            name, attributes=attributes, record_exception=True
+        )
+        return _OpenTelemetrySpan(context_manager.__enter__(), context_manager)
+
+    def end(self, span, error):
+        if error is not None:
+            span.context_manager.__exit__(type(error), error, error.__traceback__)
+        else:
+            span.context_manager.__exit__(None, None, None)
+
+
+_tracer = None
+
+
+def get_tracer() -> BaseTracer:
+    """Return the configured tracer, instantiated once per process."""
+    global _tracer
+    if _tracer is None:
+        tracer_class = import_string(auth_config.tracer)
+        _tracer = tracer_class()
+    return _tracer
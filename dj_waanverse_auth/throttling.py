@@ -0,0 +1,119 @@
+import hashlib
+
+from rest_framework.throttling import BaseThrottle
+
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.services.rate_limiter import get_limiter
+from dj_waanverse_auth.utils.logging_utils import EventLogger
+from dj_waanverse_auth.utils.security_utils import get_client_ip
+
+log = EventLogger(__name__)
+
+_limiters = {}
+
+
+def _get_scope_limiter(scope: str, config: dict):
+    limiter = _limiters.get(scope)
+    if limiter is None or limiter.rate != config["rate"]:
+        limiter = get_limiter(
+            config.get("algorithm", "sliding_window"),
+            config["rate"],
+            cache_alias=auth_config.rate_limit_cache,
+        )
+        _limiters[scope] = limiter
+    return limiter
+
+
+def reset_rate_limits() -> None:
+    """Forget the in-process rate limiter state (used by tests)."""
+    _limiters.clear()
+
+
+def _hash(value: str) -> str:
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    Throttle for the authentication endpoints.
+
+    Limits are configured per scope in ``WAANVERSE_AUTH_CONFIG["RATE_LIMITS"]``:
+
+        "RATE_LIMITS": {
+            "login": {
+                "rate": "10/min",
+                "algorithm": "sliding_window",  # or "token_bucket"
+                "keys": ["ip", "email"],  # any of "ip", "email", "session"
+            },
+        }
+
+    Each configured key is limited independently; the request is rejected if
+    any of them is over its limit. DRF adds the ``Retry-After`` header.
+    """
+
+    scope = None
+
+    def __init__(self):
+        self._wait = None
+
+    def allow_request(self, request, view) -> bool:
+        if not auth_config.rate_limit_enabled:
+            return True
+
+        config = auth_config.rate_limits.get(self.scope)
+        if not config:
+            return True
+
+        limiter = _get_scope_limiter(self.scope, config)
+        for key_type in config.get("keys", ["ip"]):
+            identity = self.get_identity(request, key_type)
+            if not identity:
+                continue
+
+            result = limiter.hit(f"{self.scope}:{key_type}:{identity}")
+            if not result.allowed:
+                self._wait = result.retry_after
+                log.warning("rate_limited", scope=self.scope, key_type=key_type)
+                return False
+        return True
+
+    def get_identity(self, request, key_type: str):
+        """Return the value a request is limited by for a key type."""
+        if key_type == "ip":
+            return get_client_ip(request, auth_config.rate_limit_trusted_proxies)
+        if key_type == "email":
+            email = request.data.get("email_address")
+            if isinstance(email, str) and email:
+                return _hash(email.strip().lower())
+            return None
+        if key_type == "session":
+            token = request.COOKIES.get(
+                auth_config.refresh_token_cookie
+            ) or request.data.get("refresh_token")
+            if isinstance(token, str) and token:
+                return _hash(token)
+            return None
+        raise ValueError(f"Unknown rate limit key: {key_type!r}")
+
+    def wait(self):
+        return self._wait
+
+
+class LoginRateThrottle(AuthRateThrottle):
+    scope = "login"
+
+
+class SignupRateThrottle(AuthRateThrottle):
+    scope = "signup"
+
+
+class RefreshRateThrottle(AuthRateThrottle):
+    scope = "refresh"
+
+
+class PasskeyLoginBeginRateThrottle(AuthRateThrottle):
+    scope = "passkey_login_begin"
+
+
+class PasskeyLoginCompleteRateThrottle(AuthRateThrottle):
+    scope = "passkey_login_complete"
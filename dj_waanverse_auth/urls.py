@@ -4,12 +4,20 @@ from dj_waanverse_auth.views.authorization_views import (
     authenticated_user,
     refresh_access_token,
     logout_view,
+    get_user_sessions,
+    delete_user_session,
+    revoke_all_sessions_view,
+    revoke_other_sessions_view,
 )
+from dj_waanverse_auth.views.introspection_views import introspect_token_view
+from dj_waanverse_auth.views.metrics_views import metrics_view
 from dj_waanverse_auth.views.passkey_views import (
     register_begin,
     register_complete,
     login_begin,
     login_complete,
+    list_passkeys,
+    passkey_detail,
 )
 from dj_waanverse_auth.views.signup_views import signup_view
 
@@ -17,8 +25,29 @@ urlpatterns = [
     path("signup/", signup_view, name="dj_waanverse_auth_signup"),
     path("me/", authenticated_user, name="dj_waanverse_auth_me"),
     path("refresh/", refresh_access_token, name="dj_waanverse_auth_refresh_token"),
+    path(
+        "token/introspect/",
+        introspect_token_view,
+        name="dj_waanverse_auth_introspect_token",
+    ),
     path("logout/<int:session_id>/", logout_view, name="dj_waanverse_auth_logout"),
     path("login/", login_view, name="dj_waanverse_auth_login"),
+    path("sessions/", get_user_sessions, name="dj_waanverse_auth_sessions"),
+    path(
+        "sessions/<int:session_id>/",
+        delete_user_session,
+        name="dj_waanverse_auth_delete_session",
+    ),
+    path(
+        "sessions/revoke-all/",
+        revoke_all_sessions_view,
+        name="dj_waanverse_auth_revoke_all_sessions",
+    ),
+    path(
+        "sessions/revoke-others/",
+        revoke_other_sessions_view,
+        name="dj_waanverse_auth_revoke_other_sessions",
+    ),
     # Passkey
     path(
         "passkey/register/",
@@ -40,4 +69,11 @@ urlpatterns = [
         login_complete,
         name="dj_waanverse_auth_passkey_login_complete",
     ),
+    path("passkeys/", list_passkeys, name="dj_waanverse_auth_passkeys"),
+    path(
+        "passkeys/<int:passkey_id>/",
+        passkey_detail,
+        name="dj_waanverse_auth_passkey_detail",
+    ),
+    path("metrics/", metrics_view, name="dj_waanverse_auth_metrics"),
 ]
@@ -0,0 +1,112 @@
+import logging
+import threading
+from typing import Iterator, Optional
+
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from dj_waanverse_auth.models import AccessCode
+
+logger = logging.getLogger(__name__)
+
+
+def delete_expired_access_codes(
+    batch_size: int = 1000, now=None, dry_run: bool = False
+) -> Iterator[int]:
+    """
+    Delete expired access codes in bounded chunks.
+
+    Each chunk selects at most ``batch_size`` primary keys through the
+    ``expires_at`` index and deletes them in a single statement, so no chunk
+    holds locks on a large part of the table.
+
+    Args:
+        batch_size: Maximum number of rows deleted per statement.
+        now: Expiry cut-off, defaults to the current time.
+        dry_run: Count the expired codes chunk by chunk without deleting them.
+
+    Yields:
+        int: The number of rows deleted (or found, in a dry run) per chunk.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    now = now or timezone.now()
+    expired = AccessCode.objects.filter(expires_at__lt=now).order_by("expires_at", "pk")
+
+    last_row = None
+    while True:
+        chunk = expired
+        if last_row is not None:
+            # A dry run deletes nothing, so walk the rows by keyset instead.
+            last_expires_at, last_pk = last_row
+            chunk = chunk.filter(
+                Q(expires_at__gt=last_expires_at)
+                | Q(expires_at=last_expires_at, pk__gt=last_pk)
+            )
+
+        rows = list(chunk.values_list("expires_at", "pk")[:batch_size])
+        if not rows:
+            return
+
+        if dry_run:
+            last_row = rows[-1]
+            yield len(rows)
+        else:
+            # Codes re-issued since the select keep their row, with a new expiry.
+            deleted, _ = AccessCode.objects.filter(
+                pk__in=[pk for _, pk in rows], expires_at__lt=now
+            ).delete()
+            yield deleted
+
+        if len(rows) < batch_size:
+            return
+
+
+class AccessCodeSweeper:
+    """
+    Optional in-process periodic sweeper for expired access codes.
+
+    Enabled by setting ``ACCESS_CODE_SWEEP_INTERVAL`` (a ``timedelta``) in
+    ``WAANVERSE_AUTH_CONFIG``; the sweeper runs on a daemon thread started when
+    the app is ready. For multi-process deployments prefer scheduling the
+    ``manage_access_codes`` command instead.
+    """
+
+    def __init__(self, interval, batch_size: int = 1000):
+        self.interval = interval.total_seconds()
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="waanverse-access-code-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def sweep(self) -> int:
+        """Run one sweep and return the number of deleted codes."""
+        close_old_connections()
+        try:
+            return sum(delete_expired_access_codes(batch_size=self.batch_size))
+        finally:
+            close_old_connections()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                deleted = self.sweep()
+                if deleted:
+                    logger.info(f"Access code sweeper deleted {deleted} expired codes")
+            except Exception as e:
+                logger.error(f"Access code sweep failed: {str(e)}")
@@ -1,53 +1,190 @@
+import logging
 import secrets
+from datetime import timedelta
+from functools import lru_cache
+
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.db import IntegrityError, connections, router, transaction
+from django.template.loader import get_template
+from django.utils import timezone, translation
+from django.utils.translation import get_language, gettext
+
 from dj_waanverse_auth import settings as app_settings
 from dj_waanverse_auth.models import AccessCode
-from django.utils import timezone
-from datetime import timedelta
-from django.db import transaction
+from dj_waanverse_auth.services.tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Each email is rendered from a pair of templates: the HTML body and a
+# dedicated plain-text alternative, so no HTML has to be stripped at send time.
+EMAIL_TEMPLATES = {
+    "access_code": ("emails/access_code.html", "emails/access_code.txt"),
+}
+
+_compiled_templates = {}
+
+ACCESS_CODE_LIFETIME = timedelta(minutes=5)
+ACCESS_CODE_RESEND_INTERVAL = timedelta(minutes=1)
+
+# Database vendors supporting INSERT ... ON CONFLICT ... DO UPDATE ... WHERE.
+UPSERT_VENDORS = {"postgresql", "sqlite"}
+
+
+def get_email_templates(name: str):
+    """
+    Return the compiled ``(html, text)`` templates for an email.
+
+    Templates are loaded and compiled once per process and reused afterwards.
+    """
+    templates = _compiled_templates.get(name)
+    if templates is None:
+        html_template_name, text_template_name = EMAIL_TEMPLATES[name]
+        templates = (
+            get_template(html_template_name),
+            get_template(text_template_name),
+        )
+        _compiled_templates[name] = templates
+    return templates
+
+
+def precompile_email_templates() -> None:
+    """Compile every email template up front so the first request does not pay for it."""
+    for name in EMAIL_TEMPLATES:
+        try:
+            get_email_templates(name)
+        except Exception as e:
+            logger.warning(f"Could not precompile email templates for {name}: {e}")
+
+
+def render_email(name: str, context: dict):
+    """Render an email and return its ``(html_body, text_body)``."""
+    html_template, text_template = get_email_templates(name)
+    return html_template.render(context), text_template.render(context)
+
+
+@lru_cache(maxsize=32)
+def _get_access_code_subject(language: str) -> str:
+    """Static per-locale parts of the access code email."""
+    with translation.override(language):
+        return gettext("%(platform_name)s Access Code") % {
+            "platform_name": app_settings.platform_name
+        }
+
+
+def _upsert_access_code(connection, email_address, code_hash, now) -> bool:
+    """
+    Issue a code with a single ``INSERT ... ON CONFLICT DO UPDATE ... WHERE``.
+
+    The conditional update only replaces a code older than the resend interval,
+    so the throttle check and the write are one atomic statement.
+    """
+    opts = AccessCode._meta
+    table = connection.ops.quote_name(opts.db_table)
+
+    def column(name):
+        return connection.ops.quote_name(opts.get_field(name).column)
+
+    sql = (
+        f"INSERT INTO {table} ({column('email_address')}, {column('code_hash')}, "
+        f"{column('attempts')}, {column('expires_at')}, {column('created_at')}) "
+        f"VALUES (%s, %s, 0, %s, %s) "
+        f"ON CONFLICT ({column('email_address')}) DO UPDATE SET "
+        f"{column('code_hash')} = EXCLUDED.{column('code_hash')}, "
+        f"{column('attempts')} = 0, "
+        f"{column('expires_at')} = EXCLUDED.{column('expires_at')}, "
+        f"{column('created_at')} = EXCLUDED.{column('created_at')} "
+        f"WHERE {table}.{column('created_at')} <= %s"
+    )
+    adapt = connection.ops.adapt_datetimefield_value
+    params = [
+        email_address,
+        code_hash,
+        adapt(now + ACCESS_CODE_LIFETIME),
+        adapt(now),
+        adapt(now - ACCESS_CODE_RESEND_INTERVAL),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount == 1
+
+
+def _lock_and_replace_access_code(email_address, code_hash, now) -> bool:
+    """Fallback for backends without ``ON CONFLICT`` support."""
+    try:
+        with transaction.atomic():
+            existing = (
+                AccessCode.objects.select_for_update()
+                .filter(email_address=email_address)
+                .first()
+            )
+            if existing and existing.created_at > now - ACCESS_CODE_RESEND_INTERVAL:
+                return False
+            AccessCode.objects.update_or_create(
+                email_address=email_address,
+                defaults={
+                    "code_hash": code_hash,
+                    "attempts": 0,
+                    "expires_at": now + ACCESS_CODE_LIFETIME,
+                    "created_at": now,
+                },
+            )
+            return True
+    except IntegrityError:
+        # A concurrent request inserted the first code for this address.
+        return False
+
+
+def issue_access_code(email_address: str, code: str, now=None) -> bool:
+    """
+    Store a new access code for an email address unless one was issued within
+    the resend interval.
+
+    Returns:
+        bool: True if the code was stored, False if the address is throttled.
+    """
+    now = now or timezone.now()
+    code_hash = AccessCode.hash_code(code)
+    connection = connections[router.db_for_write(AccessCode)]
+
+    if connection.vendor in UPSERT_VENDORS:
+        return _upsert_access_code(connection, email_address, code_hash, now)
+    return _lock_and_replace_access_code(email_address, code_hash, now)
 
 
 def send_auth_code_via_email(account):
     if not account.email_address:
         raise ValueError("Account must have an email address to send auth code.")
 
+    tracer = get_tracer()
     now = timezone.now()
-    one_minute_ago = now - timedelta(minutes=1)
-
-    existing_code = (
-        AccessCode.objects.filter(email_address=account.email_address)
-        .order_by("-created_at")
-        .first()
-    )
+    code = f"{secrets.randbelow(900000) + 100000}"
 
-    if existing_code and existing_code.created_at > one_minute_ago:
-        seconds_remaining = int(
-            (existing_code.created_at + timedelta(minutes=1) - now).total_seconds()
+    with tracer.span("auth.access_code.issue"):
+        issued = issue_access_code(account.email_address, code, now=now)
+    if not issued:
+        existing_code = AccessCode.objects.filter(
+            email_address=account.email_address
+        ).first()
+        retry_at = (
+            existing_code.created_at + ACCESS_CODE_RESEND_INTERVAL
+            if existing_code
+            else now
         )
+        seconds_remaining = max(0, int((retry_at - now).total_seconds()))
         raise ValueError(
             f"A code was recently sent. Please wait {seconds_remaining} seconds before requesting a new one."
         )
 
-    code = f"{secrets.randbelow(900000) + 100000}"
-
-    with transaction.atomic():
-        AccessCode.objects.filter(email_address=account.email_address).delete()
-        AccessCode.objects.create(
-            email_address=account.email_address,
-            code=code,
-            expires_at=now + timedelta(minutes=5),
-        )
-    user_name = account.get_full_name()
-    context = {"code": code, "user": account, "user_name": user_name}
-    html_body = render_to_string("emails/access_code.html", context)
-    text_body = strip_tags(html_body)
-    subject = f"{app_settings.platform_name} Access Code"
+    with tracer.span("auth.email.render", template="access_code"):
+        user_name = account.get_full_name()
+        context = {"code": code, "user": account, "user_name": user_name}
+        html_body, text_body = render_email("access_code", context)
+        subject = _get_access_code_subject(get_language())
     from_email = getattr(settings, "DEFAULT_FROM_EMAIL", None)
     to_email = [account.email_address]
 
     email = EmailMultiAlternatives(subject, text_body, from_email, to_email)
     email.attach_alternative(html_body, "text/html")
-    email.send(fail_silently=False)
+    with tracer.span("auth.email.send"):
+        email.send(fail_silently=False)
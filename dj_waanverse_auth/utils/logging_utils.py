@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from dj_waanverse_auth.config.settings import auth_config
+
+
+class LogFields:
+    """
+    Event fields rendered as ``key=value`` pairs only when a handler formats
+    the record.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Dict[str, Any]):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(
+            f"{key}={value}" for key, value in self.fields.items() if value is not None
+        )
+
+
+class EventSampler:
+    """
+    Lets through at most one record per event and interval, per process,
+    counting the records it drops. Intervals come from ``LOG_EVENT_INTERVALS``;
+    events without one are never dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_allowed: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+
+    def allow(self, event: str, now: float = None) -> Tuple[bool, int]:
+        """Return whether to emit the event and how many records were dropped before it."""
+        interval = auth_config.log_event_intervals.get(event)
+        if not interval:
+            return True, 0
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now < self._next_allowed.get(event, 0):
+                self._suppressed[event] = self._suppressed.get(event, 0) + 1
+                return False, 0
+            self._next_allowed[event] = now + interval
+            return True, self._suppressed.pop(event, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._next_allowed.clear()
+            self._suppressed.clear()
+
+
+event_sampler = EventSampler()
+
+
+class EventLogger:
+    """
+    Structured logging for the auth hot paths.
+
+    Records carry an event name and keyword fields (reason, sid, user_id, ...),
+    both as ``extra`` attributes (``record.event``, ``record.event_fields``)
+    for JSON formatters and rendered lazily into the message. Nothing is
+    formatted when the level is disabled, and repetitive events are sampled
+    by ``EventSampler``.
+
+        log = EventLogger(__name__)
+        log.warning("authentication_failed", reason="identity_error", sid=sid)
+    """
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def log(self, level: int, event: str, **fields) -> None:
+        self._log(level, event, fields)
+
+    def debug(self, event: str, **fields) -> None:
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields) -> None:
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields) -> None:
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields) -> None:
+        self._log(logging.ERROR, event, fields)
+
+    def critical(self, event: str, **fields) -> None:
+        self._log(logging.CRITICAL, event, fields)
+
+    def _log(self, level, event, fields):
+        if not self.logger.isEnabledFor(level):
+            return
+
+        allowed, suppressed = event_sampler.allow(event)
+        if not allowed:
+            return
+        if suppressed:
+            fields["suppressed"] = suppressed
+
+        self.logger.log(
+            level,
+            "%s %s",
+            event,
+            LogFields(fields),
+            extra={"event": event, "event_fields": fields},
+            # Attribute the record to the caller of debug()/warning()/...
+            stacklevel=3,
+        )
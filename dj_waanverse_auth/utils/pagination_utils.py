@@ -0,0 +1,84 @@
+import base64
+import json
+from typing import Optional, Sequence, Tuple
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def get_page_size(request, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Read ``page_size`` from the query string, clamped to ``MAX_PAGE_SIZE``."""
+    try:
+        page_size = int(request.query_params.get("page_size", default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the ordering values of the last row of a page as an opaque cursor."""
+    payload = json.dumps(
+        [value.isoformat() if hasattr(value, "isoformat") else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(model, fields: Sequence[str], cursor: str) -> list:
+    """
+    Decode a cursor back into ordering values, converted with each model
+    field's ``to_python``.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        raw_values = json.loads(payload)
+        if not isinstance(raw_values, list) or len(raw_values) != len(fields):
+            raise ValueError("Cursor does not match the ordering")
+        return [
+            model._meta.get_field(field).to_python(value)
+            for field, value in zip(fields, raw_values)
+        ]
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+
+
+def keyset_paginate(
+    queryset, fields: Tuple[str, str], cursor: Optional[str], page_size: int
+):
+    """
+    Paginate a ``.values()`` queryset in descending ``fields`` order using a
+    keyset (seek) condition instead of ``OFFSET``, so every page costs the
+    same index range scan.
+
+    ``fields`` is a ``(column, unique tiebreaker)`` pair, e.g.
+    ``("created_at", "id")``; both must be included in the selected values.
+
+    Returns:
+        tuple: ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    first, tiebreaker = fields
+    queryset = queryset.order_by(f"-{first}", f"-{tiebreaker}")
+
+    if cursor:
+        first_value, tiebreaker_value = decode_cursor(queryset.model, fields, cursor)
+        queryset = queryset.filter(
+            Q(**{f"{first}__lt": first_value})
+            | Q(**{first: first_value, f"{tiebreaker}__lt": tiebreaker_value})
+        )
+
+    rows = list(queryset[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor([last[first], last[tiebreaker]])
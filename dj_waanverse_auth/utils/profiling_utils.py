@@ -0,0 +1,115 @@
+import os
+import pstats
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+PROFILE_SUFFIX = ".prof"
+COLLAPSED_SUFFIX = ".collapsed"
+
+# Guards the stack expansion against deep or recursive call graphs.
+MAX_STACK_DEPTH = 64
+
+
+def profile_filename(label: str) -> str:
+    """Return a unique, sortable base name for a profile dump."""
+    safe_label = "".join(c if c.isalnum() else "_" for c in label).strip("_")
+    return f"{time.time_ns()}-{os.getpid()}-{safe_label or 'root'}"
+
+
+def _frame_name(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins such as <method 'acquire' of '_thread.lock' objects>
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _call_edges(stats: pstats.Stats):
+    """Return the callees of every function and the roots of the call graph."""
+    children = defaultdict(list)
+    roots = []
+    for func, (_, _, tottime, cumtime, callers) in stats.stats.items():
+        if not callers:
+            roots.append((func, tottime, cumtime))
+        for caller, edge in callers.items():
+            edge_tottime, edge_cumtime = edge[2], edge[3]
+            children[caller].append((func, edge_tottime, edge_cumtime))
+    return children, roots
+
+
+class _StackCollapser:
+    """Walks a call graph from its roots, accumulating collapsed stacks."""
+
+    def __init__(self, stats: pstats.Stats):
+        self.stats = stats
+        self.children, self.roots = _call_edges(stats)
+        self.stacks: Dict[str, int] = defaultdict(int)
+
+    def collapse(self) -> Dict[str, int]:
+        for func, tottime, cumtime in self.roots:
+            self.walk(func, tottime, cumtime, "", 1.0)
+        return dict(self.stacks)
+
+    def walk(self, func, tottime, cumtime, path, scale):
+        if cumtime * scale * 1e6 < 1:
+            # Under a microsecond on this path; also bounds the expansion
+            return
+        frame = _frame_name(func)
+        stack = f"{path};{frame}" if path else frame
+        weight = int(tottime * scale * 1e6)
+        if weight:
+            self.stacks[stack] += weight
+
+        if stack.count(";") >= MAX_STACK_DEPTH:
+            return
+        node_cumtime = self.stats.stats[func][3]
+        if not node_cumtime:
+            return
+        child_scale = scale * cumtime / node_cumtime
+        for child, child_tottime, child_cumtime in self.children.get(func, ()):
+            if child != func:
+                self.walk(child, child_tottime, child_cumtime, stack, child_scale)
+
+
+def collapse_stats(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Expand a cProfile call graph into collapsed stacks for flame graphs.
+
+    cProfile only records caller/callee edges, so full stacks are rebuilt by
+    walking the graph from its roots, splitting each function's time between
+    its callees in proportion to the time attributed to every edge. Weights
+    are in microseconds; the result is an approximation, exact for call
+    graphs without shared callees.
+    """
+    return _StackCollapser(stats).collapse()
+
+
+def write_collapsed(stacks: Dict[str, int], path: Path) -> None:
+    with open(path, "w") as collapsed_file:
+        for stack, weight in sorted(stacks.items()):
+            collapsed_file.write(f"{stack} {weight}\n")
+
+
+def read_collapsed(path: Path) -> Dict[str, int]:
+    stacks: Dict[str, int] = {}
+    with open(path) as collapsed_file:
+        for line in collapsed_file:
+            stack, _, weight = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] = stacks.get(stack, 0) + int(weight)
+    return stacks
+
+
+def find_profiles(directory) -> List[Path]:
+    return sorted(Path(directory).glob(f"*{PROFILE_SUFFIX}"))
+
+
+def load_stats(paths: Iterable[Path]) -> pstats.Stats:
+    """Aggregate several profile dumps into one ``pstats.Stats``."""
+    paths = [str(path) for path in paths]
+    stats = pstats.Stats(paths[0])
+    for path in paths[1:]:
+        stats.add(path)
+    return stats
@@ -1,6 +1,7 @@
 import logging
+from functools import lru_cache
 from ipaddress import ip_address, ip_network
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 import requests
 from user_agents import parse
@@ -58,6 +59,55 @@ def get_ip_address(request) -> Optional[str]:
     return remote_addr if remote_addr else None
 
 
+@lru_cache(maxsize=32)
+def _parse_networks(cidrs: Tuple[str, ...]):
+    return tuple(ip_network(cidr, strict=False) for cidr in cidrs)
+
+
+def _in_networks(ip: str, networks) -> bool:
+    try:
+        ip_obj = ip_address(ip)
+    except ValueError:
+        return False
+    return any(ip_obj in network for network in networks)
+
+
+def get_client_ip(request, trusted_proxies: Iterable[str] = ()) -> Optional[str]:
+    """
+    Extracts the client IP address without trusting client-supplied headers.
+
+    ``X-Forwarded-For`` is only read when the peer (``REMOTE_ADDR``) is one of
+    ``trusted_proxies``, and then from the right, skipping further trusted
+    proxies, so a client cannot choose the address by prepending entries.
+    Cloudflare's ``CF-Connecting-IP`` is honoured as in ``get_ip_address``.
+
+    Args:
+        request: The HTTP request object
+        trusted_proxies: IP addresses or CIDR ranges of the reverse proxies
+
+    Returns:
+        Optional[str]: The client IP address, or None if there is no peer
+    """
+    remote_addr = request.META.get("REMOTE_ADDR")
+    if not remote_addr:
+        return None
+
+    cf_connecting_ip = request.META.get("HTTP_CF_CONNECTING_IP")
+    if cf_connecting_ip and is_cloudflare_ip(remote_addr):
+        return cf_connecting_ip
+
+    networks = _parse_networks(tuple(trusted_proxies))
+    if not _in_networks(remote_addr, networks):
+        return remote_addr
+
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    for hop in reversed(forwarded_for.split(",")):
+        hop = hop.strip()
+        if hop and not _in_networks(hop, networks):
+            return hop
+    return remote_addr
+
+
 def get_location_from_ip(ip_address: str) -> str:
     """Gets location details from an IP address and returns a formatted location string."""
     if ip_address == "127.0.0.1":
@@ -1,7 +1,86 @@
+from typing import Iterable, Optional, Set
+
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from dj_waanverse_auth.models import UserSession
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.models import SessionGeneration, UserSession
+from dj_waanverse_auth.services.tracing import get_tracer
 from dj_waanverse_auth.utils.security_utils import get_ip_address
+from dj_waanverse_auth.utils.token_utils import decode_token
+
+
+GENERATION_CACHE_PREFIX = "waanverse_auth:session_gen:"
+
+
+def _generation_cache_key(account_id) -> str:
+    return f"{GENERATION_CACHE_PREFIX}{account_id}"
+
+
+def get_session_generation(account_id) -> int:
+    """
+    Return the current session generation of an account.
+
+    Served from the session cache; the database is only read on a miss.
+    Accounts that never revoked their sessions are at generation 0.
+    """
+    with get_tracer().span("auth.session.generation") as span:
+        cache = caches[auth_config.session_cache]
+        key = _generation_cache_key(account_id)
+        generation = cache.get(key)
+        span.set_attribute("cache.hit", generation is not None)
+        if generation is None:
+            generation = (
+                SessionGeneration.objects.filter(account_id=account_id)
+                .values_list("generation", flat=True)
+                .first()
+            ) or 0
+            cache.set(key, generation, auth_config.session_generation_cache_timeout)
+    return generation
+
+
+def bump_session_generation(account_id) -> int:
+    """
+    Increment the session generation of an account and return the new value.
+
+    Every token issued under an older generation is rejected from then on, so
+    this revokes all of the account's sessions with a single-row update.
+    """
+    with transaction.atomic():
+        updated = SessionGeneration.objects.filter(account_id=account_id).update(
+            generation=F("generation") + 1
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    SessionGeneration.objects.create(
+                        account_id=account_id, generation=1
+                    )
+            except IntegrityError:
+                # Created concurrently by another revocation
+                SessionGeneration.objects.filter(account_id=account_id).update(
+                    generation=F("generation") + 1
+                )
+        generation = SessionGeneration.objects.values_list(
+            "generation", flat=True
+        ).get(account_id=account_id)
+
+    caches[auth_config.session_cache].set(
+        _generation_cache_key(account_id),
+        generation,
+        auth_config.session_generation_cache_timeout,
+    )
+    return generation
+
+
+def is_token_revoked(payload: dict) -> bool:
+    """
+    Return True if the token claims were issued under an older session generation.
+    """
+    return payload.get("gen", 0) < get_session_generation(payload["id"])
 
 
 def create_session(user, request) -> str:
@@ -14,53 +93,148 @@ def create_session(user, request) -> str:
     Returns:
         A string representing the newly created session ID.
     """
-    user_agent = request.META.get("HTTP_USER_AGENT", "")
-    session = UserSession.objects.create(
-        account=user,
-        ip_address=get_ip_address(request),
-        user_agent=user_agent,
-    )
+    with get_tracer().span("auth.session.create"):
+        user_agent = request.META.get("HTTP_USER_AGENT", "")
+        session = UserSession.objects.create(
+            account=user,
+            ip_address=get_ip_address(request),
+            user_agent=user_agent,
+            generation=get_session_generation(user.pk),
+        )
 
     return session.id
 
 
-def validate_session(session_id: int) -> bool:
+def _current_generation():
+    """The account's session generation as a subquery, 0 without a row."""
+    return Coalesce(
+        Subquery(
+            SessionGeneration.objects.filter(
+                account_id=OuterRef("account_id")
+            ).values("generation")[:1]
+        ),
+        0,
+    )
+
+
+def validate_session(session_id: int, generation: Optional[int] = None) -> bool:
     """
     Validate a session by checking its existence and updating the last_used timestamp.
 
     Args:
         session_id: The ID of the session to validate.
+        generation: The session generation the token was issued under. Tokens
+            of an older generation are rejected, read from the database in the
+            same query as the session, so revocations apply to every worker
+            at once whatever the session cache.
 
     Returns:
         True if the session is valid, False otherwise.
     """
-    try:
-        session = UserSession.objects.get(id=session_id, is_active=True)
-        session.last_used = timezone.now()
-        session.save(update_fields=["last_used"])
-        return True
-    except Exception:
-        return False
+    with get_tracer().span("auth.session.validate"):
+        try:
+            session = UserSession.objects.annotate(
+                current_generation=_current_generation()
+            ).get(id=session_id, is_active=True)
+            if generation is not None and generation < session.current_generation:
+                return False
+            session.last_used = timezone.now()
+            session.save(update_fields=["last_used"])
+            return True
+        except Exception:
+            return False
 
 
-def revoke_session(session_id: str) -> None:
+def validate_sessions(session_ids: Iterable[int], touch: bool = False) -> Set[int]:
     """
-    Revoke a specific session by marking it as inactive.
+    Validate many sessions with a single ``id__in`` query.
+
+    Args:
+        session_ids: The IDs of the sessions to validate.
+        touch: Also update the last_used timestamp of the valid sessions,
+            with one more query.
+
+    Returns:
+        The IDs of the sessions that exist and are active.
+    """
+    ids = {session_id for session_id in session_ids if session_id is not None}
+    if not ids:
+        return set()
+
+    with get_tracer().span("auth.session.validate_batch", size=len(ids)):
+        valid = set(
+            UserSession.objects.filter(id__in=ids, is_active=True).values_list(
+                "id", flat=True
+            )
+        )
+        if touch and valid:
+            UserSession.objects.filter(id__in=valid).update(last_used=timezone.now())
+    return valid
+
+
+def revoke_session(session_id: int, user) -> bool:
+    """
+    Revoke a session owned by a user.
+
+    Runs a single ``DELETE ... WHERE id = %s AND account_id = %s``; sessions
+    of other accounts are never touched.
 
     Args:
         session_id: The ID of the session to revoke.
+        user: The user object the session must belong to.
+    Returns:
+        True if a session was deleted, False if none matched.
     """
-    UserSession.objects.filter(id=session_id).delete()
+    deleted, _ = UserSession.objects.filter(id=session_id, account=user).delete()
+    return bool(deleted)
 
 
-def revoke_other_sessions(user, current_session_id: str) -> None:
+def revoke_all_sessions(user) -> int:
     """
-    Revoke all active sessions for a user except the current session.
+    Revoke every session of a user by bumping the account's session generation.
+
+    Args:
+        user: The user object whose sessions should be revoked.
+    Returns:
+        The new session generation.
+    """
+    return bump_session_generation(user.pk)
+
+
+def revoke_other_sessions(user, current_session_id: int) -> int:
+    """
+    Revoke all sessions of a user except the current session.
+
+    The generation is bumped and the current session is moved to the new
+    generation; the caller must issue fresh tokens for it.
 
     Args:
         user: The user object whose other sessions should be revoked.
-        current_session_id: The ID of the current session to exclude.
+        current_session_id: The ID of the current session to keep.
+    Returns:
+        The new session generation.
+    """
+    generation = bump_session_generation(user.pk)
+    UserSession.objects.filter(id=current_session_id, account=user).update(
+        generation=generation
+    )
+    return generation
+
+
+def get_current_session_id(request) -> Optional[int]:
+    """
+    Return the session id (``sid`` claim) of the token that authenticated the request.
+
+    Uses the claims stored by ``JWTAuthentication`` and only decodes the token
+    again for requests authenticated some other way.
     """
-    UserSession.objects.filter(user=user, is_active=True).exclude(
-        id=current_session_id
-    ).delete()
+    payload = getattr(request, "token_payload", None)
+    if payload is None:
+        token = getattr(request, "auth", None)
+        if not isinstance(token, str):
+            return None
+        try:
+            payload = decode_token(token)
+        except Exception:
+            return None
+    return payload.get("sid")
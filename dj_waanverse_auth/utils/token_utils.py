@@ -1,15 +1,45 @@
-import logging
+import base64
+import contextvars
+import json
+import threading
+import time
+from calendar import timegm
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
 from functools import lru_cache
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 
 import jwt
 from cryptography.exceptions import InvalidKey
-from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
 from rest_framework import exceptions
 
 from dj_waanverse_auth import settings
+from dj_waanverse_auth.services.signing_executor import get_signing_executor
+from dj_waanverse_auth.services.tracing import get_tracer
+from dj_waanverse_auth.utils.logging_utils import EventLogger
 
-logger = logging.getLogger(__name__)
+log = EventLogger(__name__)
+
+JWT_ALGORITHM = "RS256"
+REQUIRED_ENCODE_CLAIMS = frozenset({"id", "exp", "iat", "iss"})
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+# Compact claim profile: short names for the private claims, integer token
+# types and a short issuer id (a string, as RFC 7519 requires). Claims equal
+# to their default may be omitted.
+COMPACT_CLAIM_NAMES = {"id": "u", "sid": "s", "gen": "g", "token_type": "t"}
+STANDARD_CLAIM_NAMES = {short: name for name, short in COMPACT_CLAIM_NAMES.items()}
+TOKEN_TYPE_CODES = {"access": 1, "refresh": 2}
+TOKEN_TYPE_NAMES = {code: name for name, code in TOKEN_TYPE_CODES.items()}
+COMPACT_DEFAULTS = {"t": TOKEN_TYPE_CODES["access"], "g": 0}
+
+# One encoder instance: json.dumps() with custom separators builds a new one
+# on every call.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
 
 
 class KeyLoadError(Exception):
@@ -39,20 +69,68 @@ def get_key(key_type):
             return serialization.load_pem_private_key(key_data, password=None)
 
     except FileNotFoundError:
-        logger.critical(f"Could not find {key_type} key file at {key_paths[key_type]}")
+        log.critical("key_not_found", key_type=key_type, path=key_paths[key_type])
         raise KeyLoadError(f"Could not find {key_type} key file")
     except InvalidKey as e:
-        logger.critical(f"Invalid {key_type} key format: {str(e)}")
+        log.critical("key_invalid", key_type=key_type, error=e)
         raise KeyLoadError(f"Invalid {key_type} key format")
     except Exception as e:
-        logger.critical(f"Unexpected error loading {key_type} key: {str(e)}")
+        log.critical("key_load_error", key_type=key_type, error=e)
         raise KeyLoadError(f"Failed to load {key_type} key")
 
 
+def compact_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert claims to the compact profile.
+
+    The configured ``PLATFORM_NAME`` issuer becomes ``TOKEN_ISSUER_ID``, and
+    with ``COMPACT_TOKEN_OMIT_DEFAULTS`` an access token type and a zero
+    session generation are left out.
+    """
+    omit_defaults = settings.compact_token_omit_defaults
+    compact = {}
+    for name, value in claims.items():
+        if name == "token_type":
+            value = TOKEN_TYPE_CODES.get(value, value)
+        elif name == "iss" and value == settings.platform_name:
+            value = settings.token_issuer_id
+        short_name = COMPACT_CLAIM_NAMES.get(name, name)
+        if omit_defaults and short_name in COMPACT_DEFAULTS:
+            if COMPACT_DEFAULTS[short_name] == value:
+                continue
+        compact[short_name] = value
+    return compact
+
+
+def expand_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the standard claims of a compact payload, others unchanged."""
+    if "u" not in payload:
+        return payload
+
+    claims = {**COMPACT_DEFAULTS, **payload}
+    claims["t"] = TOKEN_TYPE_NAMES.get(claims["t"], claims["t"])
+    if claims.get("iss") == settings.token_issuer_id:
+        claims["iss"] = settings.platform_name
+    return {
+        STANDARD_CLAIM_NAMES.get(name, name): value for name, value in claims.items()
+    }
+
+
+def _require_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # "id" and "sid" are only required once compact names are expanded.
+    for claim in ("id", "sid"):
+        if claim not in payload:
+            raise jwt.MissingRequiredClaimError(claim)
+    return payload
+
+
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate a JWT token with comprehensive error handling and logging.
 
+    Tokens of the compact claim profile are returned with the standard claim
+    names, see ``expand_claims``.
+
     This function performs thorough validation of JWT tokens including:
     - Signature verification using RS256 algorithm
     - Expiration time validation
@@ -88,64 +166,231 @@ def decode_token(token: str) -> Dict[str, Any]:
         raise exceptions.AuthenticationFailed("No token provided")
 
     try:
-        public_key = get_key("public")
-        payload = jwt.decode(
-            token,
-            public_key,
-            algorithms=["RS256"],
-            options={
-                "verify_signature": True,
-                "verify_exp": True,
-                "verify_nbf": True,
-                "verify_iat": True,
-                "require": [
-                    "exp",
-                    "iat",
-                    "iss",
-                    "id",
-                    "sid",
-                ],
-            },
-        )
+        with get_tracer().span("auth.token.verify", algorithm=JWT_ALGORITHM):
+            public_key = get_key("public")
+            payload = jwt.decode(
+                token,
+                public_key,
+                algorithms=[JWT_ALGORITHM],
+                options={
+                    "verify_signature": True,
+                    "verify_exp": True,
+                    "verify_nbf": True,
+                    "verify_iat": True,
+                    "require": [
+                        "exp",
+                        "iat",
+                        "iss",
+                    ],
+                },
+            )
+            payload = _require_claims(expand_claims(payload))
         return payload
 
+    # Subclasses of InvalidTokenError come first, or they would never match.
     except jwt.ExpiredSignatureError:
-        logger.info("Token expired")
+        log.info("token_expired")
         raise exceptions.AuthenticationFailed("Token has expired")
-    except jwt.InvalidTokenError as e:
-        logger.warning(f"Invalid token structure: {str(e)}")
-        raise exceptions.AuthenticationFailed("Invalid token structure")
     except jwt.InvalidSignatureError:
-        logger.warning("Invalid token signature")
+        log.warning("token_invalid", reason="signature")
         raise exceptions.AuthenticationFailed("Invalid token signature")
     except jwt.InvalidIssuerError:
-        logger.warning("Invalid token issuer")
+        log.warning("token_invalid", reason="issuer")
         raise exceptions.AuthenticationFailed("Invalid token issuer")
     except jwt.MissingRequiredClaimError as e:
-        logger.warning(f"Missing required claim: {str(e)}")
+        log.warning("token_invalid", reason="missing_claim", claim=e.claim)
         raise exceptions.AuthenticationFailed("Missing required claim in token")
+    except jwt.InvalidTokenError as e:
+        log.warning("token_invalid", reason="structure", error=e)
+        raise exceptions.AuthenticationFailed("Invalid token structure")
     except Exception as e:
-        logger.error(f"Unexpected error decoding token: {str(e)}")
+        log.error("token_decode_error", error=e)
         raise exceptions.AuthenticationFailed("Token validation failed")
 
 
+@dataclass(frozen=True)
+class TokenVerification:
+    """Outcome of verifying one token of a batch."""
+
+    payload: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+
+class VerifiedTokenCache:
+    """
+    Process-local LRU of verified tokens and their payloads, holding up to
+    ``VERIFIED_TOKEN_CACHE_SIZE`` tokens (0 disables it).
+
+    A hit skips signature verification until the token's ``exp``; session
+    and revocation checks remain with the caller.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, token: str, now: float = None) -> Optional[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+        return dict(payload)
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        max_size = settings.verified_token_cache_size
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._entries[token] = dict(payload)
+            self._entries.move_to_end(token)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_token_cache = VerifiedTokenCache()
+
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+
+def _get_batch_pool() -> ThreadPoolExecutor:
+    global _batch_pool
+    if _batch_pool is None:
+        with _batch_pool_lock:
+            if _batch_pool is None:
+                _batch_pool = ThreadPoolExecutor(
+                    max_workers=settings.batch_verify_workers,
+                    thread_name_prefix="waanverse-auth-verify",
+                )
+    return _batch_pool
+
+
+def _verify_for_batch(token: str) -> TokenVerification:
+    try:
+        payload = decode_token(token)
+    except exceptions.AuthenticationFailed as e:
+        return TokenVerification(error=str(e.detail))
+    verified_token_cache.set(token, payload)
+    return TokenVerification(payload=payload)
+
+
+def decode_tokens(tokens: Iterable[str]) -> Dict[str, TokenVerification]:
+    """
+    Verify many tokens at once without raising, e.g. for gateways or
+    websocket reconnect storms.
+
+    Duplicates are verified once and tokens in the verified-token cache skip
+    signature verification; the others are verified in parallel on a shared
+    pool of ``BATCH_VERIFY_WORKERS`` threads. Revocation and sessions are not
+    checked, see ``is_token_revoked`` and ``validate_sessions``.
+
+    Args:
+        tokens: The JWT token strings to verify.
+
+    Returns:
+        Dict[str, TokenVerification]: One result per distinct token, in
+        first-seen order, with either the payload or the error message
+        ``decode_token`` would have raised.
+    """
+    results: Dict[str, Optional[TokenVerification]] = dict.fromkeys(tokens)
+    now = time.time()
+    pending = []
+    for token in results:
+        payload = verified_token_cache.get(token, now) if token else None
+        if payload is None:
+            pending.append(token)
+        else:
+            results[token] = TokenVerification(payload=payload)
+
+    with get_tracer().span(
+        "auth.token.verify_batch",
+        size=len(results),
+        cache_hits=len(results) - len(pending),
+    ):
+        if len(pending) > 1 and settings.batch_verify_workers > 1:
+            # Each task gets its own copy of the context so its spans keep
+            # this batch as their parent.
+            pool = _get_batch_pool()
+            futures = [
+                pool.submit(contextvars.copy_context().run, _verify_for_batch, token)
+                for token in pending
+            ]
+            verified = [future.result() for future in futures]
+        else:
+            verified = [_verify_for_batch(token) for token in pending]
+
+    for token, result in zip(pending, verified):
+        results[token] = result
+    return results
+
+
+def _base64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+@lru_cache(maxsize=4)
+def get_header_segment(algorithm: str = JWT_ALGORITHM) -> str:
+    """Return the base64url encoded JOSE header, serialized once per algorithm."""
+    return _base64url(_encode_json({"alg": algorithm, "typ": "JWT"}).encode())
+
+
+def sign_claims(claims: Dict[str, Any]) -> str:
+    """
+    Sign JSON-serializable claims (timestamps as integers) into an RS256 JWT.
+
+    Equivalent to ``jwt.encode`` but reuses the cached header segment and
+    signs with the loaded key directly, or through the ``SIGNING_EXECUTOR``
+    pool when one is configured and has room.
+    """
+    signing_input = (
+        f"{get_header_segment()}.{_base64url(_encode_json(claims).encode())}"
+    )
+    data = signing_input.encode("ascii")
+    executor = get_signing_executor()
+    signature = executor.sign(data) if executor is not None else None
+    if signature is None:
+        signature = get_key("private").sign(data, padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{_base64url(signature)}"
+
+
 def encode_token(payload) -> str:
     """
-    Encode payload into JWT token with error handling and logging
+    Encode payload into JWT token with error handling and logging.
+
+    ``datetime`` values of the time claims are converted to timestamps, and
+    the claims are compacted under ``TOKEN_CLAIM_PROFILE = "compact"``.
     """
 
     if not isinstance(payload, dict):
         raise ValueError("Payload must be a dictionary")
 
-    required_claims = {"id", "exp", "iat", "iss"}
-    missing_claims = required_claims - set(payload.keys())
-    if missing_claims:
+    if not REQUIRED_ENCODE_CLAIMS.issubset(payload):
+        missing_claims = set(REQUIRED_ENCODE_CLAIMS - payload.keys())
         raise ValueError(f"Missing required claims: {missing_claims}")
+
+    for claim in TIME_CLAIMS:
+        value = payload.get(claim)
+        if isinstance(value, datetime):
+            payload = {**payload, claim: timegm(value.utctimetuple())}
+    if settings.token_claim_profile == "compact":
+        payload = compact_claims(payload)
     try:
-        private_key = get_key("private")
-        token = jwt.encode(payload, private_key, algorithm="RS256")
-        return token
+        with get_tracer().span("auth.token.sign", algorithm=JWT_ALGORITHM):
+            return sign_claims(payload)
 
     except Exception as e:
-        logger.error(f"Token encoding failed: {str(e)}")
+        log.error("token_encode_error", error=e)
         raise exceptions.AuthenticationFailed("Could not generate token")
@@ -0,0 +1,179 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from webauthn import generate_authentication_options, generate_registration_options
+from webauthn.helpers import bytes_to_base64url, generate_challenge, options_to_json_dict
+from webauthn.helpers.structs import (
+    AuthenticatorSelectionCriteria,
+    ResidentKeyRequirement,
+    UserVerificationRequirement,
+)
+
+from dj_waanverse_auth.config.settings import auth_config
+from dj_waanverse_auth.models import Passkey
+from dj_waanverse_auth.services.tracing import get_tracer
+
+ALLOW_LIST_CACHE_PREFIX = "waanverse_passkey_allow_list"
+
+
+@dataclass(frozen=True)
+class RelyingParty:
+    """
+    WebAuthn relying party settings together with the static parts of the
+    registration and authentication options, built once per process.
+    """
+
+    id: str
+    name: str
+    origin: str
+    registration_template: dict
+    authentication_template: dict
+
+
+def _json_ready(options) -> dict:
+    # Done once per process: turns enums into plain JSON values.
+    return json.loads(json.dumps(options_to_json_dict(options)))
+
+
+@lru_cache(maxsize=1)
+def get_relying_party() -> RelyingParty:
+    """
+    Return the relying party built from WEBAUTHN_DOMAIN, WEBAUTHN_RP_NAME and
+    WEBAUTHN_ORIGIN.
+
+    Raises:
+        ImproperlyConfigured: If any of the settings is missing.
+    """
+    rp_id = auth_config.webauthn_domain
+    rp_name = auth_config.webauthn_rp_name
+    rp_origin = auth_config.webauthn_origin
+    if not rp_id or not rp_name or not rp_origin:
+        raise ImproperlyConfigured("Webauthn domain or name not configured.")
+
+    registration_template = _json_ready(
+        generate_registration_options(
+            rp_id=rp_id,
+            rp_name=rp_name,
+            user_id=b"template",
+            user_name="template",
+            # Discoverable credentials allow usernameless login
+            authenticator_selection=AuthenticatorSelectionCriteria(
+                resident_key=ResidentKeyRequirement.REQUIRED,
+                user_verification=UserVerificationRequirement.REQUIRED,
+            ),
+        )
+    )
+    authentication_template = _json_ready(
+        generate_authentication_options(
+            rp_id=rp_id,
+            user_verification=UserVerificationRequirement.PREFERRED,
+        )
+    )
+    for template in (registration_template, authentication_template):
+        template.pop("challenge", None)
+
+    return RelyingParty(
+        id=rp_id,
+        name=rp_name,
+        origin=rp_origin,
+        registration_template=registration_template,
+        authentication_template=authentication_template,
+    )
+
+
+def _credential_descriptors(credential_ids: Iterable[bytes]) -> List[dict]:
+    return [
+        {"id": bytes_to_base64url(bytes(credential_id)), "type": "public-key"}
+        for credential_id in credential_ids
+    ]
+
+
+def build_registration_options(
+    rp: RelyingParty,
+    user_id: bytes,
+    user_name: str,
+    exclude_credential_ids: Iterable[bytes] = (),
+) -> Tuple[bytes, dict]:
+    """
+    Return a new challenge and the JSON-ready registration options for it.
+    """
+    challenge = generate_challenge()
+    options = dict(rp.registration_template)
+    options["challenge"] = bytes_to_base64url(challenge)
+    options["user"] = {
+        "id": bytes_to_base64url(user_id),
+        "name": user_name,
+        "displayName": user_name,
+    }
+    options["excludeCredentials"] = _credential_descriptors(exclude_credential_ids)
+    return challenge, options
+
+
+def build_authentication_options(
+    rp: RelyingParty, allow_credential_ids: Iterable[bytes] = ()
+) -> Tuple[bytes, dict]:
+    """
+    Return a new challenge and the JSON-ready authentication options for it.
+    """
+    challenge = generate_challenge()
+    options = dict(rp.authentication_template)
+    options["challenge"] = bytes_to_base64url(challenge)
+    options["allowCredentials"] = _credential_descriptors(allow_credential_ids)
+    return challenge, options
+
+
+def _allow_list_cache_key(email_address: str, legacy_only: bool = False) -> str:
+    digest = hashlib.sha256(email_address.strip().lower().encode()).hexdigest()
+    scope = "legacy" if legacy_only else "all"
+    return f"{ALLOW_LIST_CACHE_PREFIX}:{scope}:{digest}"
+
+
+def get_allowed_credential_ids(
+    email_address: str, legacy_only: bool = False
+) -> List[bytes]:
+    """
+    Return the credential ids registered for an email address.
+
+    Built with a single ``values_list`` query and cached for
+    ``WEBAUTHN_ALLOW_LIST_CACHE_TIMEOUT`` seconds. Unknown addresses are cached
+    as an empty list, so they cost the same as known ones. With
+    ``legacy_only`` only passkeys that may not be discoverable are returned.
+    """
+    with get_tracer().span("passkey.allow_list", legacy_only=legacy_only) as span:
+        cache = caches[auth_config.webauthn_challenge_cache]
+        cache_key = _allow_list_cache_key(email_address, legacy_only)
+
+        credential_ids = cache.get(cache_key)
+        span.set_attribute("cache.hit", credential_ids is not None)
+        if credential_ids is None:
+            passkeys = Passkey.objects.filter(
+                user__email_address__iexact=email_address.strip()
+            )
+            if legacy_only:
+                passkeys = passkeys.filter(discoverable=False)
+            credential_ids = [
+                bytes(credential_id)
+                for credential_id in passkeys.values_list("credential_id", flat=True)
+            ]
+            cache.set(
+                cache_key,
+                credential_ids,
+                timeout=auth_config.webauthn_allow_list_cache_timeout,
+            )
+    return credential_ids
+
+
+def invalidate_allowed_credential_ids(email_address: str) -> None:
+    """Drop the cached allow-lists of an email address after its passkeys change."""
+    if email_address:
+        caches[auth_config.webauthn_challenge_cache].delete_many(
+            [
+                _allow_list_cache_key(email_address),
+                _allow_list_cache_key(email_address, legacy_only=True),
+            ]
+        )
@@ -1,23 +1,41 @@
-import logging
-
 from django.contrib.auth import get_user_model
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from dj_waanverse_auth.config.settings import auth_config
 from dj_waanverse_auth.models import UserSession
-from dj_waanverse_auth.serializers import SessionSerializer
+from dj_waanverse_auth.serializers import SessionListSerializer
+from dj_waanverse_auth.services.metrics import instrument_view
 from dj_waanverse_auth.services.token_service import TokenService
+from dj_waanverse_auth.throttling import RefreshRateThrottle
+from dj_waanverse_auth.utils.logging_utils import EventLogger
+from dj_waanverse_auth.utils.pagination_utils import (
+    InvalidCursor,
+    get_page_size,
+    keyset_paginate,
+)
 from dj_waanverse_auth.utils.serializer_utils import get_serializer_class
-from dj_waanverse_auth.utils.session_utils import revoke_session
+from dj_waanverse_auth.utils.session_utils import (
+    get_current_session_id,
+    get_session_generation,
+    revoke_all_sessions,
+    revoke_other_sessions,
+    revoke_session,
+)
 
 User = get_user_model()
-logger = logging.getLogger(__name__)
+log = EventLogger(__name__)
 
 
+@instrument_view("refresh")
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([RefreshRateThrottle])
 def refresh_access_token(request):
     """
     View to refresh the access token using a valid refresh token.
@@ -66,7 +84,7 @@ def refresh_access_token(request):
         return response
 
     except Exception as e:
-        logger.warning(f"Invalid refresh token attempt: {str(e)}")
+        log.warning("refresh_failed", error=e)
         response = Response(
             {
                 "error": "Invalid refresh token.",
@@ -91,55 +109,124 @@ def authenticated_user(request):
     )
 
 
-@api_view(["POST"])
-@permission_classes([AllowAny])
-def logout_view(request, session_id):
-    try:
-        revoke_session(session_id=session_id)
-    except UserSession.DoesNotExist:
+def _terminate_session(request, session_id, clear_cookies):
+    if not revoke_session(session_id=session_id, user=request.user):
         return Response(
             {"error": "Session not found"},
             status=status.HTTP_404_NOT_FOUND,
         )
-    except Exception as e:
-        return Response(
-            {"error": f"Failed to deactivate session: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
 
-    token_manager = TokenService(request=request)
-
-    return token_manager.clear_all_cookies(
-        Response(
-            status=status.HTTP_200_OK,
-            data={"status": "success", "session_id": session_id},
-        )
+    response = Response(
+        status=status.HTTP_200_OK,
+        data={"status": "success", "session_id": session_id},
     )
+    if clear_cookies:
+        response = TokenService(request=request).clear_all_cookies(response)
+    return response
 
 
-@api_view(["GET"])
+@api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def get_user_sessions(request):
-    user = request.user
-    sessions = UserSession.objects.filter(account=user)
-    serializer = SessionSerializer(sessions, many=True)
+def logout_view(request, session_id):
+    """
+    End one of the user's sessions and clear the auth cookies.
+    """
+    return _terminate_session(request, session_id, clear_cookies=True)
 
-    return Response(serializer.data, status=status.HTTP_200_OK)
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_user_sessions(request):
+    """
+    List the user's active sessions, most recently used first, with keyset
+    pagination on ``(last_used, id)``. The session of the current token is
+    flagged with ``is_current``. Sessions revoked by a generation bump are
+    left out.
+    """
+    sessions = UserSession.objects.filter(
+        account=request.user,
+        is_active=True,
+        generation__gte=get_session_generation(request.user.pk),
+    ).values("id", "user_agent", "ip_address", "created_at", "last_used")
 
-@api_view(["DELETE"])
-@permission_classes([AllowAny])
-def delete_user_session(request, session_id):
     try:
-        session = UserSession.objects.get(id=session_id)
-        session.delete()
-        return Response({"status": "success"}, status=status.HTTP_200_OK)
-    except UserSession.DoesNotExist:
+        rows, next_cursor = keyset_paginate(
+            sessions,
+            fields=("last_used", "id"),
+            cursor=request.query_params.get("cursor"),
+            page_size=get_page_size(request),
+        )
+    except InvalidCursor:
         return Response(
-            {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
+            {"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST
         )
-    except Exception as e:
+
+    current_session_id = get_current_session_id(request)
+    for row in rows:
+        row["is_current"] = row["id"] == current_session_id
+
+    return Response(
+        {
+            "results": SessionListSerializer(rows, many=True).data,
+            "next_cursor": next_cursor,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def revoke_all_sessions_view(request):
+    """
+    Log the user out everywhere, including the current session, by bumping
+    the account's session generation.
+    """
+    revoke_all_sessions(request.user)
+
+    return TokenService(request=request).clear_all_cookies(
+        Response({"status": "success"}, status=status.HTTP_200_OK)
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def revoke_other_sessions_view(request):
+    """
+    Log the user out of every session but the current one. The current
+    session is moved to the new generation and gets fresh tokens.
+    """
+    session_id = get_current_session_id(request)
+    if session_id is None:
         return Response(
-            {"error": f"Failed to delete session: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            {"error": "Current session could not be determined."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
+
+    revoke_other_sessions(request.user, current_session_id=session_id)
+
+    token_service = TokenService(
+        request=request, user=request.user, session_id=session_id
+    )
+    response = Response(status=status.HTTP_200_OK)
+    response_data = token_service.setup_login_cookies(response=response)
+    response = response_data["response"]
+    response.data = {
+        "status": "success",
+        "access_token": response_data["tokens"]["access_token"],
+        "refresh_token": response_data["tokens"]["refresh_token"],
+    }
+    return response
+
+
+@api_view(["DELETE"])
+@permission_classes([IsAuthenticated])
+def delete_user_session(request, session_id):
+    """
+    End one of the user's sessions, e.g. from the session list. Cookies are
+    only cleared when the current session is the one deleted.
+    """
+    return _terminate_session(
+        request,
+        session_id,
+        clear_cookies=session_id == get_current_session_id(request),
+    )
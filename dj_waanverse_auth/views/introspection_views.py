@@ -0,0 +1,35 @@
+from rest_framework import exceptions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from dj_waanverse_auth.services.opaque_tokens import decode_access_token
+from dj_waanverse_auth.utils.session_utils import is_token_revoked, validate_sessions
+
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def introspect_token_view(request):
+    """
+    Token introspection for other services, after RFC 7662.
+
+    Accepts an opaque or JWT access token in ``token`` and answers with its
+    claims and ``"active": true``, or only ``"active": false`` when the token
+    is unknown, expired, revoked or its session has ended. Restricted to
+    staff users, e.g. one service account per calling service.
+    """
+    token = request.data.get("token")
+    if not token or not isinstance(token, str):
+        return Response(
+            {"detail": "A token is required."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        payload = decode_access_token(token.strip())
+    except exceptions.AuthenticationFailed:
+        return Response({"active": False})
+
+    if is_token_revoked(payload) or not validate_sessions([payload.get("sid")]):
+        return Response({"active": False})
+    return Response({"active": True, **payload})
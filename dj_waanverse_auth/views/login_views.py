@@ -9,14 +9,19 @@ from logging import getLogger
 from dj_waanverse_auth import settings as auth_config
 from rest_framework.permissions import AllowAny
 from rest_framework.decorators import permission_classes
+from rest_framework.decorators import throttle_classes
+from dj_waanverse_auth.services.metrics import instrument_view
+from dj_waanverse_auth.throttling import LoginRateThrottle
 from dj_waanverse_auth.utils.login import handle_login
 
 logger = getLogger(__name__)
 Account = get_user_model()
 
 
+@instrument_view("login")
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
 def login_view(request):
     email_address = request.data.get("email_address")
     code = request.data.get("code")
@@ -71,10 +76,43 @@ def _request_code_flow(email):
         )
 
 
+def _is_valid_access_code(access_instance, code) -> bool:
+    """
+    Check a submitted code against the stored hash, counting failed attempts.
+    Locked or expired codes never match.
+    """
+    if (
+        not access_instance
+        or access_instance.is_expired()
+        or access_instance.is_locked()
+    ):
+        return False
+
+    if access_instance.check_code(code):
+        return True
+
+    access_instance.register_failed_attempt()
+    return False
+
+
+def _consume_access_code(access_instance) -> bool:
+    """
+    Delete a matched code, unless concurrent failed attempts locked it since
+    it was read. Only one of several concurrent submissions can consume it.
+    """
+    deleted, _ = AccessCode.objects.filter(
+        pk=access_instance.pk, attempts__lt=auth_config.access_code_max_attempts
+    ).delete()
+    return bool(deleted)
+
+
 def _verify_code_flow(request, email, code):
-    access_instance = AccessCode.objects.filter(code=code, email_address=email).first()
+    access_instance = AccessCode.objects.filter(email_address=email).first()
     if email != "johndoe@gmail.com" or not auth_config.is_testing:
-        if not access_instance or access_instance.is_expired():
+        if not (
+            _is_valid_access_code(access_instance, code)
+            and _consume_access_code(access_instance)
+        ):
             return Response(
                 {"detail": "Invalid or expired code."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -92,10 +130,4 @@ def _verify_code_flow(request, email, code):
         account.save(update_fields=["email_verified", "is_active"])
 
     # Login and return response (e.g., tokens or session)
-    response = handle_login(request, account)
-
-    # Delete used code
-    if email != "johndoe@gmail.com" or not auth_config.is_testing:
-        access_instance.delete()
-
-    return response
+    return handle_login(request, account)
@@ -0,0 +1,28 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from dj_waanverse_auth.services.metrics import get_metrics_sink
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """
+    Export the auth metrics in the Prometheus text format.
+
+    Only available with a sink that can render them, such as
+    ``InMemoryMetricsSink``. Restricted to staff users; route it behind your
+    own scraper authentication if needed.
+    """
+    render = getattr(get_metrics_sink(), "render_prometheus", None)
+    if render is None:
+        return Response(
+            {"detail": "Metrics are not enabled."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return HttpResponse(render(), content_type=PROMETHEUS_CONTENT_TYPE)
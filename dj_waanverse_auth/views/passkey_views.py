@@ -1,33 +1,43 @@
-import json
 import base64
-from webauthn import (
-    generate_registration_options,
-    verify_registration_response,
-    options_to_json,
-)
-from webauthn.helpers.structs import (
-    UserVerificationRequirement,
-    PublicKeyCredentialDescriptor,
-)
+from webauthn import verify_registration_response
 
 from dj_waanverse_auth import settings
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
 from rest_framework import status
-from logging import getLogger
 from dj_waanverse_auth.models import Passkey
-from webauthn import generate_authentication_options
+from dj_waanverse_auth.serializers import PasskeySerializer
+from dj_waanverse_auth.services.challenge_store import get_challenge_store
+from dj_waanverse_auth.services.metrics import instrument_view
+from dj_waanverse_auth.services.tracing import get_tracer
 from webauthn import verify_authentication_response
+from django.core.exceptions import ImproperlyConfigured
+from dj_waanverse_auth.utils.logging_utils import EventLogger
 from dj_waanverse_auth.utils.login import handle_login
-
-from django.contrib.auth import get_user_model
-
-Account = get_user_model()
+from dj_waanverse_auth.utils.pagination_utils import (
+    InvalidCursor,
+    get_page_size,
+    keyset_paginate,
+)
+from dj_waanverse_auth.utils.webauthin import (
+    build_authentication_options,
+    build_registration_options,
+    get_allowed_credential_ids,
+    get_relying_party,
+    invalidate_allowed_credential_ids,
+)
+from dj_waanverse_auth.throttling import (
+    PasskeyLoginBeginRateThrottle,
+    PasskeyLoginCompleteRateThrottle,
+)
 
 
-logger = getLogger(__name__)
+log = EventLogger(__name__)
 
 
 # Helper to decode bytes from frontend
@@ -35,52 +45,43 @@ def base64url_decode(data):
     return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
 
 
+def _webauthn_not_configured():
+    log.error("webauthn_not_configured")
+    return Response(
+        {"detail": "Webauthn domain or name not configured."},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def register_begin(request):
     user = request.user
 
-    rp_id = settings.webauthn_domain
-    rp_name = settings.webauthn_rp_name
-
-    rp_origin = settings.webauthn_origin
-
-    if not rp_id or not rp_name or not rp_origin:
-        logger.error("Webauthn domain or name not configured.")
-        return Response(
-            {"detail": "Webauthn domain or name not configured."},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
+    try:
+        rp = get_relying_party()
+    except ImproperlyConfigured:
+        return _webauthn_not_configured()
 
-    existing_keys = Passkey.objects.filter(user=user)
-    exclude_list = [
-        PublicKeyCredentialDescriptor(id=pk.credential_id) for pk in existing_keys
-    ]
+    existing_credential_ids = Passkey.objects.filter(user=user).values_list(
+        "credential_id", flat=True
+    )
 
     # 1. Generate options
-    options = generate_registration_options(
-        rp_id=rp_id,
-        rp_name=rp_name,
+    challenge, response_data = build_registration_options(
+        rp,
         user_id=str(user.id).encode(),
         user_name=user.username,
-        user_display_name=user.username,
-        exclude_credentials=exclude_list,
+        exclude_credential_ids=existing_credential_ids,
     )
 
-    # 2. Encode the challenge to Base64
-    challenge_b64 = base64.b64encode(options.challenge).decode("utf-8")
-
-    # 3. Cryptographically sign the challenge
-    # This ensures the frontend cannot tamper with it
-    signer = TimestampSigner()
-    signed_challenge = signer.sign(challenge_b64)
-
-    # 4. Prepare response
-    response_data = json.loads(options_to_json(options))
+    # 2. Store the challenge server-side under a single-use opaque id
+    challenge_token = get_challenge_store().issue(
+        challenge, purpose="register", user_id=user.id
+    )
 
-    # Add the signed challenge to the response data
-    # The frontend MUST send this back in the next step
-    response_data["challenge_token"] = signed_challenge
+    # The frontend MUST send the challenge token back in the next step
+    response_data["challenge_token"] = challenge_token
 
     return Response(response_data, status=status.HTTP_200_OK)
 
@@ -89,42 +90,38 @@ def register_begin(request):
 @permission_classes([IsAuthenticated])
 def register_complete(request):
     try:
-        signed_challenge = request.data.get("challenge_token")
+        challenge_token = request.data.get("challenge_token")
 
-        if not signed_challenge:
+        if not challenge_token:
             return Response(
                 {"detail": "Missing challenge_token"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        signer = TimestampSigner()
-        try:
-            original_challenge_b64 = signer.unsign(signed_challenge, max_age=120)
-        except SignatureExpired:
+        expected_challenge_bytes = get_challenge_store().consume(
+            challenge_token, purpose="register", user_id=request.user.id
+        )
+        if expected_challenge_bytes is None:
             return Response(
                 {"detail": "Registration timed out. Please try again."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        except BadSignature:
-            return Response(
-                {"detail": "Invalid challenge signature."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
 
-        expected_challenge_bytes = base64.b64decode(original_challenge_b64)
-
-        verification = verify_registration_response(
-            credential=request.data,
-            expected_challenge=expected_challenge_bytes,
-            expected_origin=settings.webauthn_origin,
-            expected_rp_id=settings.webauthn_domain,
-            require_user_verification=True,
-        )
+        rp = get_relying_party()
+        with get_tracer().span("passkey.verify_registration"):
+            verification = verify_registration_response(
+                credential=request.data,
+                expected_challenge=expected_challenge_bytes,
+                expected_origin=rp.origin,
+                expected_rp_id=rp.id,
+                require_user_verification=True,
+            )
 
         # -----------------------------------------------------------
         # 4. CHECK IF ALREADY EXISTS (Optional safety)
         # -----------------------------------------------------------
         # If the user tries to register the same device twice
-        if Passkey.objects.filter(credential_id=verification.credential_id).exists():
+        credential_id_hash = Passkey.hash_credential_id(verification.credential_id)
+        if Passkey.objects.filter(credential_id_hash=credential_id_hash).exists():
             return Response(
                 {"detail": "This passkey is already registered."}, status=400
             )
@@ -138,6 +135,7 @@ def register_complete(request):
             public_key=verification.credential_public_key,
             sign_count=verification.sign_count,
         )
+        invalidate_allowed_credential_ids(request.user.email_address)
 
         return Response(
             {"status": "created", "message": "Passkey added successfully!"},
@@ -145,95 +143,123 @@ def register_complete(request):
         )
 
     except Exception as e:
-        logger.error(f"WebAuthn Error: {e}")
+        log.error("passkey_register_error", user_id=request.user.pk, error=e)
         return Response({"detail": f"Registration failed: {str(e)}"}, status=400)
 
 
+@instrument_view("passkey_login_begin")
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([PasskeyLoginBeginRateThrottle])
 def login_begin(request):
+    """
+    Start a passkey login.
+
+    By default this is the usernameless flow: no allow-list is sent, the
+    authenticator offers its discoverable credentials and no database access
+    is needed. With WEBAUTHN_EMAIL_HINT_ENABLED an ``email_address`` narrows
+    the allowed credentials using a cached allow-list.
+
+    Passkeys registered before resident keys were required may not be
+    discoverable, so when an ``email_address`` is sent without the email hint
+    enabled, the allow-list still lists those passkeys of the account.
+    """
     email_address = request.data.get("email_address")
 
-    user_passkeys = []
-    if email_address:
-        try:
-            user = Account.objects.get(email_address=email_address)
-            for pk in Passkey.objects.filter(user=user):
-                user_passkeys.append(PublicKeyCredentialDescriptor(id=pk.credential_id))
-        except Account.DoesNotExist:
-            pass
-
-    options = generate_authentication_options(
-        rp_id=settings.webauthn_domain,
-        allow_credentials=user_passkeys,
-        user_verification=UserVerificationRequirement.PREFERRED,
-    )
+    try:
+        rp = get_relying_party()
+    except ImproperlyConfigured:
+        return _webauthn_not_configured()
+
+    allowed_credential_ids = []
+    if isinstance(email_address, str) and email_address.strip():
+        allowed_credential_ids = get_allowed_credential_ids(
+            email_address, legacy_only=not settings.webauthn_email_hint_enabled
+        )
 
-    signer = TimestampSigner()
-    challenge_b64 = base64.b64encode(options.challenge).decode("utf-8")
-    signed_challenge = signer.sign(challenge_b64)
+    challenge, response_data = build_authentication_options(
+        rp, allow_credential_ids=allowed_credential_ids
+    )
 
-    response_data = json.loads(options_to_json(options))
-    response_data["challenge_token"] = signed_challenge
+    challenge_token = get_challenge_store().issue(challenge, purpose="login")
+    response_data["challenge_token"] = challenge_token
 
     return Response(response_data, status=status.HTTP_200_OK)
 
 
+def _has_user_handle(credential) -> bool:
+    response = credential.get("response")
+    return isinstance(response, dict) and bool(response.get("userHandle"))
+
+
+@instrument_view("passkey_login_complete")
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([PasskeyLoginCompleteRateThrottle])
 def login_complete(request):
     try:
-        # 1. Get Signed Challenge
-        signed_challenge = request.data.get("challenge_token")
-        if not signed_challenge:
+        # 1. Get Challenge Token
+        challenge_token = request.data.get("challenge_token")
+        if not challenge_token:
             return Response(
                 {"detail": "Missing challenge_token"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 2. Unsign Challenge
-        signer = TimestampSigner()
-        try:
-            original_challenge_b64 = signer.unsign(signed_challenge, max_age=120)
-        except (SignatureExpired, BadSignature):
+        # 2. Consume the stored challenge (single use)
+        expected_challenge = get_challenge_store().consume(
+            challenge_token, purpose="login"
+        )
+        if expected_challenge is None:
             return Response(
                 {"detail": "Login timed out or invalid session"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        expected_challenge = base64.b64decode(original_challenge_b64)
-
         # 3. Find the Passkey in DB
         # The browser sends the Credential ID as 'id' (base64url encoded)
         credential_id = request.data.get("id")
 
-        # We need to find which Passkey object matches this ID
-        # Note: Depending on how your DB stores BinaryField, you might need to decode 'id' first
-        # But usually, we can iterate or filter.
-        # For efficiency, let's decode the incoming ID to bytes to search the DB.
+        # Passkeys are looked up through the fixed-width digest of the raw
+        # credential id, which has a unique index.
         credential_id_bytes = base64.urlsafe_b64decode(credential_id + "==")
 
         try:
-            passkey = Passkey.objects.get(credential_id=credential_id_bytes)
+            passkey = Passkey.objects.select_related("user").get(
+                credential_id_hash=Passkey.hash_credential_id(credential_id_bytes)
+            )
         except Passkey.DoesNotExist:
             return Response(
                 {"detail": "Unknown passkey"}, status=status.HTTP_400_BAD_REQUEST
             )
 
         # 4. Verify Signature
-        verification = verify_authentication_response(
-            credential=request.data,
-            expected_challenge=expected_challenge,
-            expected_origin=settings.webauthn_origin,
-            expected_rp_id=settings.webauthn_domain,
-            credential_public_key=passkey.public_key,
-            credential_current_sign_count=passkey.sign_count,
-        )
+        rp = get_relying_party()
+        with get_tracer().span("passkey.verify_authentication"):
+            verification = verify_authentication_response(
+                credential=request.data,
+                expected_challenge=expected_challenge,
+                expected_origin=rp.origin,
+                expected_rp_id=rp.id,
+                credential_public_key=passkey.public_key,
+                credential_current_sign_count=passkey.sign_count,
+            )
 
         # 5. Update Sign Count (Replay attack protection)
-        passkey.sign_count = verification.new_sign_count
-        passkey.save()
+        # The conditional update rejects a concurrent assertion that was
+        # verified against the same, now stale, sign count.
+        if not passkey.record_use(verification.new_sign_count):
+            log.warning(
+                "passkey_sign_count_stale", passkey_id=passkey.pk, user_id=passkey.user_id
+            )
+            return Response({"detail": "Login failed"}, status=400)
+
+        # 6. A user handle in the assertion proves the credential is resident,
+        # so a legacy passkey no longer needs the email-hinted allow-list.
+        if not passkey.discoverable and _has_user_handle(request.data):
+            Passkey.objects.filter(pk=passkey.pk).update(discoverable=True)
+            invalidate_allowed_credential_ids(passkey.user.email_address)
 
-        # 6. LOGIN SUCCESSFUL!
+        # 7. LOGIN SUCCESSFUL!
         user = passkey.user
 
         response = handle_login(request=request, user=user)
@@ -241,5 +267,70 @@ def login_complete(request):
         return response
 
     except Exception as e:
-        logger.error(f"Login Error: {e}")
+        log.error("passkey_login_error", error=e)
         return Response({"detail": "Login failed"}, status=400)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def list_passkeys(request):
+    """
+    List the user's passkeys, newest first, with keyset pagination.
+    Only the listed columns are selected; the credential blobs never are.
+    """
+    passkeys = Passkey.objects.filter(user=request.user).values(
+        "id", "name", "created_at", "last_used_at"
+    )
+
+    try:
+        rows, next_cursor = keyset_paginate(
+            passkeys,
+            fields=("created_at", "id"),
+            cursor=request.query_params.get("cursor"),
+            page_size=get_page_size(request),
+        )
+    except InvalidCursor:
+        return Response(
+            {"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response(
+        {
+            "results": PasskeySerializer(rows, many=True).data,
+            "next_cursor": next_cursor,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["PATCH", "DELETE"])
+@permission_classes([IsAuthenticated])
+def passkey_detail(request, passkey_id):
+    """
+    Rename (PATCH) or delete (DELETE) one of the user's passkeys, each with a
+    single statement scoped to the owner.
+    """
+    passkeys = Passkey.objects.filter(pk=passkey_id, user=request.user)
+
+    if request.method == "DELETE":
+        deleted, _ = passkeys.delete()
+        if not deleted:
+            return Response(
+                {"detail": "Passkey not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        invalidate_allowed_credential_ids(request.user.email_address)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    serializer = PasskeySerializer(data=request.data, partial=True)
+    serializer.is_valid(raise_exception=True)
+    name = serializer.validated_data.get("name")
+    if not name:
+        return Response(
+            {"detail": "Name is required."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not passkeys.update(name=name):
+        return Response(
+            {"detail": "Passkey not found."}, status=status.HTTP_404_NOT_FOUND
+        )
+    return Response({"id": passkey_id, "name": name}, status=status.HTTP_200_OK)
@@ -1,10 +1,15 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from dj_waanverse_auth import settings as auth_config
+from dj_waanverse_auth.throttling import SignupRateThrottle
 from django.contrib.auth import get_user_model
 from logging import getLogger
 
@@ -13,6 +18,7 @@ logger = getLogger(__name__)
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([SignupRateThrottle])
 def signup_view(request):
     if auth_config.disable_signup:
         return Response(
@@ -1,3 +1,5 @@
+import re
+
 import jwt
 from django.urls import reverse
 from dj_waanverse_auth import settings
@@ -5,6 +7,7 @@ from rest_framework import status
 from datetime import datetime, timezone
 from django.contrib.auth import get_user_model
 from dj_waanverse_auth.models import AccessCode
+from django.core import mail
 from django.test import TestCase
 from dj_waanverse_auth.utils.token_utils import decode_token
 from dj_waanverse_auth.models import UserSession
@@ -27,7 +30,8 @@ class AuthenticationFlowTests(TestCase):
         self.client.post(self.login_url, {"email_address": email})
 
         access_code = AccessCode.objects.get(email_address=email)
-        code = access_code.code
+        code = re.search(r"\d{6}", mail.outbox[-1].body).group()
+        self.assertTrue(access_code.check_code(code))
 
         # Step 2: Submit code for login
         response = self.client.post(
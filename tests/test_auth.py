@@ -38,7 +38,7 @@ class AuthTests(APITestCase):
         """User can log out successfully."""
         AccessCode.objects.create(
             email_address="test@example.com",
-            code="123456",
+            code_hash=AccessCode.hash_code("123456"),
             expires_at=timezone.now() + timezone.timedelta(minutes=10),
         )
         response = self.client.post(
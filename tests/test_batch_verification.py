@@ -0,0 +1,106 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from dj_waanverse_auth.models import UserSession
+from dj_waanverse_auth.services.tracing import InMemoryTracer
+from dj_waanverse_auth.utils.session_utils import validate_sessions
+from dj_waanverse_auth.utils.token_utils import (
+    decode_tokens,
+    encode_token,
+    verified_token_cache,
+)
+
+Account = get_user_model()
+
+
+def make_token(**claims):
+    now = int(timezone.now().timestamp())
+    return encode_token(
+        {"id": 1, "sid": 1, "iss": "test", "iat": now, "exp": now + 300, **claims}
+    )
+
+
+class DecodeTokensTests(TestCase):
+    def setUp(self):
+        verified_token_cache.clear()
+        self.addCleanup(verified_token_cache.clear)
+
+    def test_returns_a_result_per_distinct_token(self):
+        first, second = make_token(sid=1), make_token(sid=2)
+        expired = make_token(iat=1700000000, exp=1700000300)
+
+        results = decode_tokens([first, "garbage", second, first, expired, ""])
+
+        self.assertEqual(list(results), [first, "garbage", second, expired, ""])
+        self.assertEqual(results[first].payload["sid"], 1)
+        self.assertEqual(results[second].payload["sid"], 2)
+        self.assertFalse(results["garbage"].is_valid)
+        self.assertEqual(results[expired].error, "Token has expired")
+        self.assertEqual(results[""].error, "No token provided")
+
+    def test_verified_tokens_are_cached(self):
+        token = make_token()
+        decode_tokens([token])
+
+        with patch("dj_waanverse_auth.utils.token_utils.decode_token") as decode:
+            result = decode_tokens([token])[token]
+        decode.assert_not_called()
+        self.assertTrue(result.is_valid)
+
+    def test_cache_expires_with_the_token(self):
+        token = make_token()
+        payload = decode_tokens([token])[token].payload
+
+        self.assertIsNone(verified_token_cache.get(token, now=payload["exp"]))
+
+    def test_cache_can_be_disabled(self):
+        token = make_token()
+        with patch("dj_waanverse_auth.settings.verified_token_cache_size", 0):
+            decode_tokens([token])
+
+        self.assertIsNone(verified_token_cache.get(token))
+
+    def test_parallel_verification_keeps_spans_nested(self):
+        tracer = InMemoryTracer()
+        with patch("dj_waanverse_auth.services.tracing._tracer", tracer):
+            decode_tokens([make_token(sid=sid) for sid in range(4)])
+
+        (batch,) = tracer.get_spans("auth.token.verify_batch")
+        verify_spans = tracer.get_spans("auth.token.verify")
+        self.assertEqual(len(verify_spans), 4)
+        self.assertTrue(all(span.parent is batch for span in verify_spans))
+
+
+class ValidateSessionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="batch@example.com", username="batchuser", is_active=True
+        )
+        self.active = UserSession.objects.create(account=self.user)
+        self.inactive = UserSession.objects.create(account=self.user, is_active=False)
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            valid = validate_sessions([self.active.id, self.inactive.id, 999999])
+
+        self.assertEqual(valid, {self.active.id})
+
+    def test_touch_updates_last_used(self):
+        stale = timezone.now() - timedelta(days=1)
+        UserSession.objects.filter(id=self.active.id).update(last_used=stale)
+
+        with self.assertNumQueries(2):
+            validate_sessions([self.active.id], touch=True)
+
+        self.active.refresh_from_db()
+        self.assertGreater(self.active.last_used, stale)
+
+    def test_empty_input(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(validate_sessions([]), set())
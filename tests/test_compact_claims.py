@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+import jwt
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth import settings as auth_settings
+from dj_waanverse_auth.models import UserSession
+from dj_waanverse_auth.services.token_classes import RefreshToken
+from dj_waanverse_auth.utils.token_utils import decode_token, encode_token, get_key
+
+Account = get_user_model()
+
+
+def use_compact_profile(test_case, **overrides):
+    for name, value in {"token_claim_profile": "compact", **overrides}.items():
+        patcher = patch(f"dj_waanverse_auth.settings.{name}", value)
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
+
+def raw_claims(token):
+    return jwt.decode(token, options={"verify_signature": False})
+
+
+class CompactClaimsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="compact@example.com", username="compactuser", is_active=True
+        )
+
+    def test_compact_tokens_decode_to_standard_claims(self):
+        standard = RefreshToken.for_user(self.user, session_id=7)
+        standard_access_token = standard.access_token
+        use_compact_profile(self)
+        compact = RefreshToken.for_user(self.user, session_id=7)
+
+        self.assertEqual(
+            set(raw_claims(compact.access_token)), {"u", "s", "exp", "iat", "iss"}
+        )
+        self.assertEqual(raw_claims(str(compact))["t"], 2)
+        self.assertEqual(raw_claims(str(compact))["iss"], "1")
+        self.assertLess(len(compact.access_token), len(standard_access_token))
+        self.assertLess(len(str(compact)), len(str(standard)))
+
+        self.assertEqual(decode_token(str(compact)), compact.payload())
+        access_claims = decode_token(compact.access_token)
+        self.assertEqual(access_claims["token_type"], "access")
+        self.assertEqual(access_claims["gen"], 0)
+        self.assertEqual(access_claims["iss"], auth_settings.platform_name)
+
+    def test_both_profiles_are_accepted(self):
+        standard_token = RefreshToken.for_user(self.user, session_id=7).access_token
+        use_compact_profile(self)
+
+        self.assertEqual(decode_token(standard_token)["sid"], 7)
+
+    def test_defaults_can_be_kept(self):
+        use_compact_profile(self, compact_token_omit_defaults=False)
+        access_token = RefreshToken.for_user(self.user, session_id=7).access_token
+
+        self.assertEqual(raw_claims(access_token)["t"], 1)
+        self.assertEqual(raw_claims(access_token)["g"], 0)
+
+    def test_session_claim_is_required(self):
+        token = jwt.encode(
+            {"u": 1, "iss": "1", "iat": 1700000000, "exp": 4000000000},
+            get_key("private"),
+            algorithm="RS256",
+        )
+        with self.assertRaisesMessage(
+            exceptions.AuthenticationFailed, "Missing required claim in token"
+        ):
+            decode_token(token)
+
+    def test_foreign_issuers_are_kept(self):
+        use_compact_profile(self)
+        token = encode_token(
+            {"id": 1, "sid": 2, "iss": "other", "iat": 1700000000, "exp": 4000000000}
+        )
+
+        self.assertEqual(raw_claims(token)["iss"], "other")
+        self.assertEqual(decode_token(token)["iss"], "other")
+
+
+class CompactTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        use_compact_profile(self)
+        self.user = Account.objects.create_user(
+            email_address="compactauth@example.com",
+            username="compactauthuser",
+            is_active=True,
+        )
+        session = UserSession.objects.create(account=self.user)
+        self.refresh = RefreshToken.for_user(self.user, session_id=session.id)
+
+    def test_authenticates_and_refreshes(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+        response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.credentials()
+        response = self.client.post(
+            reverse("dj_waanverse_auth_refresh_token"),
+            {"refresh_token": str(self.refresh)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
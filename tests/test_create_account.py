@@ -1,3 +1,5 @@
+import re
+
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
@@ -48,8 +50,10 @@ class SignupTests(APITestCase):
         self.assertTrue(
             AccessCode.objects.filter(email_address="new@gmail.com").exists()
         )
-        code = AccessCode.objects.get(email_address="new@gmail.com").code
-        self.assertIn(code, sent_mail.body)
+        code = re.search(r"\d{6}", sent_mail.body).group()
+        self.assertTrue(
+            AccessCode.objects.get(email_address="new@gmail.com").check_code(code)
+        )
 
     def test_invalid_email_format(self):
         """Reject invalid email formats."""
@@ -98,7 +102,7 @@ class SignupTests(APITestCase):
     def test_signup_and_authentication(self):
         AccessCode.objects.all().delete()
         self.client.post(self.signup_url, {"email_address": "test@gmail.com"})
-        access_code = AccessCode.objects.get(email_address="test@gmail.com").code
+        access_code = re.search(r"\d{6}", mail.outbox[-1].body).group()
 
         response = self.client.post(
             self.signup_url, {"email_address": "test@gmail.com", "code": access_code}
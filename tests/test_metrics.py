@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth.models import UserSession
+from dj_waanverse_auth.services.metrics import (
+    InMemoryMetricsSink,
+    NullMetricsSink,
+    get_metrics_sink,
+)
+from dj_waanverse_auth.services.token_classes import RefreshToken
+
+Account = get_user_model()
+
+
+class MetricsSinkTests(SimpleTestCase):
+    def test_null_sink_is_the_default(self):
+        self.assertIsInstance(get_metrics_sink(), NullMetricsSink)
+
+    def test_histogram_buckets_and_prometheus_output(self):
+        sink = InMemoryMetricsSink(buckets=(0.001, 0.01))
+        labels = (("stage", "verify"),)
+        sink.observe("latency_seconds", 0.0005, labels)
+        sink.observe("latency_seconds", 0.001, labels)
+        sink.observe("latency_seconds", 0.5, labels)
+        sink.increment("requests_total", labels=(("view", 'a"b'),))
+        sink.increment("requests_total", labels=(("view", 'a"b'),))
+
+        output = sink.render_prometheus()
+
+        self.assertIn("# TYPE requests_total counter", output)
+        self.assertIn('requests_total{view="a\\"b"} 2', output)
+        self.assertIn("# TYPE latency_seconds histogram", output)
+        self.assertIn('latency_seconds_bucket{stage="verify",le="0.001"} 2', output)
+        self.assertIn('latency_seconds_bucket{stage="verify",le="0.01"} 2', output)
+        self.assertIn('latency_seconds_bucket{stage="verify",le="+Inf"} 3', output)
+        self.assertIn('latency_seconds_count{stage="verify"} 3', output)
+
+
+class AuthenticationMetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.sink = InMemoryMetricsSink()
+        patcher = patch("dj_waanverse_auth.services.metrics._metrics_sink", self.sink)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = Account.objects.create_user(
+            email_address="metrics@example.com",
+            username="metricsuser",
+            is_active=True,
+            is_staff=True,
+        )
+        session = UserSession.objects.create(account=self.user)
+        self.refresh = RefreshToken.for_user(self.user, session_id=session.id)
+
+    def test_authenticate_records_stages_and_outcome(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+        self.client.get(reverse("dj_waanverse_auth_me"))
+
+        snapshot = self.sink.snapshot()
+        self.assertEqual(
+            snapshot["counters"][
+                ("waanverse_auth_authenticate_total", (("outcome", "success"),))
+            ],
+            1,
+        )
+        stages = {
+            dict(labels)["stage"]
+            for name, labels in snapshot["histograms"]
+            if name == "waanverse_auth_authenticate_stage_seconds"
+        }
+        self.assertEqual(stages, {"extract", "verify", "session", "user"})
+
+    def test_view_outcomes_are_counted_by_status(self):
+        url = reverse("dj_waanverse_auth_refresh_token")
+        self.client.post(url, {"refresh_token": str(self.refresh)}, format="json")
+        self.client.post(url, {"refresh_token": "invalid"}, format="json")
+
+        counters = self.sink.snapshot()["counters"]
+        for status_code in ("200", "401"):
+            key = (
+                "waanverse_auth_view_requests_total",
+                (("view", "refresh"), ("status", status_code)),
+            )
+            self.assertEqual(counters[key], 1)
+
+    def test_metrics_view_exports_prometheus_text(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+        response = self.client.get(reverse("dj_waanverse_auth_metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            "waanverse_auth_authenticate_stage_seconds_bucket", response.content.decode()
+        )
+
+    def test_metrics_view_requires_staff(self):
+        response = self.client.get(reverse("dj_waanverse_auth_metrics"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
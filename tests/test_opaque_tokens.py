@@ -0,0 +1,139 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth.models import OpaqueAccessToken, UserSession
+from dj_waanverse_auth.services.opaque_tokens import (
+    OPAQUE_TOKEN_PREFIX,
+    resolve_opaque_token,
+)
+from dj_waanverse_auth.services.token_classes import RefreshToken
+from dj_waanverse_auth.services.tracing import InMemoryTracer
+from dj_waanverse_auth.utils.session_utils import revoke_all_sessions
+from dj_waanverse_auth.utils.token_utils import verified_token_cache
+
+Account = get_user_model()
+
+
+class OpaqueAccessTokenTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        verified_token_cache.clear()
+        self.addCleanup(verified_token_cache.clear)
+        patcher = patch("dj_waanverse_auth.settings.access_token_format", "opaque")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = Account.objects.create_user(
+            email_address="opaque@example.com", username="opaqueuser", is_active=True
+        )
+        self.session = UserSession.objects.create(account=self.user)
+        self.refresh = RefreshToken.for_user(self.user, session_id=self.session.id)
+        self.token = self.refresh.access_token
+
+    def resolve_source(self):
+        tracer = InMemoryTracer()
+        with patch("dj_waanverse_auth.services.tracing._tracer", tracer):
+            claims = resolve_opaque_token(self.token)
+        (span,) = tracer.get_spans("auth.token.resolve_opaque")
+        return claims, span.attributes["token.source"]
+
+    def test_issues_short_references(self):
+        self.assertTrue(self.token.startswith(OPAQUE_TOKEN_PREFIX))
+        self.assertLess(len(self.token), 64)
+        self.assertEqual(OpaqueAccessToken.objects.count(), 1)
+        self.assertNotEqual(OpaqueAccessToken.objects.get().token_hash, self.token)
+
+    def test_lookup_falls_back_from_local_to_cache_to_database(self):
+        claims, source = self.resolve_source()
+        self.assertEqual(source, "local")
+        self.assertEqual(claims["token_type"], "access")
+        self.assertEqual(claims["sid"], self.session.id)
+
+        verified_token_cache.clear()
+        self.assertEqual(self.resolve_source()[1], "cache")
+
+        verified_token_cache.clear()
+        cache.clear()
+        self.assertEqual(self.resolve_source()[1], "database")
+        verified_token_cache.clear()
+        self.assertEqual(self.resolve_source()[1], "cache")
+
+    def test_authenticates_requests(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {OPAQUE_TOKEN_PREFIX}x")
+        response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_applies(self):
+        revoke_all_sessions(self.user)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_rows_are_purged(self):
+        OpaqueAccessToken.objects.update(expires_at="2000-01-01T00:00:00Z")
+
+        call_command("manage_sessions", stdout=StringIO())
+
+        self.assertFalse(OpaqueAccessToken.objects.exists())
+
+
+class IntrospectionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        verified_token_cache.clear()
+        self.addCleanup(verified_token_cache.clear)
+        self.user = Account.objects.create_user(
+            email_address="owner@example.com", username="owneruser", is_active=True
+        )
+        session = UserSession.objects.create(account=self.user)
+        self.refresh = RefreshToken.for_user(self.user, session_id=session.id)
+        service = Account.objects.create_user(
+            email_address="service@example.com",
+            username="serviceuser",
+            is_active=True,
+            is_staff=True,
+        )
+        self.client.force_authenticate(service)
+        self.url = reverse("dj_waanverse_auth_introspect_token")
+
+    def introspect(self, token):
+        return self.client.post(self.url, {"token": token}, format="json")
+
+    def test_introspects_both_formats(self):
+        jwt_response = self.introspect(self.refresh.access_token)
+        with patch("dj_waanverse_auth.settings.access_token_format", "opaque"):
+            opaque_token = RefreshToken(str(self.refresh)).access_token
+        opaque_response = self.introspect(opaque_token)
+
+        for response in (jwt_response, opaque_response):
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.data["active"])
+            self.assertEqual(response.data["id"], self.user.id)
+
+    def test_inactive_tokens(self):
+        self.assertEqual(self.introspect("garbage").data, {"active": False})
+
+        token = self.refresh.access_token
+        revoke_all_sessions(self.user)
+        self.assertEqual(self.introspect(token).data, {"active": False})
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(self.user)
+        response = self.introspect(self.refresh.access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requires_a_token(self):
+        response = self.client.post(self.url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,272 @@
+import base64
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth.models import Passkey
+from dj_waanverse_auth.services.challenge_store import (
+    CacheChallengeStore,
+    InMemoryChallengeStore,
+)
+
+Account = get_user_model()
+
+CREDENTIAL_ID = b"credential-id-bytes"
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class ChallengeStoreTests(APITestCase):
+    def _check_single_use(self, store):
+        token = store.issue(b"challenge", purpose="login")
+
+        self.assertEqual(store.consume(token, purpose="login"), b"challenge")
+        self.assertIsNone(store.consume(token, purpose="login"))
+
+    def test_in_memory_store_is_single_use(self):
+        self._check_single_use(InMemoryChallengeStore())
+
+    def test_cache_store_is_single_use(self):
+        self._check_single_use(CacheChallengeStore())
+
+    def test_challenge_is_bound_to_purpose_and_user(self):
+        store = InMemoryChallengeStore()
+
+        token = store.issue(b"challenge", purpose="register", user_id=1)
+        self.assertIsNone(store.consume(token, purpose="login"))
+
+        token = store.issue(b"challenge", purpose="register", user_id=1)
+        self.assertIsNone(store.consume(token, purpose="register", user_id=2))
+
+
+class PasskeyLoginTests(APITestCase):
+    def setUp(self):
+        self.user = Account.objects.create_user(
+            email_address="passkey@example.com", username="passkeyuser", is_active=True
+        )
+        self.passkey = Passkey.objects.create(
+            user=self.user,
+            credential_id=CREDENTIAL_ID,
+            public_key=b"public-key",
+            sign_count=1,
+        )
+        self.begin_url = reverse("dj_waanverse_auth_passkey_login")
+        self.complete_url = reverse("dj_waanverse_auth_passkey_login_complete")
+
+    def _begin(self):
+        response = self.client.post(self.begin_url, {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["challenge_token"]
+
+    def _complete(self, challenge_token, new_sign_count=2, **credential):
+        verification = SimpleNamespace(new_sign_count=new_sign_count)
+        with patch(
+            "dj_waanverse_auth.views.passkey_views.verify_authentication_response",
+            return_value=verification,
+        ):
+            return self.client.post(
+                self.complete_url,
+                {
+                    "id": _b64url(CREDENTIAL_ID),
+                    "challenge_token": challenge_token,
+                    **credential,
+                },
+                format="json",
+            )
+
+    def test_usernameless_login_begin_needs_no_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.post(self.begin_url, {})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data.get("allowCredentials", []), [])
+
+    def test_login_begin_lists_only_legacy_passkeys(self):
+        cache.clear()
+        legacy_id = b"legacy-credential-id"
+        Passkey.objects.create(
+            user=self.user,
+            credential_id=legacy_id,
+            public_key=b"public-key",
+            discoverable=False,
+        )
+
+        response = self.client.post(
+            self.begin_url, {"email_address": "passkey@example.com"}
+        )
+
+        self.assertEqual(
+            [c["id"] for c in response.data["allowCredentials"]],
+            [_b64url(legacy_id)],
+        )
+
+    def test_resident_login_removes_a_legacy_passkey_from_the_allow_list(self):
+        cache.clear()
+        Passkey.objects.filter(pk=self.passkey.pk).update(discoverable=False)
+        self.client.post(self.begin_url, {"email_address": "passkey@example.com"})
+
+        response = self._complete(
+            self._begin(), response={"userHandle": _b64url(b"user-handle")}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.passkey.refresh_from_db()
+        self.assertTrue(self.passkey.discoverable)
+        response = self.client.post(
+            self.begin_url, {"email_address": "passkey@example.com"}
+        )
+        self.assertEqual(response.data.get("allowCredentials", []), [])
+
+    def test_login_without_user_handle_keeps_a_legacy_passkey(self):
+        Passkey.objects.filter(pk=self.passkey.pk).update(discoverable=False)
+
+        response = self._complete(self._begin(), response={"userHandle": None})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.passkey.refresh_from_db()
+        self.assertFalse(self.passkey.discoverable)
+
+    @patch("dj_waanverse_auth.settings.webauthn_email_hint_enabled", True)
+    def test_email_hinted_login_begin_uses_cached_allow_list(self):
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                self.begin_url, {"email_address": "passkey@example.com"}
+            )
+        self.assertEqual(
+            [c["id"] for c in response.data["allowCredentials"]],
+            [_b64url(CREDENTIAL_ID)],
+        )
+
+        with self.assertNumQueries(0):
+            self.client.post(self.begin_url, {"email_address": "passkey@example.com"})
+
+    def test_login_complete(self):
+        response = self._complete(self._begin())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access_token", response.data)
+        self.passkey.refresh_from_db()
+        self.assertEqual(self.passkey.sign_count, 2)
+        self.assertIsNotNone(self.passkey.last_used_at)
+
+    def test_login_complete_query_count(self):
+        """
+        One query for the passkey and its user, one conditional sign count
+        update, then last_login and the new session in handle_login.
+        """
+        challenge_token = self._begin()
+
+        with self.assertNumQueries(4):
+            response = self._complete(challenge_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stale_sign_count_is_rejected(self):
+        Passkey.objects.filter(pk=self.passkey.pk).update(sign_count=5)
+
+        response = self._complete(self._begin(), new_sign_count=5)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_challenge_cannot_be_replayed(self):
+        challenge_token = self._begin()
+        self.assertEqual(
+            self._complete(challenge_token).status_code, status.HTTP_200_OK
+        )
+
+        response = self._complete(challenge_token, new_sign_count=3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PasskeyManagementTests(APITestCase):
+    def setUp(self):
+        self.user = Account.objects.create_user(
+            email_address="manage@example.com", username="manageuser"
+        )
+        self.other_user = Account.objects.create_user(
+            email_address="other@example.com", username="otheruser"
+        )
+        self.passkeys = [
+            Passkey.objects.create(
+                user=self.user,
+                name=f"Key {i}",
+                credential_id=f"credential-{i}".encode(),
+                public_key=b"public-key",
+            )
+            for i in range(5)
+        ]
+        self.other_passkey = Passkey.objects.create(
+            user=self.other_user,
+            credential_id=b"other-credential",
+            public_key=b"public-key",
+        )
+        self.list_url = reverse("dj_waanverse_auth_passkeys")
+        self.client.force_authenticate(user=self.user)
+
+    def _detail_url(self, passkey):
+        return reverse(
+            "dj_waanverse_auth_passkey_detail", kwargs={"passkey_id": passkey.pk}
+        )
+
+    def test_list_is_keyset_paginated_without_blobs(self):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"page_size": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(self.list_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages += 1
+
+            for row in response.data["results"]:
+                self.assertEqual(
+                    set(row), {"id", "name", "created_at", "last_used_at"}
+                )
+                seen.append(row["id"])
+
+            cursor = response.data["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [p.pk for p in reversed(self.passkeys)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rename_passkey(self):
+        response = self.client.patch(
+            self._detail_url(self.passkeys[0]), {"name": "Laptop"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.passkeys[0].refresh_from_db()
+        self.assertEqual(self.passkeys[0].name, "Laptop")
+
+    def test_delete_passkey(self):
+        response = self.client.delete(self._detail_url(self.passkeys[0]))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Passkey.objects.filter(pk=self.passkeys[0].pk).exists())
+
+    def test_cannot_manage_other_users_passkeys(self):
+        response = self.client.patch(
+            self._detail_url(self.other_passkey), {"name": "Mine now"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.delete(self._detail_url(self.other_passkey))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Passkey.objects.filter(pk=self.other_passkey.pk).exists())
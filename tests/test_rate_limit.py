@@ -0,0 +1,178 @@
+import threading
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth.checks import check_rate_limit_cache
+from dj_waanverse_auth.config.settings import AuthConfig
+from dj_waanverse_auth.services.rate_limiter import (
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+    parse_rate,
+)
+from dj_waanverse_auth.throttling import reset_rate_limits
+
+
+class StaleReadCache:
+    """Cache whose first read in each thread waits until every thread has read."""
+
+    def __init__(self, backend, parties):
+        self._backend = backend
+        self._barrier = threading.Barrier(parties)
+        self._local = threading.local()
+
+    def get(self, *args, **kwargs):
+        value = self._backend.get(*args, **kwargs)
+        if not getattr(self._local, "waited", False):
+            self._local.waited = True
+            self._barrier.wait(timeout=5)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+
+class RateLimiterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/min"), (10, 60))
+        self.assertEqual(parse_rate("5/s"), (5, 1))
+        with self.assertRaises(ValueError):
+            parse_rate("ten per minute")
+
+    def test_sliding_window(self):
+        limiter = SlidingWindowLimiter("3/min")
+        now = 6000.0  # start of a window
+
+        for _ in range(3):
+            self.assertTrue(limiter.hit("key", now=now).allowed)
+
+        result = limiter.hit("key", now=now + 1)
+        self.assertFalse(result.allowed)
+        self.assertGreater(result.retry_after, 0)
+
+        # Other keys are unaffected.
+        self.assertTrue(limiter.hit("other", now=now + 1).allowed)
+
+    def test_token_bucket_refills(self):
+        limiter = TokenBucketLimiter("2/min")
+        now = 1000.0
+
+        self.assertTrue(limiter.hit("key", now=now).allowed)
+        self.assertTrue(limiter.hit("key", now=now).allowed)
+
+        result = limiter.hit("key", now=now)
+        self.assertFalse(result.allowed)
+        self.assertAlmostEqual(result.retry_after, 30.0)
+
+        self.assertTrue(limiter.hit("key", now=now + 31).allowed)
+
+    def test_token_bucket_concurrent_burst(self):
+        limiter = TokenBucketLimiter("2/min")
+        results = []
+
+        def hit():
+            results.append(limiter.hit("key", now=1000.0).allowed)
+
+        # Every request reads the empty bucket before any of them writes it.
+        with patch.object(TokenBucketLimiter, "cache", StaleReadCache(cache, 6)):
+            threads = [threading.Thread(target=hit) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(results), 6)
+        self.assertGreaterEqual(results.count(True), 1)
+        self.assertLessEqual(results.count(True), 2)
+
+
+@patch("dj_waanverse_auth.settings.rate_limit_enabled", True)
+class RateLimitedEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_rate_limits()
+        self.login_url = reverse("dj_waanverse_auth_login")
+
+    def tearDown(self):
+        reset_rate_limits()
+
+    @patch(
+        "dj_waanverse_auth.settings.rate_limits",
+        {"login": {"rate": "2/min", "algorithm": "sliding_window", "keys": ["ip"]}},
+    )
+    def test_login_is_throttled_with_retry_after(self):
+        for _ in range(2):
+            response = self.client.post(self.login_url, {})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.login_url, {})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response.headers)
+        self.assertGreaterEqual(int(response.headers["Retry-After"]), 1)
+
+    @patch(
+        "dj_waanverse_auth.settings.rate_limits",
+        {"login": {"rate": "1/min", "algorithm": "token_bucket", "keys": ["email"]}},
+    )
+    def test_login_is_throttled_per_email(self):
+        self.client.post(self.login_url, {"email_address": "a@example.com"})
+
+        response = self.client.post(self.login_url, {"email_address": "a@example.com"})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post(self.login_url, {"email_address": "b@example.com"})
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @patch(
+        "dj_waanverse_auth.settings.rate_limits",
+        {"login": {"rate": "1/min", "algorithm": "sliding_window", "keys": ["ip"]}},
+    )
+    def test_forwarded_for_is_ignored_from_untrusted_peers(self):
+        self.client.post(self.login_url, {}, HTTP_X_FORWARDED_FOR="10.0.0.1")
+
+        response = self.client.post(
+            self.login_url, {}, HTTP_X_FORWARDED_FOR="10.0.0.2"
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @patch("dj_waanverse_auth.settings.rate_limit_trusted_proxies", ["127.0.0.0/8"])
+    @patch(
+        "dj_waanverse_auth.settings.rate_limits",
+        {"login": {"rate": "1/min", "algorithm": "sliding_window", "keys": ["ip"]}},
+    )
+    def test_forwarded_for_is_read_from_trusted_proxies(self):
+        self.client.post(self.login_url, {}, HTTP_X_FORWARDED_FOR="1.1.1.1, 10.0.0.1")
+
+        # A spoofed leftmost entry does not change the key.
+        response = self.client.post(
+            self.login_url, {}, HTTP_X_FORWARDED_FOR="1.1.1.2, 10.0.0.1"
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post(self.login_url, {}, HTTP_X_FORWARDED_FOR="10.0.0.2")
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class RateLimitCacheCheckTests(SimpleTestCase):
+    @patch("dj_waanverse_auth.settings.rate_limit_enabled", True)
+    def test_warns_about_a_local_memory_cache(self):
+        (warning,) = check_rate_limit_cache(None)
+        self.assertEqual(warning.id, "dj_waanverse_auth.W001")
+
+    @patch("dj_waanverse_auth.settings.rate_limit_enabled", True)
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_shared_caches_pass(self):
+        self.assertEqual(check_rate_limit_cache(None), [])
+
+    def test_disabled_by_default(self):
+        self.assertFalse(AuthConfig({}).rate_limit_enabled)
+        self.assertEqual(check_rate_limit_cache(None), [])
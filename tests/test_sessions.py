@@ -0,0 +1,198 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dj_waanverse_auth import settings as auth_settings
+from dj_waanverse_auth.models import SessionGeneration, UserSession
+from dj_waanverse_auth.services.token_classes import RefreshToken
+from dj_waanverse_auth.utils.session_utils import _generation_cache_key
+
+Account = get_user_model()
+
+
+class SessionListTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="sessions@example.com", username="sessionuser", is_active=True
+        )
+        self.sessions = [
+            UserSession.objects.create(account=self.user, user_agent=f"agent {i}")
+            for i in range(3)
+        ]
+        UserSession.objects.create(account=self.user, is_active=False)
+        self.current_session = self.sessions[1]
+        refresh = RefreshToken.for_user(self.user, session_id=self.current_session.id)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.url = reverse("dj_waanverse_auth_sessions")
+
+    def test_lists_active_sessions_with_cursor_pagination(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = list(response.data["results"])
+        self.assertEqual(len(results), 2)
+        self.assertIsNotNone(response.data["next_cursor"])
+
+        response = self.client.get(
+            self.url, {"page_size": 2, "cursor": response.data["next_cursor"]}
+        )
+        results += response.data["results"]
+        self.assertIsNone(response.data["next_cursor"])
+
+        self.assertEqual(
+            sorted(row["id"] for row in results),
+            sorted(session.id for session in self.sessions),
+        )
+        self.assertEqual(
+            set(results[0]),
+            {"id", "user_agent", "ip_address", "created_at", "last_used", "is_current"},
+        )
+
+    def test_current_session_is_flagged(self):
+        response = self.client.get(self.url)
+
+        current = [row["id"] for row in response.data["results"] if row["is_current"]]
+        self.assertEqual(current, [self.current_session.id])
+        # Authenticating the request touched the current session last.
+        self.assertEqual(response.data["results"][0]["id"], self.current_session.id)
+
+
+class SessionRevocationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="revoke@example.com", username="revokeuser", is_active=True
+        )
+        self.current_session, self.other_session = [
+            UserSession.objects.create(account=self.user) for _ in range(2)
+        ]
+        self.current = RefreshToken.for_user(self.user, self.current_session.id)
+        self.other = RefreshToken.for_user(self.user, self.other_session.id)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.current.access_token}"
+        )
+
+    def assertTokenRejected(self, access_token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_all_bumps_generation_without_deleting_sessions(self):
+        response = self.client.post(reverse("dj_waanverse_auth_revoke_all_sessions"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(SessionGeneration.objects.get(account=self.user).generation, 1)
+        self.assertEqual(UserSession.objects.filter(account=self.user).count(), 2)
+        self.assertTokenRejected(self.current.access_token)
+        self.assertTokenRejected(self.other.access_token)
+
+    def test_revocation_ignores_stale_cached_generations(self):
+        self.client.post(reverse("dj_waanverse_auth_revoke_all_sessions"))
+        # Another worker's session cache still holds the old generation.
+        cache.set(_generation_cache_key(self.user.pk), 0)
+
+        self.assertTokenRejected(self.other.access_token)
+
+    def test_revoked_refresh_token_cannot_mint_access_tokens(self):
+        self.client.post(reverse("dj_waanverse_auth_revoke_all_sessions"))
+        self.client.credentials()
+
+        response = self.client.post(
+            reverse("dj_waanverse_auth_refresh_token"),
+            {"refresh_token": str(self.other)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_others_keeps_current_session(self):
+        response = self.client.post(
+            reverse("dj_waanverse_auth_revoke_other_sessions")
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTokenRejected(self.current.access_token)
+        self.assertTokenRejected(self.other.access_token)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}"
+        )
+        response = self.client.get(reverse("dj_waanverse_auth_sessions"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [self.current_session.id],
+        )
+
+    def test_generation_check_is_served_from_cache(self):
+        self.client.get(reverse("dj_waanverse_auth_me"))
+
+        # Session lookup and touch plus the user lookup; no generation query
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class SessionTerminationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Account.objects.create_user(
+            email_address="terminate@example.com", username="terminateuser", is_active=True
+        )
+        self.other_user = Account.objects.create_user(
+            email_address="other@example.com", username="otheruser", is_active=True
+        )
+        self.current_session, self.second_session = [
+            UserSession.objects.create(account=self.user) for _ in range(2)
+        ]
+        self.foreign_session = UserSession.objects.create(account=self.other_user)
+        refresh = RefreshToken.for_user(self.user, self.current_session.id)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def delete_url(self, session):
+        return reverse(
+            "dj_waanverse_auth_delete_session", kwargs={"session_id": session.id}
+        )
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+
+        response = self.client.delete(self.delete_url(self.second_session))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(UserSession.objects.filter(id=self.second_session.id).exists())
+
+    def test_cannot_delete_another_accounts_session(self):
+        response = self.client.delete(self.delete_url(self.foreign_session))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(UserSession.objects.filter(id=self.foreign_session.id).exists())
+
+        response = self.client.post(
+            reverse(
+                "dj_waanverse_auth_logout",
+                kwargs={"session_id": self.foreign_session.id},
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(UserSession.objects.filter(id=self.foreign_session.id).exists())
+
+    def test_delete_is_a_single_statement(self):
+        self.client.get(reverse("dj_waanverse_auth_me"))
+
+        # Session lookup and touch, user lookup, then the scoped DELETE
+        with self.assertNumQueries(4):
+            response = self.client.delete(self.delete_url(self.second_session))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(UserSession.objects.filter(id=self.second_session.id).exists())
+        self.assertNotIn(auth_settings.access_token_cookie, response.cookies)
+
+    def test_deleting_current_session_clears_cookies(self):
+        response = self.client.delete(self.delete_url(self.current_session))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.cookies[auth_settings.access_token_cookie].value, "")
+
+        response = self.client.get(reverse("dj_waanverse_auth_me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)